@@ -1,2 +1,3 @@
-from .inventory import Inventory
+from .inventory import Inventory, InventoryTransaction, InsufficientItemsError
+from .compact import CompactInventory
 from .interface import InventoryInterface
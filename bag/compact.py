@@ -0,0 +1,374 @@
+"""
+紧凑库存模块，用并行数组保存大量物品堆，只在访问时创建物品对象。
+
+CompactInventory 与 Inventory 的接口相同，但不为每堆物品保存物品对象或字典项：
+每堆物品只占并行数组中的一行，分别记录物品种类（物品类和物品定义）、品质等变体、
+物品类型和物品类的编号，以及数量、单价和版本号。种类、变体、类型和物品类在库存内各只登记一次，
+物品名称按行保存在列表中，与物品定义共用字符串。
+读取 items、get_item_by_name 等时才用 Item.from_variant 创建物品对象。
+
+按名称查找用数组实现的开放寻址散列表（槽中保存行号），不为每堆物品建立字典项。
+总数量和总价值在每次增减时累计；按类型和物品类筛选时用 NumPy 扫描编号数组，
+返回的序列只保存匹配的掩码，访问时才创建物品对象；整理也只在数组和名称上进行。
+适合压力测试和长时间游戏存档中上万堆随机生成的装备；代价是入包时要登记各编号，比 Inventory 慢。
+
+注意返回的物品是副本：直接修改其数量后必须调用 update_amount，
+这与 Inventory 对库存外修改数量的要求相同。
+
+移除物品时只把对应的行标记为空，读取 items、整理或空行超过一半时才统一压缩，
+因此移除是均摊 O(1)，其余物品的顺序不变。
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from bag.inventory import Inventory
+
+_EMPTY = -1         # 名称散列表中的空槽
+_REMOVED = -2       # 名称散列表中已移除物品的槽，查找时跳过，重建时清除
+
+# 每行一个元素的数组：属性名 -> 数组类型
+_COLUMNS = {
+    "_kinds_of_rows": "i",      # 种类编号，空行为 -1
+    "_variant_ids": "i",        # 变体编号
+    "_type_ids": "h",           # 物品类型编号，空行为 -1
+    "_class_ids": "h",          # 物品类编号，空行为 -1
+    "_amounts": "q",
+    "_values": "q",             # 单价
+    "_row_versions": "q",       # 版本号，用于渲染缓存
+}
+
+
+class CompactItems(Sequence):
+    """
+    CompactInventory.items 和筛选方法返回的只读序列，按位置访问时才创建物品对象。
+
+    序列保存一个选择函数，库存的行增加、移除或重新排列后再次访问时重新选择，
+    因此始终反映库存的当前内容。筛选结果只保存匹配行的掩码，
+    求长度只需计数，按位置访问时才求出行号。
+    """
+    __slots__ = ("_inventory", "_select", "_layout", "_selected", "_rows")
+
+    def __init__(self, inventory: "CompactInventory", select) -> None:
+        self._inventory = inventory
+        self._select = select       # 无参数函数，返回行号的 range 或各行是否匹配的布尔数组
+        self._layout = None
+        self._selected = self._rows = None
+
+    def _selection(self):
+        inventory = self._inventory
+        if self._layout != inventory._layout:
+            self._selected = self._select()
+            self._rows = None
+            self._layout = inventory._layout
+        return self._selected
+
+    def _row_numbers(self):
+        selected = self._selection()
+        if self._rows is None:
+            self._rows = selected if isinstance(selected, range) else selected.nonzero()[0]
+        return self._rows
+
+    def __len__(self) -> int:
+        selected = self._selection()
+        if isinstance(selected, range):
+            return len(selected)
+        import numpy as np
+        return int(np.count_nonzero(selected))
+
+    def __getitem__(self, index):
+        inventory = self._inventory
+        rows = self._row_numbers()
+        if isinstance(index, slice):
+            return [inventory._materialize(row) for row in rows[index]]
+        return inventory._materialize(rows[index])
+
+    def __iter__(self):
+        inventory = self._inventory
+        for row in self._row_numbers():
+            yield inventory._materialize(row)
+
+
+class CompactInventory(Inventory):
+    """
+    以并行数组保存物品的库存，接口与 Inventory 相同。
+
+    属性:
+        items (CompactItems): 按显示顺序排列的物品，只读，访问时才创建物品对象
+    """
+    def __init__(self) -> None:
+        """初始化一个空的紧凑库存。"""
+        self._kinds = []            # 种类编号 -> (物品类, 物品定义)
+        self._kind_index = {}       # id(物品定义) -> 种类编号
+        self._kind_types = array("h")       # 种类编号 -> 类型编号
+        self._kind_classes = array("h")     # 种类编号 -> 物品类编号
+        self._variants = [None]     # 变体编号 -> Item.variant_key()，0 为普通物品
+        self._variant_index = {None: 0}
+        self._types = []            # 类型编号 -> object_type
+        self._type_index = {}
+        self._classes = []          # 物品类编号 -> 物品类
+        self._class_index = {}
+        for column, typecode in _COLUMNS.items():
+            setattr(self, column, array(typecode))
+        self._names = []            # 行 -> 物品名称，空行为 None
+        self._slots = array("i", [_EMPTY]) * 8     # 名称散列表，槽中保存行号
+        self._used = 0              # 非空槽数，包括已移除的
+        self._dead = 0
+        self._layout = 0            # 行增加、移除或重新排列时加一，使 CompactItems 重新选择
+        self._total_amount = 0
+        self._total_worth = 0
+        self._next_version = 0
+        self._rendered = {}
+
+    # *名称散列表
+    def _probe(self, name: str) -> int:
+        """返回名称所在的槽；名称不在库存中时返回探测结束处的空槽。"""
+        slots = self._slots
+        names = self._names
+        mask = len(slots) - 1
+        slot = hash(name) & mask
+        row = slots[slot]
+        while row != _EMPTY:
+            if row >= 0 and names[row] == name:
+                return slot
+            slot = (slot + 1) & mask
+            row = slots[slot]
+        return slot
+
+    def _find(self, name: str):
+        """返回名称所在的行，不在库存中时返回None。"""
+        row = self._slots[self._probe(name)]
+        return row if row >= 0 else None
+
+    def _reindex(self) -> None:
+        """按当前各行重建名称散列表，槽数至少是物品堆数的2倍。"""
+        live = len(self._names) - self._dead
+        size = 8
+        while size < live * 2:
+            size *= 2
+        slots = array("i", [_EMPTY]) * size
+        mask = size - 1
+        for row, name in enumerate(self._names):
+            if name is not None:
+                slot = hash(name) & mask
+                while slots[slot] != _EMPTY:
+                    slot = (slot + 1) & mask
+                slots[slot] = row
+        self._slots = slots
+        self._used = live
+
+    # *行的存取
+    def _register(self, table: list, index: dict, key) -> int:
+        number = index.get(key)
+        if number is None:
+            number = index[key] = len(table)
+            table.append(key)
+        return number
+
+    def _register_kind(self, item) -> int:
+        """返回物品种类的编号，新种类同时登记它的类型和物品类。"""
+        # 一个物品定义只属于一个物品类，按定义对象的 id 登记可以省去每次计算数据类的散列；
+        # _kinds 保存着定义，id 不会被复用
+        key = id(item.definition)
+        kind = self._kind_index.get(key)
+        if kind is None:
+            kind = self._kind_index[key] = len(self._kinds)
+            self._kinds.append((type(item), item.definition))
+            self._kind_types.append(self._register(self._types, self._type_index, item.object_type))
+            self._kind_classes.append(self._register(self._classes, self._class_index, type(item)))
+        return kind
+
+    def _append(self, slot: int, item, amount: int) -> None:
+        """把一堆新物品放到最后一行，slot 是 _probe 找到的空槽。"""
+        self._slots[slot] = len(self._names)
+        self._used += 1
+        self._names.append(item.name)
+        kind = self._register_kind(item)
+        self._kinds_of_rows.append(kind)
+        self._variant_ids.append(self._register(self._variants, self._variant_index, item.variant_key()))
+        self._type_ids.append(self._kind_types[kind])
+        self._class_ids.append(self._kind_classes[kind])
+        self._amounts.append(amount)
+        self._values.append(item.individual_value)
+        self._row_versions.append(self._next_version)
+        self._next_version += 1
+        self._total_amount += amount
+        self._total_worth += amount * item.individual_value
+        self._layout += 1
+        if self._used * 2 > len(self._slots):
+            self._reindex()
+
+    def _materialize(self, row: int):
+        cls, definition = self._kinds[self._kinds_of_rows[row]]
+        return cls.from_variant(definition, self._amounts[row], self._variants[self._variant_ids[row]])
+
+    def _change_amount(self, slot: int, row: int, delta: int) -> None:
+        """改变一行的数量并更新合计值，数量不大于0时移除该行。"""
+        self._amounts[row] += delta
+        self._total_amount += delta
+        self._total_worth += delta * self._values[row]
+        if self._amounts[row] <= 0:
+            self._remove_row(slot, row)
+        else:
+            self._row_versions[row] = self._next_version
+            self._next_version += 1
+
+    def _remove_row(self, slot: int, row: int) -> None:
+        """把一行连同它的名称和合计值一起移除，空行超过一半时压缩。"""
+        self._forget_rendered(self._names[row])
+        self._total_amount -= self._amounts[row]
+        self._total_worth -= self._amounts[row] * self._values[row]
+        self._slots[slot] = _REMOVED
+        self._names[row] = None
+        self._amounts[row] = self._values[row] = 0
+        self._kinds_of_rows[row] = self._type_ids[row] = self._class_ids[row] = -1
+        self._dead += 1
+        self._layout += 1
+        if self._dead * 2 > len(self._names):
+            self._compact()
+
+    def _compact(self) -> None:
+        """去掉已移除的行，保持其余行的顺序。"""
+        if not self._dead:
+            return
+        import numpy as np
+        self._permute(np.flatnonzero(np.frombuffer(self._kinds_of_rows, np.int32) >= 0))
+
+    def _permute(self, order) -> None:
+        """按 order（行号数组）重新排列各行，去掉不在其中的行，并重建名称散列表。"""
+        import numpy as np
+        for column, typecode in _COLUMNS.items():
+            values = np.frombuffer(getattr(self, column), typecode)
+            setattr(self, column, array(typecode, values[order].tobytes()))
+        names = self._names
+        self._names = [names[row] for row in order.tolist()]
+        self._dead = 0
+        self._layout += 1
+        self._reindex()
+
+    def _select(self, column: array, ids: list):
+        """返回 column 中各行的编号是否属于 ids 的布尔数组。"""
+        import numpy as np
+        values = np.frombuffer(column, column.typecode)
+        if len(ids) == 1:
+            return values == ids[0]
+        return np.isin(values, ids)
+
+    def _all_rows(self) -> range:
+        self._compact()
+        return range(len(self._names))
+
+    # *渲染缓存
+    def _version_of(self, name: str) -> int:
+        return self._row_versions[self._find(name)]
+
+    def _forget_rendered(self, name: str) -> None:
+        """物品离开库存时丢弃它的渲染缓存，版本号随行一起移除。"""
+        for form in ("row", "info"):
+            self._rendered.pop((name, form), None)
+
+    # *Inventory 接口
+    @property
+    def items(self) -> CompactItems:
+        """按显示顺序排列的物品，只读，访问时才创建物品对象。"""
+        return CompactItems(self, self._all_rows)
+
+    def add_item(self, item, amount=None):
+        """
+        向库存中添加物品，规则同 Inventory.add_item。
+
+        参数:
+            item: 要添加的物品对象，不会被库存保存
+            amount (int, optional): 要添加的数量，默认为物品自身的数量
+        """
+        if amount is None:
+            amount = item.amount
+        slot = self._probe(item.name)
+        row = self._slots[slot]
+        if row >= 0:
+            self._change_amount(slot, row, amount)
+        else:
+            self._append(slot, item, amount)
+
+    def update_amount(self, item, previous_amount: int) -> None:
+        """把库存外对物品副本数量的修改写回库存，规则同 Inventory.update_amount。"""
+        slot = self._probe(item.name)
+        row = self._slots[slot]
+        if row >= 0:
+            self._change_amount(slot, row, item.amount - previous_amount)
+
+    def discard(self, item) -> bool:
+        """把物品整堆从库存中移除，不管剩余数量。"""
+        slot = self._probe(item.name)
+        row = self._slots[slot]
+        if row < 0:
+            return False
+        self._remove_row(slot, row)
+        return True
+
+    def remove_item(self, item, amount=1):
+        """从库存中移除指定数量的物品，规则同 Inventory.remove_item。"""
+        slot = self._probe(item.name)
+        row = self._slots[slot]
+        if row < 0:
+            return False
+        self._change_amount(slot, row, -amount)
+        return True
+
+    def remove_items_by_name(self, name: str, amount: int) -> bool:
+        """尝试移除指定名称的若干个物品，规则同 Inventory.remove_items_by_name。"""
+        slot = self._probe(name)
+        row = self._slots[slot]
+        if row < 0 or self._amounts[row] < amount:
+            return False
+        self._change_amount(slot, row, -amount)
+        return True
+
+    def count_item_by_name(self, name):
+        """统计指定名称物品的数量，不存在时返回0。"""
+        row = self._find(name)
+        return self._amounts[row] if row is not None else 0
+
+    def get_item_by_name(self, name):
+        """根据名称获取物品，返回库存中物品的副本，不存在时返回None。"""
+        row = self._find(name)
+        return self._materialize(row) if row is not None else None
+
+    def get_items_by_type(self, item_type) -> CompactItems:
+        """
+        按物品类型获取物品，按显示顺序排列。
+
+        返回只读序列而不是列表，第一次访问时扫描类型编号数组，按位置访问时才创建物品对象。
+        """
+        def select():
+            type_id = self._type_index.get(item_type)
+            return self._select(self._type_ids, [type_id]) if type_id is not None else range(0)
+        return CompactItems(self, select)
+
+    def get_items_by_class(self, cls) -> CompactItems:
+        """
+        按物品类（包括子类）获取物品，按显示顺序排列。
+
+        返回只读序列而不是列表，第一次访问时扫描物品类编号数组，按位置访问时才创建物品对象。
+        """
+        def select():
+            ids = [class_id for class_id, item_cls in enumerate(self._classes) if issubclass(item_cls, cls)]
+            return self._select(self._class_ids, ids) if ids else range(0)
+        return CompactItems(self, select)
+
+    def sort_items(self):
+        """
+        整理背包物品，按类型和名称排序，排序只在数组和名称上进行，不创建物品对象。
+
+        返回:
+            bool: 始终返回True表示排序完成
+        """
+        import numpy as np
+        kinds = np.frombuffer(self._kinds_of_rows, np.int32)
+        live = np.flatnonzero(kinds >= 0).tolist()
+        by_name = np.array(sorted(live, key=self._names.__getitem__), dtype=np.intp)
+        class_ranks = {name: rank for rank, name in enumerate(sorted({cls.__name__ for cls, _ in self._kinds}))}
+        kind_ranks = np.array([class_ranks[cls.__name__] for cls, _ in self._kinds] or [0], dtype=np.intp)
+        self._permute(by_name[np.argsort(kind_ranks[kinds[by_name]], kind="stable")])
+        print("背包已整理完成")
+        return True
@@ -6,11 +6,10 @@
 管理其库存中的各类物品和装备。
 """
 
-from rich.console import Console
-
+from ui import get_console
 from ui import clear_screen
 
-console = Console()
+console = get_console()
 
 def select_item_from_list(item_list, prompt="选择一个物品:", allow_exit=True):
     """
@@ -54,8 +53,11 @@ class InventoryInterface:
     出售物品以及装备管理等功能。为库存系统提供了一个命令行界面，
     便于玩家管理其拥有的物品。
 
+    物品超过一页时只显示当前页，在输入编号的地方输入 n/p 翻页。
+
     属性:
         inventory: 与此界面关联的库存对象
+        page (int): 当前显示的页码，从0开始
     """
     def __init__(self, inventory):
         """
@@ -67,18 +69,40 @@ class InventoryInterface:
             inventory: 需要管理的库存对象
         """
         self.inventory = inventory
+        self.page = 0
 
     def show_inventory(self):
         """
         显示库存内容。
 
-        以表格形式展示库存中所有物品，并显示容量摘要信息。
+        以表格形式展示库存中当前页的物品，并显示容量摘要信息。
         """
         console.print("背包内容:", style="bold underline")
-        table_panel, summary_text = self.inventory.get_formatted_inventory_table()
+        table_panel, summary_text = self.inventory.get_formatted_inventory_table(self.page)
         console.print(table_panel)
         console.print(summary_text)
 
+    def read_choice(self, prompt="> "):
+        """
+        读取用户输入，物品超过一页时处理翻页。
+
+        输入 n/p 时翻到下一页/上一页并重新显示库存，然后继续等待输入。
+
+        参数:
+            prompt (str, optional): 输入提示
+
+        返回:
+            str: 翻页以外的输入
+        """
+        while True:
+            choice = input(prompt)
+            step = {"n": 1, "p": -1}.get(choice.strip().lower())
+            if step is None or self.inventory.page_count() == 1:
+                return choice
+            self.page = min(max(self.page + step, 0), self.inventory.page_count() - 1)
+            clear_screen()
+            self.show_inventory()
+
     def drop_item(self):
         """
         丢弃库存中的物品。
@@ -101,15 +125,15 @@ class InventoryInterface:
         print("\n丢掉什么? ['0' 退出]")
         self.show_inventory()
         try:
-            i = int(input("> "))
+            i = int(self.read_choice())
             if i == 0:
                 print("关闭背包...")
                 return
             elif 1 <= i <= len(self.inventory.items):
                 item = self.inventory.items[i-1]
+                previous_amount = item.amount
                 dropped_amount = item.drop()
-                if item.amount <= 0:
-                    self.inventory.items.pop(i-1)
+                self.inventory.update_amount(item, previous_amount)
                 clear_screen()
                 self.show_inventory()
             else:
@@ -141,7 +165,7 @@ class InventoryInterface:
         print("\n出售什么? ['0' 退出]")
         self.show_inventory()
         try:
-            i = int(input("> "))
+            i = int(self.read_choice())
             if i == 0:
                 print("关闭背包...")
                 return 0
@@ -191,8 +215,7 @@ class InventoryInterface:
             - 可能从库存中移除物品（如果数量变为0）
             - 在控制台输出物品选择界面或无可用物品提示
         """
-        consumables = self.inventory.get_items_by_type("consumable")
-        consumables += self.inventory.get_items_by_type("food")
+        consumables = [*self.inventory.get_items_by_type("consumable"), *self.inventory.get_items_by_type("food")]
         if not consumables:
             print("背包中没有可使用的物品")
             return None
@@ -221,7 +244,7 @@ class InventoryInterface:
         console.print("选择一个物品查看详情", style="bold")
         self.show_inventory()
         while True:
-            choice = input("输入编号 (或 0 取消): ")
+            choice = self.read_choice("输入编号 (或 0 取消): ")
             if choice.isdigit():
                 choice = int(choice)
                 if choice == 0:
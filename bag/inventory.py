@@ -6,15 +6,96 @@
 管理的核心系统，连接了玩家与游戏世界的物品交互。
 """
 
-from rich.console import Console
+from contextlib import contextmanager
+from typing import Dict
+
 from rich.table import Table
 from rich.text import Text
 from rich.panel import Panel
 from rich import box
 
+from ui import get_console
 from others.equipment import Equipment
 
-console = Console()
+console = get_console()
+
+PAGE_SIZE = 20      # 背包表格和物品列表每页显示的物品数
+
+
+class InsufficientItemsError(ValueError):
+    """
+    库存事务要移除的物品数量超过库存中的数量。
+
+    属性:
+        name (str): 物品名称
+        requested (int): 事务中要移除的总数量
+        available (int): 库存中的数量
+    """
+    def __init__(self, name: str, requested: int, available: int) -> None:
+        self.name = name
+        self.requested = requested
+        self.available = available
+        super().__init__(f"{name} 数量不足: 需要 {requested}, 只有 {available}")
+
+
+class InventoryTransaction:
+    """
+    一批要一起生效的物品增减，由 Inventory.transaction() 创建。
+
+    remove 在登记时就检查数量是否足够（计入同一事务中已登记的移除），
+    数量不足时立即抛出 InsufficientItemsError；事务结束时同名的增减合并后一次写入库存。
+    因此写入时不会再失败，库存要么得到全部改变，要么保持原样。
+
+    属性:
+        inventory (Inventory): 目标库存
+    """
+    def __init__(self, inventory: "Inventory") -> None:
+        self.inventory = inventory
+        self._adds: Dict[str, list] = {}      # 名称 -> [物品, 数量]
+        self._removes: Dict[str, int] = {}    # 名称 -> 数量
+
+    def add(self, item, amount=None) -> None:
+        """
+        登记添加物品。
+
+        参数:
+            item: 要添加的物品，库存中没有同名物品时加入它的副本
+            amount (int, optional): 要添加的数量，默认为物品自身的数量
+        """
+        entry = self._adds.setdefault(item.name, [item, 0])
+        entry[1] += item.amount if amount is None else amount
+
+    def remove(self, name: str, amount: int) -> None:
+        """
+        登记移除物品，并检查库存中的数量是否足够。
+
+        参数:
+            name (str): 物品名称
+            amount (int): 要移除的数量
+
+        异常:
+            InsufficientItemsError: 库存中的数量少于本事务要移除的总数量
+        """
+        requested = self._removes.get(name, 0) + amount
+        available = self.inventory.count_item_by_name(name)
+        if requested > available:
+            raise InsufficientItemsError(name, requested, available)
+        self._removes[name] = requested
+
+    def commit(self) -> None:
+        """把登记的增减写入库存，先移除后添加，之后清空事务。"""
+        inventory = self.inventory
+        for name, amount in self._removes.items():
+            inventory.remove_items_by_name(name, amount)
+        for item, amount in self._adds.values():
+            inventory.add_item(item, amount)
+        self.rollback()
+
+    def rollback(self) -> None:
+        """放弃登记的全部增减。"""
+        self._adds.clear()
+        self._removes.clear()
+
 
 class Inventory:
     """
@@ -23,45 +104,145 @@ class Inventory:
     提供物品的添加、移除、计数和检索等基本功能，同时支持物品分类和库存显示。
     作为玩家与游戏物品系统交互的核心接口，管理所有物品的生命周期。
 
+    同名物品在库存中只有一堆。物品保存在以名称为键的有序字典中，字典的顺序就是
+    显示顺序，因此按名称查找、计数、添加和移除都是 O(1)，移除物品后其余物品的顺序不变。
+    物品总数和总价值在每次增减时累计，并按物品类型和物品类分组保存，
+    这些查询不再遍历整个库存。数量的改变都应经过库存的方法，
+    在库存外直接修改数量后需调用 update_amount。
+
+    显示时只渲染当前页的物品。每堆物品有一个版本号，加入库存和数量改变时更新，
+    渲染出的行按版本号缓存，因此打开背包的耗时与库存大小无关，
+    翻回看过的页时也不必重新渲染。
+
     属性:
-        items (list): 存储在库存中的物品列表
+        items (Tuple): 按显示顺序排列的物品，只读；库存改变后第一次访问时重新生成
     """
     def __init__(self) -> None:
         """
         初始化一个空的库存实例。
 
-        创建一个新的库存对象，初始化物品列表为空。
+        创建一个新的库存对象，初始化物品索引为空。
         """
-        self.items = []
+        self._by_name = {}
+        self._snapshot = ()
+        self._position = {}     # 名称 -> 显示顺序的序号，用于合并多个分组
+        self._next_position = 0
+        self._by_type = {}      # object_type -> {名称: 物品}
+        self._by_class = {}     # 物品类 -> {名称: 物品}
+        self._total_amount = 0
+        self._total_worth = 0
+        self._versions = {}     # 名称 -> 版本号，物品堆改变时更新
+        self._next_version = 0
+        self._rendered = {}     # (名称, 形式) -> (版本号, 渲染结果)
+
+    @property
+    def items(self):
+        """按显示顺序排列的物品元组，需要增删物品时使用库存的方法。"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._by_name.values())
+        return self._snapshot
+
+    def _insert(self, item) -> None:
+        """把一堆新物品放到显示顺序的末尾，并计入分组和合计值。"""
+        name = item.name
+        self._by_name[name] = item
+        self._snapshot = None
+        self._position[name] = self._next_position
+        self._next_position += 1
+        self._by_type.setdefault(item.object_type, {})[name] = item
+        self._by_class.setdefault(type(item), {})[name] = item
+        self._total_amount += item.amount
+        self._total_worth += item.amount * item.individual_value
+        self._touch(name)
+
+    def _touch(self, name: str) -> None:
+        """物品堆改变后更新它的版本号，使渲染缓存失效。"""
+        self._versions[name] = self._next_version
+        self._next_version += 1
+
+    def _adjust(self, item, delta: int) -> None:
+        """改变库存中物品的数量并更新合计值，数量不大于0时移除该物品。"""
+        item.amount += delta
+        self.update_amount(item, item.amount - delta)
+
+    def update_amount(self, item, previous_amount: int) -> None:
+        """
+        在库存外直接修改了物品数量（如 Item.drop、Item.buy）之后调用，同步合计值。
+
+        参数:
+            item: 库存中的物品
+            previous_amount (int): 修改前的数量
+
+        副作用:
+            - 更新物品总数和总价值
+            - 数量不大于0时从库存中移除该物品
+        """
+        delta = item.amount - previous_amount
+        self._total_amount += delta
+        self._total_worth += delta * item.individual_value
+        if item.amount <= 0:
+            self.discard(item)
+        elif item.name in self._versions:
+            self._touch(item.name)
+
+    def discard(self, item) -> bool:
+        """
+        把物品整堆从库存中移除，不管剩余数量。
+
+        参数:
+            item: 要移除的物品，按名称查找
+
+        返回:
+            bool: 如果物品在库存中返回True
+        """
+        name = item.name
+        item = self._by_name.pop(name, None)
+        if item is None:
+            return False
+        self._snapshot = None
+        self._forget_rendered(name)
+        del self._position[name]
+        self._remove_from_group(self._by_type, item.object_type, name)
+        self._remove_from_group(self._by_class, type(item), name)
+        self._total_amount -= item.amount
+        self._total_worth -= item.amount * item.individual_value
+        return True
+
+    @staticmethod
+    def _remove_from_group(groups: dict, key, name: str) -> None:
+        group = groups[key]
+        del group[name]
+        if not group:
+            del groups[key]
 
     @property
     def total_worth(self):
         """
-        计算库存中所有物品的总价值。
+        库存中所有物品的总价值。
 
-        将每个物品的数量乘以单价，然后求和得到总价值。
+        即每个物品的数量乘以单价之和，在物品增减时累计，读取是 O(1)。
 
         返回:
             int: 库存中所有物品的总价值
         """
-        return sum(item.amount * item.individual_value for item in self.items)
+        return self._total_worth
 
     def get_total_item_count(self) -> int:
         """
         获取库存中所有物品的总数量。
 
-        计算库存中所有物品数量的总和。
+        总数量在物品增减时累计，读取是 O(1)。
 
         返回:
             int: 库存中所有物品的总数量
         """
-        return sum(item.amount for item in self.items)
+        return self._total_amount
 
     def get_items_by_type(self, item_type):
         """
         按物品类型获取物品列表。
 
-        根据物品的object_type属性筛选并返回符合条件的物品列表。
+        返回object_type属性符合条件的物品，按显示顺序排列，耗时只与结果数量有关。
 
         参数:
             item_type (str): 要筛选的物品类型
@@ -69,13 +250,13 @@ class Inventory:
         返回:
             list: 符合指定类型的物品列表
         """
-        return [item for item in self.items if item.object_type == item_type]
+        return list(self._by_type.get(item_type, {}).values())
 
     def get_items_by_class(self, cls):
         """
         按物品类获取物品列表。
 
-        根据物品的Python类型筛选并返回符合条件的物品列表。
+        根据物品的Python类型（包括子类）筛选物品，按显示顺序排列，耗时只与结果数量有关。
 
         参数:
             cls (class): 要筛选的物品类
@@ -83,22 +264,61 @@ class Inventory:
         返回:
             list: 符合指定类的物品列表
         """
-        return [item for item in self.items if isinstance(item, cls)]
+        groups = [group for item_cls, group in self._by_class.items() if issubclass(item_cls, cls)]
+        if len(groups) == 1:
+            return list(groups[0].values())
+        items = [item for group in groups for item in group.values()]
+        items.sort(key=lambda item: self._position[item.name])
+        return items
+
+    @contextmanager
+    def transaction(self):
+        """
+        在上下文内登记一批物品增减，正常退出时一起写入库存。
+
+        上下文内抛出异常（包括 remove 时数量不足）时不做任何改变。
+        多个库存的事务可以嵌套在同一个 with 语句中，例如商店交易。
+
+        用法:
+            with inventory.transaction() as tx:
+                tx.remove("凝胶", 5)
+                tx.add(reward_item, 1)
+
+        返回:
+            InventoryTransaction: 本次事务
 
-    def add_item(self, item):
+        异常:
+            InsufficientItemsError: 要移除的物品数量不足
+        """
+        tx = InventoryTransaction(self)
+        try:
+            yield tx
+        except BaseException:
+            tx.rollback()
+            raise
+        tx.commit()
+
+    def add_item(self, item, amount=None):
         """
         向库存中添加物品。
 
-        调用物品的add_to_inventory方法将其添加到当前库存中。
+        如果库存中已有同名物品，增加其数量；否则把物品的副本加入库存。
 
         参数:
             item: 要添加的物品对象
+            amount (int, optional): 要添加的数量，默认为物品自身的数量
 
         副作用:
             - 如果库存中已有同名物品，增加其数量
-            - 否则将新物品添加到库存列表
+            - 否则将新物品添加到库存末尾
         """
-        item.add_to_inventory(self, item.amount)
+        if amount is None:
+            amount = item.amount
+        existing = self._by_name.get(item.name)
+        if existing is not None:
+            self._adjust(existing, amount)
+        else:
+            self._insert(item.clone(amount))
 
     def remove_item(self, item, amount=1):
         """
@@ -115,15 +335,13 @@ class Inventory:
 
         副作用:
             - 减少库存中对应物品的数量
-            - 可能从库存列表中移除物品
+            - 可能从库存中移除物品
         """
-        for i, inventory_item in enumerate(self.items):
-            if inventory_item.name == item.name:
-                inventory_item.amount -= amount
-                if inventory_item.amount <= 0:
-                    self.items.pop(i)
-                return True
-        return False
+        inventory_item = self._by_name.get(item.name)
+        if inventory_item is None:
+            return False
+        self._adjust(inventory_item, -amount)
+        return True
 
     def remove_items_by_name(self, name: str, amount: int) -> bool:
         """
@@ -140,16 +358,13 @@ class Inventory:
 
         副作用:
             - 减少库存中对应物品的数量
-            - 可能从库存列表中移除物品
+            - 可能从库存中移除物品
         """
-        for item in self.items:
-            if item.name == name:
-                if item.amount >= amount:
-                    item.amount -= amount
-                    if item.amount == 0:
-                        self.items.remove(item)
-                    return True
-        return False
+        item = self._by_name.get(name)
+        if item is None or item.amount < amount:
+            return False
+        self._adjust(item, -amount)
+        return True
 
     def count_item_by_name(self, name):
         """
@@ -163,10 +378,8 @@ class Inventory:
         返回:
             int: 物品的数量，如果不存在则返回0
         """
-        for item in self.items:
-            if item.name == name:
-                return item.amount
-        return 0
+        item = self._by_name.get(name)
+        return item.amount if item is not None else 0
 
     def get_item_by_name(self, name):
         """
@@ -180,10 +393,7 @@ class Inventory:
         返回:
             object: 找到的物品对象，如果不存在则返回None
         """
-        for item in self.items:
-            if item.name == name:
-                return item
-        return None
+        return self._by_name.get(name)
 
     def decrease_item_amount(self, item, amount):
         """
@@ -200,15 +410,9 @@ class Inventory:
 
         副作用:
             - 减少库存中对应物品的数量
-            - 可能从库存列表中移除物品
+            - 可能从库存中移除物品
         """
-        for actual_item in self.items:
-            if item.name == actual_item.name:
-                actual_item.amount -= amount
-                if actual_item.amount <= 0:
-                    self.items.remove(actual_item)
-                return True
-        return False
+        return self.remove_item(item, amount)
 
     def get_equipments(self):
         """
@@ -221,17 +425,74 @@ class Inventory:
         """
         return self.get_items_by_class(Equipment)
 
-    def show_inventory_item(self):
+    def page_count(self, page_size: int = PAGE_SIZE) -> int:
+        """返回按每页 page_size 件分页后的页数，空库存也算一页。"""
+        return max(1, -(-len(self.items) // page_size))
+
+    def page(self, page: int = 0, page_size: int = PAGE_SIZE):
         """
-        显示库存中的所有物品。
+        获取一页物品。
 
-        以编号和简要信息的形式显示库存中的每个物品。
+        参数:
+            page (int): 页码，从0开始，超出范围时取最近的一页
+            page_size (int): 每页物品数
+
+        返回:
+            tuple: 包含两个元素:
+                - 实际的页码
+                - 该页第一件物品的编号（从1开始）和该页的物品
+        """
+        page = min(max(page, 0), self.page_count(page_size) - 1)
+        start = page * page_size
+        return page, (start + 1, self.items[start:start + page_size])
+
+    def _render(self, item, form: str, render):
+        """
+        返回物品渲染出的内容，物品堆的版本号没变时使用缓存。
+
+        参数:
+            item: 库存中的物品
+            form (str): 渲染形式，同一物品的不同形式分别缓存
+            render: 物品 -> 渲染结果的函数
+        """
+        version = self._version_of(item.name)
+        key = (item.name, form)
+        cached = self._rendered.get(key)
+        if cached is None or cached[0] != version:
+            cached = self._rendered[key] = (version, render(item))
+        return cached[1]
+
+    def _version_of(self, name: str) -> int:
+        return self._versions[name]
+
+    def _forget_rendered(self, name: str) -> None:
+        """物品离开库存时丢弃它的版本号和渲染缓存。"""
+        self._versions.pop(name, None)
+        for form in ("row", "info"):
+            self._rendered.pop((name, form), None)
+
+    def _page_footer(self, page: int, page_size: int) -> str:
+        return f"第 {page + 1}/{self.page_count(page_size)} 页 ['n' 下一页 | 'p' 上一页]"
+
+    def show_inventory_item(self, page: int = 0, page_size: int = PAGE_SIZE):
+        """
+        显示库存中的一页物品。
+
+        以编号和简要信息的形式显示当前页的每个物品，编号为物品在整个库存中的序号。
+        物品超过一页时在末尾显示页码。
+
+        参数:
+            page (int): 页码，从0开始
+            page_size (int): 每页物品数
 
         副作用:
             在控制台输出库存物品列表
         """
-        for index, item in enumerate(self.items, start=1):
-            console.print(f"{index} - {item.show_info()}")
+        page, (first, items) = self.page(page, page_size)
+        for index, item in enumerate(items, start=first):
+            console.print(f"{index} - {self._render(item, 'info', lambda item: item.show_info())}")
+        if self.page_count(page_size) > 1:
+            console.print(self._page_footer(page, page_size), style="dim")
 
     def sort_items(self):
         """
@@ -243,20 +504,32 @@ class Inventory:
             bool: 始终返回True表示排序完成
 
         副作用:
-            - 重新排序库存中的物品列表
+            - 重新排序库存中的物品
             - 在控制台输出提示信息
         """
-        self.items.sort(key=lambda item: (type(item).__name__, item.name))
+        ordered = sorted(self._by_name.values(), key=lambda item: (type(item).__name__, item.name))
+        self._by_name.clear()
+        self._position.clear()
+        self._by_type.clear()
+        self._by_class.clear()
+        self._total_amount = self._total_worth = 0
+        for item in ordered:
+            self._insert(item)
         print("背包已整理完成")
         return True
 
-    def get_formatted_inventory_table(self):
+    def get_formatted_inventory_table(self, page: int = 0, page_size: int = PAGE_SIZE):
         """
         返回格式化的库存表格。
 
-        创建一个美观的表格显示库存中的物品，包括编号、名称、类型、数量和单价。
+        创建一个美观的表格显示库存中的一页物品，包括编号、名称、类型、数量和单价，
+        编号为物品在整个库存中的序号。物品超过一页时在面板标题中显示页码。
         如果库存为空，则返回一个显示"背包是空的"的面板。
 
+        参数:
+            page (int): 页码，从0开始，超出范围时取最近的一页
+            page_size (int): 每页物品数
+
         返回:
             tuple: 包含两个元素:
                 - 显示物品的格式化面板
@@ -282,14 +555,9 @@ class Inventory:
         table.add_column("数量", justify="right", style="white")
         table.add_column("单价", justify="right", style="yellow")
 
-        for i, item in enumerate(self.items, 1):
-            table.add_row(
-                str(i),
-                item.name,
-                str(item.object_type),
-                f"x{item.amount}",
-                f"{item.individual_value}G"
-            )
+        page, (first, items) = self.page(page, page_size)
+        for i, item in enumerate(items, first):
+            table.add_row(str(i), *self._render(item, "row", _table_cells))
 
         summary_text = Text()
         summary_text.append(f"\n物品总数: ", style="bold white")
@@ -297,8 +565,16 @@ class Inventory:
         summary_text.append(" | 总价值: ", style="bold white")
         summary_text.append(f"{self.total_worth}G", style="bold yellow")
 
+        subtitle = "['0' 关闭背包]"
+        if self.page_count(page_size) > 1:
+            subtitle = f"{self._page_footer(page, page_size)} {subtitle}"
         return Panel.fit(
             table,
-            subtitle="['0' 关闭背包]",
+            subtitle=subtitle,
             border_style="bold green"
         ), summary_text
+
+
+def _table_cells(item) -> tuple:
+    """物品在背包表格中除编号以外的各列。"""
+    return item.name, str(item.object_type), f"x{item.amount}", f"{item.individual_value}G"
@@ -13,19 +13,31 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from core.battler import Battler
 
-import math, random
-from typing import List
-from rich.console import Console
-
+import math
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from functools import partial
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from ui import get_console
 from ui import text
 from ui import battle_log, get_valid_input
 from ui import dot_loading, typewriter
-from tools import load_toml_data
-from data import enhance_weapon, weakened_defense
+from ui import null_output
+from ui import fx
+from core import rng
+from core import battle_state
+from core import combat_log
+from core.roster import Roster
+from core.turn_order import TurnScheduler
+from core.effect_wheel import EffectWheel
+from tools import load_toml_data, LazyTable
+from data import skills_data
 
-console = Console()
+console = get_console()
 
-COMBAT_TEXT = load_toml_data('data/toml_data/combat_text.toml')
+COMBAT_TEXT = LazyTable("combat_text", partial(load_toml_data, 'data/toml_data/combat_text.toml'))
 
 # *战斗计算器
 class BattleCalculator:
@@ -51,7 +63,9 @@ class BattleCalculator:
             bool: 如果攻击未命中返回True，否则返回False
         """
         miss_chance = math.floor(math.sqrt(max(0, 5 * defender.stats["agi"] - attacker.stats["agi"] * 2)))
-        return miss_chance > random.randint(0, 100)
+        roll = rng.stream("combat").randint(0, 100)
+        combat_log.record("roll", check="miss", a=attacker, tg=defender, roll=roll, chance=miss_chance, ok=miss_chance > roll)
+        return miss_chance > roll
 
     @staticmethod
     def check_critical(attacker: Battler, defender: Battler) -> tuple:
@@ -74,9 +88,10 @@ class BattleCalculator:
         anti_crit = defender.stats.get("anti_crit", 0)
         final_chance = max(0, min(80, raw_chance - anti_crit))
 
-        roll = random.randint(1, 100)
+        roll = rng.stream("combat").randint(1, 100)
         is_crit = roll <= final_chance
         was_suppressed = raw_chance > final_chance and roll <= raw_chance
+        combat_log.record("roll", check="crit", a=attacker, tg=defender, roll=roll, chance=final_chance, ok=is_crit)
         return is_crit, was_suppressed
 
     @staticmethod
@@ -97,13 +112,15 @@ class BattleCalculator:
             逃跑失败时有35%概率降低单位的防御力
         """
         escape_chance = min(90, 35 + (battler.stats["agi"] * 0.7 + battler.stats["luk"] * 0.3))
-        if random.randint(1, 100) <= escape_chance:
+        roll = rng.stream("combat").randint(1, 100)
+        combat_log.record("roll", check="escape", a=battler, roll=roll, chance=escape_chance, ok=roll <= escape_chance)
+        if roll <= escape_chance:
             console.print(COMBAT_TEXT["escape"]["success"], style="green")
             return True
         console.print(COMBAT_TEXT["escape"]["fail"], style="bold red")
-        if random.random() < 0.35:  # 35%概率降低防御
+        if rng.stream("combat").random() < 0.35:  # 35%概率降低防御
             console.print(COMBAT_TEXT["escape"]["bad"], style="red")
-            weakened_defense.effect(battler, battler)
+            skills_data.weakened_defense.effect(battler, battler)
         return False
 
 
@@ -112,27 +129,9 @@ class CombatManager:
     """
     战斗管理器类，提供战斗流程管理的静态方法。
 
-    负责处理战斗单位的行动顺序、目标选择、死亡检查和恢复处理等功能。
+    负责处理战斗单位的目标选择和恢复处理等功能。
     作为战斗系统的协调组件，管理战斗中的各种状态和流程。
     """
-    @staticmethod
-    def define_battlers(allies: List[Battler], enemies: List[Battler]) -> List[Battler]:
-        """
-        根据速度定义行动顺序。
-
-        将所有战斗单位合并并按敏捷属性排序，决定回合中的行动顺序。
-
-        参数:
-            allies (List[Battler]): 友方单位列表
-            enemies (List[Battler]): 敌方单位列表
-
-        返回:
-            List[Battler]: 按敏捷排序的所有战斗单位列表
-        """
-        battlers = enemies.copy() + allies.copy()
-        # 按敏捷排序，决定行动顺序
-        return sorted(battlers, key=lambda b: b.stats["agi"], reverse=True)
-
     @staticmethod
     def select_target(targets: List[Battler]) -> Battler:
         """
@@ -150,31 +149,6 @@ class CombatManager:
         index = get_valid_input("> ", range(1, len(targets)+1), int)
         return targets[index - 1]
 
-    @staticmethod
-    def check_if_dead(allies: List[Battler], enemies: List[Battler], battlers: List[Battler]) -> None:
-        """
-        检查并移除已死亡的单位。
-
-        遍历所有战斗单位，将已死亡的单位从各个列表中移除。
-
-        参数:
-            allies (List[Battler]): 友方单位列表
-            enemies (List[Battler]): 敌方单位列表
-            battlers (List[Battler]): 所有战斗单位列表
-
-        副作用:
-            从各个列表中移除已死亡的单位
-        """
-        dead_bodies = [b for b in allies + enemies if not b.alive]
-
-        for dead in dead_bodies:
-            if dead in battlers:
-                battlers.remove(dead)
-            if dead in enemies:
-                enemies.remove(dead)
-            elif dead in allies:
-                allies.remove(dead)
-
     @staticmethod
     def recover_hp_and_mp(target: Battler, percent: float) -> None:
         """
@@ -195,6 +169,160 @@ class CombatManager:
         battle_log(f"\n恢复了 {percent*100}% 生命值和魔法", "heal")
 
 
+# *战斗结果
+@dataclass
+class CombatResult:
+    """
+    战斗结果类，记录一场战斗的结构化结算数据。
+
+    主要供无界面战斗使用，便于平衡性测试和自动化回归对战斗结果进行统计。
+
+    属性:
+        winner (str): 战斗结果，"allies"(胜利)、"enemies"(失败)、"escaped"(逃跑) 或 "timeout"(超出回合上限)
+        rounds (int): 实际进行的回合数
+        damage_dealt (Dict[str, int]): 每个战斗单位造成的伤害，键为单位标签
+        exp (int): 获得的经验奖励
+        money (int): 获得的金钱奖励
+        drops (List[Tuple[str, int]]): 获得的掉落物品 (名称, 数量)
+        player_hp (int): 战斗结束时玩家的生命值
+        player_max_hp (int): 战斗结束时玩家的最大生命值
+    """
+    winner: str
+    rounds: int
+    damage_dealt: Dict[str, int] = field(default_factory=dict)
+    exp: int = 0
+    money: int = 0
+    drops: List[Tuple[str, int]] = field(default_factory=list)
+    player_hp: int = 0
+    player_max_hp: int = 0
+
+
+# *玩家行动策略
+class CombatPolicy(ABC):
+    """
+    玩家行动策略基类，代替键盘输入决定玩家回合的行动。
+
+    decide 返回与 Enemy.decide_action 相同格式的行动描述字典，类型可以是:
+        {"type": "attack", "target": Battler}
+        {"type": "defend"}
+        {"type": "spell", "spell": Spell, "target": Battler | None}
+        {"type": "combo", "combo": Combo, "target": Battler | None}
+        {"type": "item", "item": Item}
+        {"type": "escape"}
+    """
+    @abstractmethod
+    def decide(self, player, allies: List[Battler], enemies: List[Battler]) -> dict:
+        """
+        决定玩家本回合的行动。
+
+        参数:
+            player: 玩家
+            allies (List[Battler]): 存活的友方单位
+            enemies (List[Battler]): 存活的敌方单位
+
+        返回:
+            dict: 行动描述字典
+        """
+
+
+class AttackPolicy(CombatPolicy):
+    """始终对随机敌人进行普通攻击的策略，不会逃跑。"""
+    def decide(self, player, allies, enemies) -> dict:
+        return {"type": "attack", "target": rng.stream("combat").choice(enemies)}
+
+
+class AutoModePolicy(CombatPolicy):
+    """
+    自动战斗模式策略。
+
+    生命值低于30%时有50%概率尝试逃跑，其余情况攻击随机敌人。
+    """
+    def decide(self, player, allies, enemies) -> dict:
+        hp_ratio = player.stats["hp"] / player.stats["max_hp"]
+        if hp_ratio < 0.3 and rng.stream("combat").random() < 0.5:
+            return {"type": "escape"}
+        return {"type": "attack", "target": rng.stream("combat").choice(enemies)}
+
+
+class SkillPolicy(CombatPolicy):
+    """
+    优先使用连招和法术的策略。
+
+    连击点数足够时使用消耗最高的连招，魔法值足够时使用消耗最高的伤害类法术，
+    都不满足时攻击随机敌人。不会逃跑，适合测试职业构筑的输出上限。
+    """
+    def decide(self, player, allies, enemies) -> dict:
+        target = rng.stream("combat").choice(enemies)
+        combos = [c for c in player.combos if c.cost <= player.combo_points and c.default_target != "self"]
+        if combos:
+            return {"type": "combo", "combo": max(combos, key=lambda c: c.cost), "target": target}
+        spells = [
+            s for s in player.spells
+            if s.cost <= player.stats["mp"] and (s.is_targeted or s.default_target == "all_enemies")
+        ]
+        if spells:
+            return {"type": "spell", "spell": max(spells, key=lambda s: s.cost), "target": target}
+        return {"type": "attack", "target": target}
+
+
+class ReplayPolicy(CombatPolicy):
+    """
+    按战斗记录中的玩家行动依次决策的策略，用于重放战斗（见 core.combat_log）。
+
+    记录中由策略做出的行动会交给同名策略重新决策，以消耗与原战斗相同的随机数；
+    手动选择的行动按记录中的技能、物品和目标标签还原。
+    """
+    def __init__(self, actions: List[dict]):
+        """
+        参数:
+            actions (List[dict]): 玩家的 "act" 记录，按发生顺序排列
+        """
+        self._actions = iter(actions)
+        self._policies = {}
+        self._executor = None
+
+    def bind(self, executor: "CombatExecutor") -> None:
+        """关联执行战斗的执行器，用于把目标标签还原为战斗单位。"""
+        self._executor = executor
+
+    def decide(self, player, allies, enemies) -> dict:
+        action = next(self._actions, None)
+        if action is None:
+            return {"type": "defend", "by": None}
+        if action.get("by"):
+            decision = self._policy(action["by"]).decide(player, allies, enemies)
+            return {**decision, "by": action["by"]}
+
+        decision = {"type": action["do"], "by": None}
+        if action.get("tg") is not None:
+            decision["target"] = self._executor.battler_by_label(action["tg"])
+        match action["do"]:
+            case "spell":
+                decision["spell"] = next(s for s in player.spells if s.name == action["skill"])
+            case "combo":
+                decision["combo"] = next(c for c in player.combos if c.name == action["skill"])
+            case "item":
+                consumables = player.inventory.get_items_by_type("consumable")
+                decision["item"] = next(i for i in consumables if i.name == action["item"])
+        return decision
+
+    def _policy(self, name: str) -> CombatPolicy:
+        policy = self._policies.get(name)
+        if policy is None:
+            classes = {cls.__name__: cls for cls in _policy_classes(CombatPolicy)}
+            policy = self._policies[name] = classes[name]()
+        return policy
+
+
+def _policy_classes(base):
+    for cls in base.__subclasses__():
+        yield cls
+        yield from _policy_classes(cls)
+
+
+AUTO_MODE_POLICY = AutoModePolicy()
+
+
 # *战斗执行器
 class CombatExecutor:
     """
@@ -203,7 +331,7 @@ class CombatExecutor:
     管理战斗的整个生命周期，包括初始化战斗、执行回合、处理各种行动和结算战斗结果。
     作为战斗系统的主要控制器，协调各战斗单位的行动和战斗状态的变化。
     """
-    def __init__(self, player, allies, enemies):
+    def __init__(self, player, allies, enemies, policy: CombatPolicy = None, headless: bool = False, max_rounds: int = None, combat_rng=None, turn_mode: str = "round", log=None):
         """
         初始化战斗执行器。
 
@@ -211,15 +339,36 @@ class CombatExecutor:
 
         参数:
             player: 玩家对象
-            allies: 友方单位列表，包括玩家
-            enemies: 敌方单位列表
+            allies: 友方单位列表，包括玩家；只有存活单位会参战，传入的列表不会被修改
+            enemies: 敌方单位列表；只有存活单位会参战，传入的列表不会被修改
+            policy (CombatPolicy, optional): 玩家行动策略，提供时玩家回合不再读取键盘输入
+            headless (bool, optional): 是否以无界面模式运行，所有输出被丢弃，默认为False
+            max_rounds (int, optional): 回合上限，超出后以 "timeout" 结束，默认不限制
+            combat_rng (random.Random, optional): 本场战斗使用的随机流，默认从当前会话派生一个新的子流
+            turn_mode (str, optional): 行动顺序模式，"round" 为回合制，"atb" 为时间轴，默认为 "round"
+            log (CombatLog, optional): 战斗记录的写入目标，默认为 combat_log.default_log()，都没有时不记录
         """
         self.player = player
-        self.allies = allies
-        self.enemies = enemies
-        self.battlers = CombatManager.define_battlers(allies, enemies)
-        self.enemy_exp = sum(enemy.xp_reward for enemy in enemies)
-        self.enemy_money = sum(enemy.gold_reward for enemy in enemies)
+        self.allies = Roster(b for b in allies if b.alive)
+        self.enemies = Roster(b for b in enemies if b.alive)
+        self.policy = policy
+        self.headless = headless
+        self.max_rounds = max_rounds
+        self.rng = combat_rng or rng.current().fork("combat")
+        self.log = log if log is not None else combat_log.default_log()
+        # 快照在任何战斗状态改变之前生成
+        self._snapshot = battle_state.snapshot(player, list(self.allies), list(self.enemies)) if self.log is not None else None
+        self.scheduler = TurnScheduler(self.allies, self.enemies, turn_mode)
+        self.effects = EffectWheel(self.allies + self.enemies)
+        self.enemy_exp = sum(enemy.xp_reward for enemy in self.enemies)
+        self.enemy_money = sum(enemy.gold_reward for enemy in self.enemies)
+        self.rounds = 0
+        self.damage_dealt = {}
+        self._labels = {}
+        self._deaths = []
+        self._watched = []
+        for battler in self.allies + self.enemies:
+            self._watch(battler)
 
     def execute_combat(self) -> bool:
         """
@@ -230,48 +379,178 @@ class CombatExecutor:
         返回:
             bool: 如果战斗由于逃跑而结束返回True，其他情况返回False
         """
+        return self.run().winner == "escaped"
+
+    def run(self) -> CombatResult:
+        """
+        执行战斗并返回结构化结果。
+
+        战斗期间的 "combat" 随机流被替换为本场战斗自己的子流，
+        无界面模式下所有控制台输出和动画停顿都会被丢弃。
+        设置了战斗记录时，战斗中的每个行动都会写入记录（见 core.combat_log）。
+
+        返回:
+            CombatResult: 战斗结果
+        """
+        recording = combat_log.recording(self.log, self._label) if self.log is not None else nullcontext()
+        with rng.use_stream("combat", self.rng), null_output() if self.headless else nullcontext(), recording:
+            try:
+                if self.log is not None:
+                    self._record_start()
+                return self._run()
+            finally:
+                self.scheduler.close()
+                self.effects.close()
+                for battler in self._watched:
+                    battler.unsubscribe(self._on_battler_event)
+
+    def _record_start(self) -> None:
+        """写入战斗的 "start" 记录，包含重放所需的随机流和参战单位快照。"""
+        fields = {"seed": getattr(self.rng, "session_seed", None), "rng": getattr(self.rng, "key", None)}
+        if fields["rng"] is None:
+            fields["rng_state"] = combat_log.rng_state(self.rng)
+        combat_log.record(
+            "start", **fields, mode=self.scheduler.mode, max_rounds=self.max_rounds,
+            player=self.player, units=list(self._labels), state=self._snapshot,
+        )
+
+    def battler_by_label(self, label: str):
+        """
+        按统计标签查找参战单位（包括已死亡和被召唤的单位）。
+
+        参数:
+            label (str): 单位标签
+
+        返回:
+            Battler | None: 对应的单位，不存在时返回None
+        """
+        for battler, battler_label in self._labels.items():
+            if battler_label == label:
+                return battler
+        return None
+
+    def _watch(self, battler) -> None:
+        battler.subscribe(self._on_battler_event)
+        self._watched.append(battler)
+        self._label(battler)
+
+    def _on_battler_event(self, event: str, battler, *args) -> None:
+        """记录参战单位的死亡，并关注新召唤的单位。"""
+        if event == "death":
+            self._deaths.append(battler)
+            combat_log.record("death", a=battler)
+        elif event == "summoned":
+            for summoned in args:
+                self._watch(summoned)
+            combat_log.record("summon", a=battler, units=list(args))
+
+    def _flush_deaths(self) -> None:
+        """
+        把自上次调用以来死亡的单位移出阵营名单和行动调度。
+
+        每个死亡单位只处理一次，开销与死亡数量成正比，与参战单位数量无关。
+        """
+        while self._deaths:
+            dead = self._deaths.pop()
+            self.enemies.discard(dead)
+            self.allies.discard(dead)
+            self.scheduler.remove(dead)
+
+    @property
+    def battlers(self) -> List[Battler]:
+        """按敏捷排列的全部参战单位，用于界面显示和目标选择。"""
+        return self.scheduler.ordered()
+
+    def _run(self) -> CombatResult:
         enemy_drops = [item for enemy in self.enemies for item in enemy.drop_items]
 
         print("-------------------------------------------------")
         for enemy in self.enemies:
             typewriter(f"野生的 {enemy.name} 出现了!")
 
+        handlers = {
+            "player": self._handle_player_turn,
+            "ally": self._handle_ally_turn,
+            "enemy": self._handle_enemy_turn
+        }
+
         # 只要玩家存活且仍有敌人，战斗就会持续
         while self.player.alive and len(self.enemies) > 0:
-            handlers = {
-                "player": self._handle_player_turn,
-                "ally": self._handle_ally_turn,
-                "enemy": self._handle_enemy_turn
-            }
-
-            # 更新战斗顺序
-            self.battlers = CombatManager.define_battlers(self.allies, self.enemies)
+            if self.max_rounds is not None and self.rounds >= self.max_rounds:
+                return self._result("timeout")
+            self.rounds += 1
 
-            # 每个战斗单位轮流行动
-            for battler in self.battlers:
+            # 每个战斗单位按调度顺序行动
+            self.scheduler.start_round()
+            while (battler := self.scheduler.next_actor()) is not None:
                 if not self.player.alive:
-                    return False
+                    return self._result("enemies")
+                if not self.enemies:
+                    break
 
                 role = "player" if battler == self.player else "ally" if battler.is_ally else "enemy"
-                if handlers[role](battler) is True:
-                    return True
-
-            # 回合结束，检查增益和减益的持续时间
-            for battler in self.battlers:
-                battler.check_buff_debuff_turns()
+                combat_log.record("turn", round=self.rounds, a=battler)
+                total_before, own_before = self._total_damage_taken(), battler.damage_taken
+                escaped = handlers[role](battler)
+                self._flush_deaths()
+                dealt = (self._total_damage_taken() - total_before) - (battler.damage_taken - own_before)
+                self._credit(battler, dealt)
+                if escaped is True:
+                    return self._result("escaped")
+
+            # 回合结束，结算持续伤害并移除到期的增益和减益
+            self.effects.advance()
+            self._flush_deaths()
             text.display_status_effects(self.battlers)
 
         # 战斗胜利，处理奖励
         if self.player.alive:
             self._handle_combat_rewards(enemy_drops)
-            return False
+            return self._result("allies", enemy_drops)
+        return self._result("enemies")
+
+    def _label(self, battler) -> str:
+        """为战斗单位生成唯一的统计标签，同名单位追加序号。"""
+        label = self._labels.get(battler)
+        if label is None:
+            label = battler.name
+            taken = set(self._labels.values())
+            index = 2
+            while label in taken:
+                label = f"{battler.name} #{index}"
+                index += 1
+            self._labels[battler] = label
+            self.damage_dealt[label] = 0
+        return label
+
+    def _total_damage_taken(self) -> int:
+        """统计所有参战单位（包括已死亡单位）累计受到的伤害。"""
+        return sum(b.damage_taken for b in self._labels)
+
+    def _credit(self, actor, amount: int) -> None:
+        if amount > 0:
+            self.damage_dealt[self._label(actor)] += amount
+
+    def _result(self, winner: str, drops=None) -> CombatResult:
+        won = winner == "allies"
+        combat_log.record("end", winner=winner, rounds=self.rounds, dealt=self.damage_dealt, hp=self.player.stats["hp"])
+        return CombatResult(
+            winner=winner,
+            rounds=self.rounds,
+            damage_dealt=dict(self.damage_dealt),
+            exp=self.enemy_exp if won else 0,
+            money=self.enemy_money if won else 0,
+            drops=[(item.name, item.amount) for item in drops or []],
+            player_hp=self.player.stats["hp"],
+            player_max_hp=self.player.stats["max_hp"],
+        )
 
     def _handle_player_turn(self, player) -> bool:
         """
         处理玩家的回合。
 
         显示战斗菜单并处理玩家的行动选择，包括普通攻击、施法、使用连招、
-        防御或尝试逃跑。支持自动战斗模式。
+        防御或尝试逃跑。设置了行动策略或开启自动战斗模式时由策略决定行动。
 
         参数:
             player: 玩家对象
@@ -281,24 +560,18 @@ class CombatExecutor:
         """
         if player.is_defending:
             player.end_defense()
-
-        # TODO 需要更好的自动战斗模式
-        if player.auto_mode:
-            text.combat_menu(player, self.allies, self.enemies)
-            hp_ratio = player.stats["hp"] / player.stats["max_hp"]
-            if hp_ratio < 0.3 and random.random() < 0.5:
-                if BattleCalculator.try_escape(player):
-                    player.check_buff_debuff_turns(True)
-                    typewriter(f"{player.name} 成功逃离了战斗")
-                    player.combo_points = 0
-                    return True
-            else:
-                random_enemy = random.choice(self.enemies)
-                player.normal_attack(random_enemy)
-                CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
-            return False
-
-        while True:
+        fx.stop_skipping()
+
+        policy = self.policy or (AUTO_MODE_POLICY if player.auto_mode else None)
+        if policy is not None:
+            if not self.headless:
+                text.combat_menu(player, self.allies, self.enemies)
+            decision = policy.decide(player, self.allies, self.enemies)
+            decision.setdefault("by", type(policy).__name__)
+            return self._perform_player_decision(player, decision)
+
+        decision = None
+        while decision is None:
             text.combat_menu(player, self.allies, self.enemies)
             cmd = input("> ").lower()
 
@@ -307,36 +580,102 @@ class CombatExecutor:
                 cmd = input("> ").lower()
 
             if "a" in cmd:
-                targeted_enemy = CombatManager.select_target(self.enemies)
-                player.normal_attack(targeted_enemy)
-                CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
-                break
+                decision = {"type": "attack", "target": CombatManager.select_target(self.enemies)}
             elif "s" in cmd:
-                if self._handle_spell_casting(player):
-                    break
+                decision = self._handle_spell_casting(player)
             elif "c" in cmd:
-                if self._handle_combo_usage(player):
-                    break
+                decision = self._handle_combo_usage(player)
             elif "i" in cmd:
-                if self._handle_item_usage(player):
-                    break
+                decision = self._handle_item_usage(player)
             elif "d" in cmd:
-                battle_log(f"{player.name} 正在行动。", "info")
-                dot_loading()
-                player.defend()
-                player.combo_points += 1
-                enhance_weapon.effect(player, player)
-                console.print(COMBAT_TEXT["player"]["defense"], style="yellow")
-                break
+                decision = {"type": "defend"}
             elif "q" in cmd:
-                if BattleCalculator.try_escape(player):
-                    player.check_buff_debuff_turns(True)
-                    typewriter(f"{player.name} 成功逃离了战斗")
-                    player.combo_points = 0
-                    return True
-                break
+                decision = {"type": "escape"}
+        return self._perform_player_decision(player, decision)
+
+    def _perform_player_decision(self, player, decision: dict) -> bool:
+        """
+        执行玩家的行动，行动可以来自策略或键盘输入。
+
+        参数:
+            player: 玩家对象
+            decision (dict): 行动描述字典，格式见 CombatPolicy；
+                由策略给出时 "by" 为策略类名，重放时据此重新决策
+
+        返回:
+            bool: 如果玩家成功逃跑返回True，否则返回False
+        """
+        self._record_action(player, decision)
+        match decision["type"]:
+            case "attack":
+                player.normal_attack(decision["target"])
+            case "defend":
+                self._player_defend(player)
+                return False
+            case "spell":
+                self._use_skill(decision["spell"], player, decision.get("target"))
+            case "combo":
+                self._use_skill(decision["combo"], player, decision.get("target"))
+            case "item":
+                item = decision["item"]
+                item.activate(player)
+                player.inventory.remove_item(item, 1)
+            case "escape":
+                return self._player_escape(player)
+        self._flush_deaths()
+        return False
+
+    @staticmethod
+    def _record_action(actor, decision: dict) -> None:
+        """把行动描述写入战斗记录，只保留不为空的字段。"""
+        if not combat_log.active():
+            return
+        skill = decision.get("spell") or decision.get("combo")
+        fields = {
+            "skill": skill.name if skill else None,
+            "item": decision["item"].name if decision.get("item") else None,
+            "tg": decision.get("target"),
+            "by": decision.get("by"),
+        }
+        combat_log.record("act", a=actor, do=decision["type"], **{k: v for k, v in fields.items() if v is not None})
+
+    def _player_defend(self, player) -> None:
+        battle_log(f"{player.name} 正在行动。", "info")
+        dot_loading()
+        player.defend()
+        player.combo_points += 1
+        skills_data.enhance_weapon.effect(player, player)
+        console.print(COMBAT_TEXT["player"]["defense"], style="yellow")
+
+    def _player_escape(self, player) -> bool:
+        if BattleCalculator.try_escape(player):
+            player.check_buff_debuff_turns(True)
+            typewriter(f"{player.name} 成功逃离了战斗")
+            player.combo_points = 0
+            return True
         return False
 
+    def _use_skill(self, skill, caster, target=None) -> None:
+        """
+        释放法术或连招，未指定目标时按技能的默认目标类型选择。
+
+        参数:
+            skill: 要释放的法术或连招
+            caster: 施法者
+            target: 指定的目标，对需要目标的技能默认为随机敌人
+        """
+        if skill.is_targeted:
+            target = target or rng.stream("combat").choice(self.enemies)
+        else:
+            match skill.default_target:
+                case "self":
+                    target = caster
+                case "all_enemies":
+                    target = self.enemies
+                case "allies":
+                    target = self.allies
+        skill.effect(caster, target)
+
     def _handle_ally_turn(self, ally):
         """
         处理盟友的回合。
@@ -349,9 +688,10 @@ class CombatExecutor:
         if ally.is_defending:
             ally.end_defense()
         if self.enemies:
-            random_enemy = random.choice(self.enemies)
+            random_enemy = rng.stream("combat").choice(self.enemies)
+            self._record_action(ally, {"type": "attack", "target": random_enemy})
             ally.normal_attack(random_enemy)
-            CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
+            self._flush_deaths()
 
     def _handle_enemy_turn(self, enemy):
         """
@@ -366,22 +706,23 @@ class CombatExecutor:
             enemy.end_defense()
         if self.allies:
             decision = enemy.decide_action(self.allies)
+            self._record_action(enemy, decision)
             match decision["type"]:
                 case "attack":
                     enemy.normal_attack(decision["target"])
-                    CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
+                    self._flush_deaths()
                 case "defend":
                     battle_log(f"{enemy.name} 正在行动", "info")
                     dot_loading()
                     enemy.defend()
-                    enhance_weapon.effect(enemy, enemy)
+                    skills_data.enhance_weapon.effect(enemy, enemy)
                     console.print(COMBAT_TEXT["enemy"]["defense"], style="yellow")
                 case "spell":
                     spell = decision["spell"]
                     target = None
 
                     if spell.is_targeted:
-                        target = random.choice(self.allies)
+                        target = rng.stream("combat").choice(self.allies)
                     elif spell.default_target == "self":
                         target = enemy
                     elif spell.default_target == "all_enemies":
@@ -389,15 +730,15 @@ class CombatExecutor:
                     elif spell.default_target == "allies":
                         target = self.enemies
                     else:
-                        target = random.choice(self.allies)
+                        target = rng.stream("combat").choice(self.allies)
                         enemy.normal_attack(target)
-                        CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
+                        self._flush_deaths()
                         return
 
                     spell.effect(enemy, target)
-                    CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
+                    self._flush_deaths()
 
-    def _handle_spell_casting(self, caster) -> bool:
+    def _handle_spell_casting(self, caster) -> dict | None:
         """
         处理施法菜单和效果。
 
@@ -407,11 +748,11 @@ class CombatExecutor:
         参数:
             caster: 施法者单位
         返回:
-            bool: 是否实际释放了技能
+            dict | None: 施法的行动描述，取消时返回None
         """
         if not caster.spells:
             console.print(COMBAT_TEXT["spell"]["nothing"], style="red")
-            return False
+            return None
         text.spell_menu(caster)
         option = int(input("> "))
         while option not in range(len(caster.spells)+1):
@@ -419,26 +760,12 @@ class CombatExecutor:
             option = int(input("> "))
         if option == 0:
             console.print(COMBAT_TEXT["spell"]["refuse"], style="yellow")
-            return False
+            return None
         spell_chosen = caster.spells[option-1]
-        target = None
+        target = CombatManager.select_target(self.battlers) if spell_chosen.is_targeted else None
+        return {"type": "spell", "spell": spell_chosen, "target": target}
 
-        if spell_chosen.is_targeted:
-            target = CombatManager.select_target(self.battlers)
-        else:
-            match spell_chosen.default_target:
-                case "self":
-                    target = caster
-                case "all_enemies":
-                    target = self.enemies
-                case "allies":
-                    target = self.allies
-
-        spell_chosen.effect(caster, target)
-        CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
-        return True
-
-    def _handle_combo_usage(self, caster) -> bool:
+    def _handle_combo_usage(self, caster) -> dict | None:
         """
         处理连招菜单和效果。
 
@@ -448,11 +775,11 @@ class CombatExecutor:
         参数:
             caster: 使用连招的单位
         返回:
-            bool: 是否实际释放了连招
+            dict | None: 连招的行动描述，取消时返回None
         """
         if not caster.combos:
             console.print(COMBAT_TEXT["combo"]["nothing"], style="red")
-            return False
+            return None
         text.combo_menu(caster)
         option = int(input("> "))
         while option not in range(len(caster.combos)+1):
@@ -460,24 +787,12 @@ class CombatExecutor:
             option = int(input("> "))
         if option == 0:
             console.print(COMBAT_TEXT["combo"]["refuse"], style="yellow")
-            return False
+            return None
         combo_chosen = caster.combos[option-1]
-        target = None
-
-        if combo_chosen.is_targeted:
-            target = CombatManager.select_target(self.battlers)
-        else:
-            match combo_chosen.default_target:
-                case "self":
-                    target = caster
-                case "all_enemies":
-                    target = self.enemies
+        target = CombatManager.select_target(self.battlers) if combo_chosen.is_targeted else None
+        return {"type": "combo", "combo": combo_chosen, "target": target}
 
-        combo_chosen.effect(caster, target)
-        CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
-        return True
-
-    def _handle_item_usage(self, caster) -> bool:
+    def _handle_item_usage(self, caster) -> dict | None:
         """
         处理使用物品的效果。
 
@@ -487,22 +802,18 @@ class CombatExecutor:
         参数:
             caster: 使用物品的单位
         返回:
-            bool: 是否实际使用了物品
+            dict | None: 使用物品的行动描述，取消时返回None
         """
         from bag.interface import select_item_from_list
         consumables = caster.inventory.get_items_by_type("consumable")
         if not consumables:
             console.print(COMBAT_TEXT["item"]["nothing"], style="red")
-            return False
+            return None
         item = select_item_from_list(consumables, prompt="选择要使用的消耗品：")
         if not item:
             console.print(COMBAT_TEXT["item"]["refuse"], style="yellow")
-            return False
-        item.activate(caster)
-        caster.inventory.remove_item(item, 1)
-
-        CombatManager.check_if_dead(self.allies, self.enemies, self.battlers)
-        return True
+            return None
+        return {"type": "item", "item": item}
 
     def _handle_combat_rewards(self, enemy_drops):
         """
@@ -515,7 +826,7 @@ class CombatExecutor:
 
         副作用:
             - 添加经验和金钱给玩家
-            - 将掉落物品添加到玩家库存
+            - 将掉落物品在一个库存事务中添加到玩家库存
             - 恢复玩家部分生命值和魔法值
             - 重置玩家的连击点数
         """
@@ -526,8 +837,10 @@ class CombatExecutor:
         self.player.combo_points = 0
         CombatManager.recover_hp_and_mp(self.player, 0.25)
 
+        with self.player.inventory.transaction() as loot:
+            for item in enemy_drops:
+                loot.add(item)
         for item in enemy_drops:
-            self.player.inventory.add_item(item)
             print(f"- {item.name} x{item.amount}")
 
 # *战斗入口
@@ -547,3 +860,25 @@ def combat(player, enemies):
     allies = [player]
     combat_system = CombatExecutor(player, allies, enemies)
     return combat_system.execute_combat()
+
+def headless_combat(player, enemies, policy: CombatPolicy = None, max_rounds: int = 200, turn_mode: str = "round", log=None) -> CombatResult:
+    """
+    无界面战斗入口。
+
+    不读取键盘输入、不产生任何输出和停顿，玩家回合由行动策略决定，
+    适合平衡性测试和自动化回归中大批量执行战斗。
+
+    参数:
+        player: 玩家对象
+        enemies: 敌人单位列表
+        policy (CombatPolicy, optional): 玩家行动策略，默认为 AttackPolicy
+        max_rounds (int, optional): 回合上限，默认为200
+        turn_mode (str, optional): 行动顺序模式，"round" 或 "atb"，默认为 "round"
+        log (CombatLog, optional): 战斗记录的写入目标，见 core.combat_log
+
+    返回:
+        CombatResult: 战斗结果
+    """
+    allies = [player]
+    combat_system = CombatExecutor(player, allies, enemies, policy=policy or AttackPolicy(), headless=True, max_rounds=max_rounds, turn_mode=turn_mode, log=log)
+    return combat_system.run()
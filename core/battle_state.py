@@ -0,0 +1,273 @@
+"""
+战斗快照模块，把参战单位保存为纯 JSON 数据，并用游戏中已有的工厂重建它们。
+
+快照只包含普通的数据：属性的基础值和各加成来源、带剩余回合数的增益/减益效果、
+技能和连招的名称、背包和装备的物品名称与数量等。
+重建时通过 ENEMY_DATA、Player、SUMMON_CLASS_MAP 创建单位，
+通过 ALL_SKILLS、SPELL_REGISTRY 查找技能，通过 equipment_data 等物品表创建物品，
+读取快照不会执行任何快照中的代码，因此可以放心重放别人分享的战斗记录。
+
+单位的快照:
+    kind      "player"、"enemy" 或召唤物的类名（SUMMON_CLASS_MAP 的键）
+    name, alive, is_ally, is_defending, damage_taken
+    stats     {"base": 基础值, "sources": [[来源, 加成], ...]}，
+              装备等元组来源写成列表，增益/减益来源写成 {"buff": 在 buffs 中的下标}
+    buffs     [{"cls", "name", "stat", "amount", "turns", "max_turns", "effect_type", "difference"(, "damage")}]
+    spells    技能名称列表
+玩家另有 level、xp、class_name、aptitude_points、aptitudes、money、combo_points、auto_mode、
+combos、inventory、equipment；敌人另有 enemy_id、xp_reward、gold_reward、level、action_weights、drops。
+
+物品写成 [名称, 数量]，装备写成 [基础名称, 数量, 品质, 品质是否作用于属性]。
+
+用法:
+    state = snapshot(player, allies, enemies)
+    player, allies, enemies = restore(json.loads(json.dumps(state)))
+"""
+
+from functools import lru_cache
+from typing import List, Tuple
+
+
+# *快照
+def snapshot(player, allies, enemies) -> dict:
+    """
+    生成参战单位的 JSON 快照。
+
+    参数:
+        player: 玩家
+        allies: 友方单位，可以包含玩家本身
+        enemies: 敌方单位
+
+    返回:
+        dict: 只包含 JSON 数据的快照，友方单位中的玩家写成 "player"
+    """
+    return {
+        "player": _encode_player(player),
+        "allies": ["player" if ally is player else _encode_battler(ally, type(ally).__name__) for ally in allies],
+        "enemies": [_encode_enemy(enemy) for enemy in enemies],
+    }
+
+
+def _encode_battler(battler, kind: str) -> dict:
+    from skills import BuffDebuff
+
+    buffs = battler.buffs_and_debuffs
+    sources = []
+    for key in battler.stats.source_keys():
+        if isinstance(key, BuffDebuff):
+            encoded = {"buff": next(i for i, buff in enumerate(buffs) if buff is key)}
+        elif isinstance(key, tuple):
+            encoded = list(key)
+        else:
+            encoded = key
+        sources.append([encoded, battler.stats.source(key)])
+    return {
+        "kind": kind,
+        "name": battler.name,
+        "alive": battler.alive,
+        "is_ally": battler.is_ally,
+        "is_defending": battler.is_defending,
+        "damage_taken": battler.damage_taken,
+        "stats": {"base": {stat: battler.stats.base(stat) for stat in battler.stats}, "sources": sources},
+        "buffs": [_encode_buff(buff) for buff in buffs],
+        "spells": [spell.name for spell in battler.spells],
+    }
+
+
+def _encode_buff(buff) -> dict:
+    from skills import PoisonEffect
+
+    data = {
+        "cls": type(buff).__name__, "name": buff.name, "stat": buff.stat, "amount": buff.amount,
+        "turns": buff.turns, "max_turns": buff.max_turns, "effect_type": buff.effect_type,
+        "difference": buff.difference,
+    }
+    if isinstance(buff, PoisonEffect):
+        data["damage"] = buff.damage
+    return data
+
+
+def _encode_player(player) -> dict:
+    data = _encode_battler(player, "player")
+    data.update(
+        level=player.ls.level, xp=player.ls.xp, class_name=player.ls.class_name,
+        aptitude_points=player.ls.aptitude_points, aptitudes=dict(player.aptitudes),
+        money=player.money, combo_points=player.combo_points, auto_mode=player.auto_mode,
+        combos=[combo.name for combo in player.combos],
+        inventory=[encode_item(item) for item in player.inventory.items],
+        equipment={slot: encode_item(item) if item else None for slot, item in player.equipment.items()},
+    )
+    return data
+
+
+def _encode_enemy(enemy) -> dict:
+    data = _encode_battler(enemy, "enemy")
+    data.update(
+        enemy_id=enemy.enemy_id, xp_reward=enemy.xp_reward, gold_reward=enemy.gold_reward, level=enemy.level,
+        action_weights=dict(enemy.action_weights), drops=[encode_item(item) for item in enemy.drop_items],
+    )
+    return data
+
+
+def encode_item(item) -> list:
+    """把物品写成 [名称, 数量]，装备写成 [基础名称, 数量, 品质, 品质是否作用于属性]。"""
+    from others.equipment import Equipment
+
+    if isinstance(item, Equipment):
+        quality, applied = item.variant_key()
+        return [item.base_name, item.amount, list(quality), applied]
+    return [item.name, item.amount]
+
+
+# *重建
+def restore(state: dict) -> Tuple:
+    """
+    根据快照重建参战单位。
+
+    参数:
+        state (dict): snapshot 生成的快照
+
+    返回:
+        tuple: (玩家, 友方单位列表, 敌方单位列表)，友方单位中的 "player" 为重建的玩家
+
+    异常:
+        ValueError: 快照中的技能、物品或单位类型在游戏数据中不存在
+    """
+    from skills.loader import SUMMON_CLASS_MAP
+
+    player = _restore_player(state["player"])
+    allies = []
+    for data in state["allies"]:
+        if data == "player":
+            allies.append(player)
+            continue
+        summon = SUMMON_CLASS_MAP.get(data["kind"])
+        if summon is None:
+            raise ValueError(f"无法还原战斗单位: {data['kind']}")
+        allies.append(_restore_battler(summon(), data))
+    return player, allies, [_restore_enemy(data) for data in state["enemies"]]
+
+
+def _restore_battler(battler, data: dict):
+    """把快照中的通用状态写入新创建的单位。"""
+    from core.stats import StatSheet
+
+    battler.name = data["name"]
+    battler.alive = data["alive"]
+    battler.is_ally = data["is_ally"]
+    battler.is_defending = data["is_defending"]
+    battler.damage_taken = data["damage_taken"]
+    battler.spells = [find_spell(name) for name in data["spells"]]
+    battler.stats = StatSheet(data["stats"]["base"])
+    battler.buffs_and_debuffs = [_restore_buff(battler, buff) for buff in data["buffs"]]
+    for key, mods in data["stats"]["sources"]:
+        if isinstance(key, dict):
+            key = battler.buffs_and_debuffs[key["buff"]]
+        elif isinstance(key, list):
+            key = tuple(key)
+        battler.stats.set_source(key, mods)
+    return battler
+
+
+def _restore_buff(target, data: dict):
+    from skills import BuffDebuff, PoisonEffect
+
+    cls = {"BuffDebuff": BuffDebuff, "PoisonEffect": PoisonEffect}.get(data["cls"])
+    if cls is None:
+        raise ValueError(f"无法还原状态效果: {data['cls']}")
+    if cls is PoisonEffect:
+        buff = PoisonEffect(data["name"], target, data["stat"], data["damage"], data["turns"], data["effect_type"])
+    else:
+        buff = cls(data["name"], target, data["stat"], data["amount"], data["turns"], data["effect_type"])
+    buff.max_turns = data["max_turns"]
+    buff.difference = data["difference"]
+    return buff
+
+
+def _restore_player(data: dict):
+    from player import Player
+
+    player = _restore_battler(Player(data["name"]), data)
+    player.ls.level, player.ls.xp, player.ls.class_name = data["level"], data["xp"], data["class_name"]
+    player.ls.aptitude_points = data["aptitude_points"]
+    player.ls.xp_to_next_level = player.ls.exp_required_formula()
+    player.aptitudes = dict(data["aptitudes"])
+    player.money = data["money"]
+    player.combo_points = data["combo_points"]
+    player.auto_mode = data["auto_mode"]
+    player.combos = [find_spell(name) for name in data["combos"]]
+    for item in data["inventory"]:
+        player.inventory.add_item(decode_item(item))
+    # 装备的属性加成已经在属性来源中，这里只放回装备本身
+    for slot, item in data["equipment"].items():
+        player.equipment[slot] = decode_item(item) if item else None
+    return player
+
+
+def _restore_enemy(data: dict):
+    from enemies import ENEMY_DATA, Enemy
+
+    if data["enemy_id"] is not None:
+        drops = ENEMY_DATA[data["enemy_id"]].drop_items
+    else:
+        drops = [decode_item(item) for item in data["drops"]]
+    enemy = Enemy(data["name"], data["stats"]["base"], data["xp_reward"], data["gold_reward"], data["level"], drops)
+    enemy.enemy_id = data["enemy_id"]
+    enemy.action_weights = dict(data["action_weights"])
+    return _restore_battler(enemy, data)
+
+
+@lru_cache(maxsize=None)
+def _spells() -> dict:
+    """技能名称 -> 技能，包括玩家技能、连招和敌人技能。"""
+    from data import ALL_SKILLS, SPELL_REGISTRY
+
+    spells = {spell.name: spell for spell in SPELL_REGISTRY.values()}
+    spells.update(ALL_SKILLS.items())
+    return spells
+
+
+def find_spell(name: str):
+    """
+    按名称查找技能或连招。
+
+    异常:
+        ValueError: 技能不存在
+    """
+    spell = _spells().get(name)
+    if spell is None:
+        raise ValueError(f"无法还原技能: {name}")
+    return spell
+
+
+@lru_cache(maxsize=None)
+def _items() -> dict:
+    """物品名称（装备为基础名称）-> 物品表中的物品。"""
+    from data import items_data
+
+    tables: List = [
+        items_data.equipment_data.values(), items_data.food_data.values(), items_data.jewel_data.values(),
+        items_data.grimoires,
+        [items_data.hp_potion, items_data.mp_potion, items_data.hp_potion2,
+         items_data.mp_potion2, items_data.hp_potion3, items_data.mp_potion3],
+    ]
+    return {item.definition.name: item for table in tables for item in table}
+
+
+def decode_item(data: list):
+    """
+    根据 encode_item 的结果创建物品，材料等不在物品表中的物品由 item_factory 创建。
+
+    异常:
+        ValueError: 物品不存在
+    """
+    from data import item_factory
+
+    name, amount = data[0], data[1]
+    prototype = _items().get(name)
+    if prototype is None:
+        prototype = item_factory(name, amount)
+        if prototype is None:
+            raise ValueError(f"无法还原物品: {name}")
+    variant = (tuple(data[2]), data[3]) if len(data) > 2 else None
+    return type(prototype).from_variant(prototype.definition, amount, variant)
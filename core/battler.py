@@ -6,14 +6,16 @@
 这个基类为战斗系统提供了统一的接口和共享功能。
 """
 
-import random
 from typing import Dict
-from rich.console import Console
 
+from ui import get_console
 from ui import battle_log
 from ui import dot_loading, wait
+from core import rng
+from core import combat_log
+from core.stats import StatSheet
 
-console = Console()
+console = get_console()
 
 
 # *基本战斗单位类
@@ -27,12 +29,14 @@ class Battler:
 
     属性:
         name (str): 战斗单位的名称
-        stats (Dict[str, int]): 战斗单位的各项属性值，如生命值、攻击力等
+        stats (StatSheet): 战斗单位的各项属性值，如生命值、攻击力等，见 core.stats
         alive (bool): 单位是否存活
         buffs_and_debuffs (list): 当前影响单位的增益和减益效果
         is_ally (bool): 是否为友方单位
         is_defending (bool): 是否处于防御状态
         spells (list): 单位可使用的法术列表
+        damage_taken (int): 累计受到的伤害，用于战斗统计
+        listeners (list): 订阅该单位战斗事件的回调函数
     """
     def __init__(self, name: str, stats: Dict[str, int]) -> None:
         """
@@ -57,12 +61,47 @@ class Battler:
                 - anti_crit: 抗暴击率
         """
         self.name = name
-        self.stats = stats
+        self.stats = stats if isinstance(stats, StatSheet) else StatSheet(stats)
         self.alive = True
         self.buffs_and_debuffs = []
         self.is_ally = False
         self.is_defending = False
         self.spells = []
+        self.damage_taken = 0
+        self.listeners = []
+
+    def subscribe(self, listener) -> None:
+        """
+        订阅该单位的战斗事件。
+
+        参数:
+            listener: 回调函数，以 listener(事件名, 单位, *附加参数) 的形式调用
+        """
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        """取消订阅该单位的战斗事件。"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def emit(self, event: str, *args) -> None:
+        """
+        向所有订阅者广播战斗事件。
+
+        目前使用的事件:
+            - "agi_changed": 敏捷被增益/减益效果改变
+            - "summoned": 召唤了新的单位，附加参数为被召唤的单位
+            - "effect_added": 获得了状态效果，附加参数为该效果
+            - "effect_removed": 状态效果结束，附加参数为该效果
+            - "death": 单位死亡
+
+        参数:
+            event (str): 事件名
+            *args: 事件附加参数
+        """
+        for listener in tuple(self.listeners):
+            listener(event, self, *args)
 
     def take_dmg(self, dmg: int) -> None:
         """
@@ -79,19 +118,34 @@ class Battler:
             - 可能改变单位的存活状态
             - 输出相关战斗信息
         """
-        dmg = max(round(dmg * random.uniform(0.9, 1.1)), 5)
+        dmg = max(round(dmg * rng.stream("combat").uniform(0.9, 1.1)), 5)
 
         if self.is_defending:
             dmg = round(dmg * 0.5)
             console.print(f"{self.name} 正在防御，伤害减半!", style="cyan")
 
         self.stats["hp"] -= dmg
+        self.damage_taken += dmg
+        combat_log.record("dmg", tg=self, n=dmg, hp=self.stats["hp"])
         console.print(f"{self.name} 受到伤害 {dmg}", style="red")
         wait()
         # 检查是否死亡
         if self.stats["hp"] <= 0:
             console.print(f"{self.name} 被杀死了", style="bold red")
-            self.alive = False
+            self.die()
+
+    def die(self) -> None:
+        """
+        使单位死亡。
+
+        副作用:
+            - 设置单位的存活状态为False
+            - 首次死亡时广播 "death" 事件
+        """
+        if not self.alive:
+            return
+        self.alive = False
+        self.emit("death")
 
     def normal_attack(self, defender: 'Battler') -> int:
         """
@@ -154,11 +208,11 @@ class Battler:
             在控制台输出暴击信息
         """
         crit_base = self.stats["atk"]*3.5 + self.stats["luk"]*1.2
-        rate = random.choices([1.5, 2.0, 2.5, 3.0], weights=[50, 30, 17, 3])[0] # 暴击倍率 : 概率
+        rate = rng.stream("combat").choices([1.5, 2.0, 2.5, 3.0], weights=[50, 30, 17, 3])[0] # 暴击倍率 : 概率
         rate += round(self.stats["crit"]/100, 2)
         console.print(f"暴击! x{rate}", style="bold yellow")
 
-        dmg = round(crit_base * random.uniform(1.0, 1.2) * rate)
+        dmg = round(crit_base * rng.stream("combat").uniform(1.0, 1.2) * rate)
         battle_log(f"{self.name} 对 {defender.name} 造成了 {dmg} 点暴击伤害", "crit")
         return dmg
 
@@ -177,7 +231,7 @@ class Battler:
         """
         base = self.stats["atk"]*4 - defender.stats["def"]*2.5
         base += self.stats["luk"] - defender.stats["luk"]
-        return round(max(base, self.stats["luk"]*1.2) * random.uniform(0.8, 1.2)) # 伤害浮动：±20%
+        return round(max(base, self.stats["luk"]*1.2) * rng.stream("combat").uniform(0.8, 1.2)) # 伤害浮动：±20%
 
     def _calc_magic_damage(self, defender):
         """
@@ -194,7 +248,7 @@ class Battler:
         """
         base = self.stats["mat"]*3 - defender.stats["mdf"]*1.7
         base += self.stats["luk"]*1.2 - defender.stats["luk"]
-        return round(max(base, self.stats["luk"]*1.5) * random.uniform(0.8, 1.3))
+        return round(max(base, self.stats["luk"]*1.5) * rng.stream("combat").uniform(0.8, 1.3))
 
     def recover_mp(self, amount):
         """
@@ -209,6 +263,7 @@ class Battler:
             更新单位的魔法值并输出提示信息
         """
         self.stats["mp"] = min(self.stats["mp"] + amount, self.stats["max_mp"])
+        combat_log.record("mp", tg=self, n=amount, mp=self.stats["mp"])
         console.print(f"{self.name} 恢复了 {amount}MP", style="blue")
 
     def heal(self, amount):
@@ -224,6 +279,7 @@ class Battler:
             更新单位的生命值并输出提示信息
         """
         self.stats["hp"] = min(self.stats["hp"] + amount, self.stats["max_hp"])
+        combat_log.record("heal", tg=self, n=amount, hp=self.stats["hp"])
         console.print(f"{self.name} 治愈了 {amount}HP", style="green")
 
     def check_buff_debuff_turns(self, clear_all: bool = False) -> None:
@@ -231,6 +287,7 @@ class Battler:
         检查增益和减益效果的持续时间。
 
         遍历单位当前的所有增益和减益效果，检查其持续时间或全部清除。
+        战斗中效果的到期由时间轮（core.effect_wheel）处理，这里主要用于清除全部效果。
 
         参数:
             clear_all (bool): 是否清除所有效果，默认为False
@@ -238,7 +295,7 @@ class Battler:
         副作用:
             可能移除已到期的增益和减益效果
         """
-        for bd in self.buffs_and_debuffs:
+        for bd in list(self.buffs_and_debuffs):
             bd.deactivate() if clear_all else bd.check_turns()
 
     def defend(self):
@@ -0,0 +1,297 @@
+"""
+战斗记录模块，把战斗中的每一个行动写成结构化记录，并可以按记录重放战斗。
+
+记录以 JSON Lines 格式追加写入文件，每行一条，写入经过缓冲，不会拖慢战斗。
+每场战斗以一条 "start" 记录开头，其中保存随机流的派生键（或状态）和参战单位的初始快照，
+快照是纯 JSON 数据（见 core.battle_state），
+之后按发生顺序记录:
+    turn      轮到某个单位行动:            round, a
+    act       行动选择:                    a, do, skill, item, tg
+    roll      命中/暴击/逃跑判定:          check, a, tg, roll, chance, ok
+    dmg       受到伤害:                    tg, n, hp
+    heal, mp  恢复生命值/魔法值:           tg, n, hp/mp
+    buff      获得增益/减益/持续伤害:      tg, name, stat, n, turns
+    tick      持续伤害生效:                tg, name, n, hp
+    buff_end  状态结束:                    tg, name
+    summon    召唤:                        a, units
+    death     死亡:                        a
+    end       战斗结束:                    winner, rounds, dealt, hp
+战斗单位以战斗内唯一的标签表示（同名单位追加序号，见 CombatExecutor._label）。
+
+重放时通过游戏数据中的工厂根据快照重建参战单位、恢复同一个随机流，
+并用记录中的玩家选择代替键盘输入，
+逐条比对重新产生的记录，第一处不一致即抛出 ReplayMismatch。
+重放不输出任何内容、没有任何停顿，可用于复现问题和比较优化前后的战斗结果。
+
+用法:
+    with CombatLog("fights.jsonl") as log:
+        CombatExecutor(player, allies, enemies, log=log).run()
+    results = replay("fights.jsonl")
+"""
+
+import json
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+from core import battle_state
+from core import rng
+
+
+class ReplayMismatch(AssertionError):
+    """
+    重放产生的记录与日志不一致。
+
+    属性:
+        index (int): 不一致的记录在本场战斗中的序号
+        expected (dict): 日志中的记录
+        actual (dict): 重放产生的记录
+    """
+    def __init__(self, index: int, expected: Optional[dict], actual: Optional[dict]) -> None:
+        self.index = index
+        self.expected = expected
+        self.actual = actual
+        super().__init__(f"第 {index} 条记录不一致: 日志为 {expected}，重放为 {actual}")
+
+
+def _dumps(entry: dict) -> str:
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+class CombatLog:
+    """
+    追加写入的战斗记录文件。
+
+    记录先放入内存缓冲，缓冲满 buffer_size 条或调用 flush/close 时才写入文件。
+
+    属性:
+        path (str): 记录文件路径
+        buffer_size (int): 缓冲的记录条数
+    """
+    def __init__(self, path: str, buffer_size: int = 512) -> None:
+        """
+        以追加模式打开记录文件。
+
+        参数:
+            path (str): 记录文件路径，不存在时自动创建
+            buffer_size (int): 缓冲的记录条数，默认为512
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, entry: dict) -> None:
+        """把一条记录放入缓冲，缓冲已满时写入文件。"""
+        self._buffer.append(_dumps(entry))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """把缓冲中的记录写入文件。"""
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        """写入剩余记录并关闭文件。"""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "CombatLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _Verifier:
+    """重放时使用的记录目标，逐条与日志比对而不写入文件。"""
+    def __init__(self, expected: List[dict]) -> None:
+        self.expected = expected
+        self.index = 0
+
+    def write(self, entry: dict) -> None:
+        expected = self.expected[self.index] if self.index < len(self.expected) else None
+        if entry != expected and json.loads(_dumps(entry)) != expected:
+            raise ReplayMismatch(self.index, expected, entry)
+        self.index += 1
+
+    def finish(self) -> None:
+        if self.index < len(self.expected):
+            raise ReplayMismatch(self.index, self.expected[self.index], None)
+
+
+class _Recording:
+    """一场战斗的记录状态：写入目标和战斗单位的标签函数。"""
+    __slots__ = ("sink", "label")
+
+    def __init__(self, sink, label: Callable) -> None:
+        self.sink = sink
+        self.label = label
+
+    def encode(self, value):
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        if hasattr(value, "stats"):
+            return self.label(value)
+        if isinstance(value, dict):
+            return {key: self.encode(item) for key, item in value.items()}
+        return [self.encode(item) for item in value]
+
+
+_recording: ContextVar[Optional[_Recording]] = ContextVar("combat_recording", default=None)
+_default_log: Optional[CombatLog] = None
+
+
+def set_default_log(log: Optional[CombatLog]) -> None:
+    """
+    设置默认的战斗记录文件，之后未指定记录目标的战斗都会写入该文件。
+
+    参数:
+        log (CombatLog | None): 记录文件，None 表示不再记录
+    """
+    global _default_log
+    _default_log = log
+
+
+def default_log() -> Optional[CombatLog]:
+    """返回默认的战斗记录文件，未设置时返回None。"""
+    return _default_log
+
+
+@contextmanager
+def recording(sink, label: Callable):
+    """
+    在上下文内把 record 产生的记录写入 sink。
+
+    参数:
+        sink: 记录目标，需要提供 write(dict) 方法，例如 CombatLog
+        label (Callable): 把战斗单位转换为标签的函数
+    """
+    token = _recording.set(_Recording(sink, label))
+    try:
+        yield
+    finally:
+        _recording.reset(token)
+
+
+def active() -> bool:
+    """当前是否有战斗正在记录。"""
+    return _recording.get() is not None
+
+
+def record(kind: str, **fields) -> None:
+    """
+    记录一条战斗事件，没有战斗正在记录时不做任何事。
+
+    字段中的战斗单位（以及单位列表）会被替换为标签。
+
+    参数:
+        kind (str): 记录类型，见模块说明
+        **fields: 记录字段
+    """
+    current = _recording.get()
+    if current is None:
+        return
+    entry = {"t": kind}
+    for key, value in fields.items():
+        entry[key] = current.encode(value)
+    current.sink.write(entry)
+
+
+def rng_state(generator: random.Random) -> list:
+    """把随机数生成器的状态转换为可写入 JSON 的列表。"""
+    version, internal, gauss_next = generator.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def read_log(path: str) -> Iterator[List[dict]]:
+    """
+    读取记录文件，按战斗分组返回记录。
+
+    参数:
+        path (str): 记录文件路径
+
+    返回:
+        Iterator[List[dict]]: 每场战斗的记录列表，第一条为 "start" 记录
+    """
+    combat: List[dict] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["t"] == "start" and combat:
+                yield combat
+                combat = []
+            combat.append(entry)
+    if combat:
+        yield combat
+
+
+def combat_rng(start: dict):
+    """
+    根据 "start" 记录重建战斗开始时的随机流。
+
+    参数:
+        start (dict): 战斗的 "start" 记录
+
+    返回:
+        random.Random: 处于战斗开始时状态的随机流
+    """
+    if start.get("rng") is not None:
+        return rng.RngSession(start["seed"]).restore(start["rng"])
+    version, internal, gauss_next = start["rng_state"]
+    generator = random.Random()
+    generator.setstate((version, tuple(internal), gauss_next))
+    return generator
+
+
+def replay_combat(records: List[dict]):
+    """
+    重放一场战斗并逐条比对记录。
+
+    参数:
+        records (List[dict]): 一场战斗的全部记录，第一条为 "start" 记录
+
+    返回:
+        CombatResult: 重放得到的战斗结果
+
+    异常:
+        ReplayMismatch: 重放产生的记录与日志不一致
+    """
+    from combat import CombatExecutor, ReplayPolicy
+
+    start = records[0]
+    player, allies, enemies = battle_state.restore(start["state"])
+    player_label = start["player"]
+    decisions = [r for r in records if r["t"] == "act" and r["a"] == player_label]
+    policy = ReplayPolicy(decisions)
+    verifier = _Verifier(records)
+    executor = CombatExecutor(player, allies, enemies, policy=policy, headless=True,
+                              max_rounds=start["max_rounds"], combat_rng=combat_rng(start),
+                              turn_mode=start["mode"], log=verifier)
+    policy.bind(executor)
+    result = executor.run()
+    verifier.finish()
+    return result
+
+
+def replay(path: str) -> List:
+    """
+    重放记录文件中的全部战斗。
+
+    参数:
+        path (str): 记录文件路径
+
+    返回:
+        List[CombatResult]: 每场战斗的重放结果
+
+    异常:
+        ReplayMismatch: 任意一场战斗的重放结果与日志不一致
+    """
+    return [replay_combat(records) for records in read_log(path)]
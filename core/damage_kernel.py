@@ -0,0 +1,188 @@
+"""
+批量伤害计算模块，提供普通攻击结算公式的 NumPy 向量化实现。
+
+该模块把 BattleCalculator.check_miss、check_critical 与 Battler 的
+_calc_normal_damage、_calc_critical_damage、_calc_magic_damage、take_dmg
+中的公式改写为数组运算，一次调用即可结算成千上万次攻击，主要用于平衡性
+模拟等批量场景。每次攻击所需的随机数先由 draw 一次性生成，再交给
+resolve_attacks 计算；各随机量的分布与标量路径完全一致（整数掷骰取自相同的
+闭区间，暴击倍率使用相同的累积权重查找，浮动系数使用相同的 a + (b-a)*u 形式），
+因此批量结果与逐次调用的结果同分布。两条路径的一致性检查见 tests/test_damage_kernel.py，耗时比较见 mods.benchmarks.damage_kernel。
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from core.stats import stat_matrix
+
+# 属性矩阵的列顺序
+STAT_COLUMNS = ("atk", "def", "mat", "mdf", "agi", "luk", "crit", "anti_crit")
+ATK, DEF, MAT, MDF, AGI, LUK, CRIT, ANTI_CRIT = range(len(STAT_COLUMNS))
+
+# 暴击倍率及其权重，与 Battler._calc_critical_damage 保持一致
+CRIT_RATES = np.array([1.5, 2.0, 2.5, 3.0])
+CRIT_RATE_WEIGHTS = (50, 30, 17, 3)
+_CRIT_CUM_WEIGHTS = np.cumsum(CRIT_RATE_WEIGHTS)
+
+
+@dataclass
+class AttackDraws:
+    """
+    一批攻击所需的全部随机数，每个数组长度相同。
+
+    属性:
+        miss_roll (np.ndarray): 命中掷骰，取值 0~100（含）
+        crit_roll (np.ndarray): 暴击掷骰，取值 1~100（含）
+        crit_rate_u (np.ndarray): 用于选择暴击倍率的 [0, 1) 均匀随机数
+        spread_u (np.ndarray): 用于伤害浮动的 [0, 1) 均匀随机数
+        taken_u (np.ndarray): 用于受伤浮动的 [0, 1) 均匀随机数
+    """
+    miss_roll: np.ndarray
+    crit_roll: np.ndarray
+    crit_rate_u: np.ndarray
+    spread_u: np.ndarray
+    taken_u: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.miss_roll)
+
+
+@dataclass
+class AttackOutcome:
+    """
+    一批普通攻击的结算结果，每个数组长度相同。
+
+    属性:
+        magic (np.ndarray): 是否以魔法攻击结算（魔攻高于物攻）
+        miss (np.ndarray): 是否未命中
+        crit (np.ndarray): 是否暴击
+        suppressed (np.ndarray): 暴击是否被抗暴击抑制，与 check_critical 的 was_suppressed 含义相同
+        crit_rate (np.ndarray): 暴击倍率，未暴击时为0
+        damage (np.ndarray): 攻击公式给出的伤害，即 normal_attack 的返回值
+        taken (np.ndarray): 经过 take_dmg 浮动与减伤后实际扣除的生命值，未命中时为0
+    """
+    magic: np.ndarray
+    miss: np.ndarray
+    crit: np.ndarray
+    suppressed: np.ndarray
+    crit_rate: np.ndarray
+    damage: np.ndarray
+    taken: np.ndarray
+
+
+def stat_array(battlers: Iterable) -> np.ndarray:
+    """
+    把一组战斗单位的属性整理为 (n, len(STAT_COLUMNS)) 的矩阵。
+
+    参数:
+        battlers: 战斗单位序列
+
+    返回:
+        np.ndarray: 按 STAT_COLUMNS 顺序排列的 float64 属性矩阵
+    """
+    return stat_matrix([b.stats for b in battlers], STAT_COLUMNS).astype(np.float64)
+
+
+def draw(n: int, rng: np.random.Generator) -> AttackDraws:
+    """
+    为 n 次攻击生成随机数。
+
+    参数:
+        n (int): 攻击次数
+        rng (np.random.Generator): 随机数生成器
+
+    返回:
+        AttackDraws: 本批攻击的随机数
+    """
+    return AttackDraws(
+        miss_roll=rng.integers(0, 101, n),
+        crit_roll=rng.integers(1, 101, n),
+        crit_rate_u=rng.random(n),
+        spread_u=rng.random(n),
+        taken_u=rng.random(n),
+    )
+
+
+def _uniform(a: float, b: float, u: np.ndarray) -> np.ndarray:
+    # 与 random.uniform 的实现 a + (b-a) * random() 相同
+    return a + (b - a) * u
+
+
+def resolve_attacks(attackers: np.ndarray, defenders: np.ndarray, draws: Optional[AttackDraws] = None,
+                    rng: Optional[np.random.Generator] = None, defending: Optional[np.ndarray] = None) -> AttackOutcome:
+    """
+    批量结算普通攻击。
+
+    逐元素地复现 Battler.normal_attack 的流程：魔攻高于物攻时按魔法伤害结算且必定命中；
+    否则依次判定闪避、暴击（含抗暴击抑制），再按暴击或普通伤害公式计算。
+    attackers 与 defenders 的行数相同，或其中之一只有一行（广播）。
+
+    参数:
+        attackers (np.ndarray): 攻击者属性矩阵，列顺序见 STAT_COLUMNS
+        defenders (np.ndarray): 防御者属性矩阵，列顺序见 STAT_COLUMNS
+        draws (AttackDraws, optional): 预先生成的随机数，未提供时用 rng 生成
+        rng (np.random.Generator, optional): 随机数生成器，默认为 np.random.default_rng()
+        defending (np.ndarray, optional): 防御者是否处于防御状态，默认为全否
+
+    返回:
+        AttackOutcome: 结算结果
+    """
+    attackers = np.atleast_2d(np.asarray(attackers, dtype=np.float64))
+    defenders = np.atleast_2d(np.asarray(defenders, dtype=np.float64))
+    n = max(len(attackers), len(defenders))
+    if draws is None:
+        draws = draw(n, rng if rng is not None else np.random.default_rng())
+    if len(draws) != n:
+        raise ValueError(f"随机数数量 {len(draws)} 与攻击次数 {n} 不一致")
+
+    a = np.broadcast_to(attackers, (n, len(STAT_COLUMNS))).T
+    d = np.broadcast_to(defenders, (n, len(STAT_COLUMNS))).T
+
+    magic = a[MAT] > a[ATK]
+
+    # BattleCalculator.check_miss
+    miss_chance = np.floor(np.sqrt(np.maximum(0, 5 * d[AGI] - a[AGI] * 2)))
+    miss = ~magic & (miss_chance > draws.miss_roll)
+
+    # BattleCalculator.check_critical
+    raw_chance = np.rint(a[CRIT] * 0.8 + a[LUK] * 0.2)
+    final_chance = np.maximum(0, np.minimum(80, raw_chance - d[ANTI_CRIT]))
+    hit = ~magic & ~miss
+    crit = hit & (draws.crit_roll <= final_chance)
+    suppressed = hit & (raw_chance > final_chance) & (draws.crit_roll <= raw_chance)
+
+    # Battler._calc_critical_damage
+    rate_index = np.searchsorted(_CRIT_CUM_WEIGHTS, draws.crit_rate_u * _CRIT_CUM_WEIGHTS[-1], side="right")
+    crit_rate = CRIT_RATES[rate_index] + np.round(a[CRIT] / 100, 2)
+    crit_base = a[ATK] * 3.5 + a[LUK] * 1.2
+    crit_damage = np.rint(crit_base * _uniform(1.0, 1.2, draws.spread_u) * crit_rate)
+
+    # Battler._calc_normal_damage
+    normal_base = a[ATK] * 4 - d[DEF] * 2.5
+    normal_base += a[LUK] - d[LUK]
+    normal_damage = np.rint(np.maximum(normal_base, a[LUK] * 1.2) * _uniform(0.8, 1.2, draws.spread_u))
+
+    # Battler._calc_magic_damage
+    magic_base = a[MAT] * 3 - d[MDF] * 1.7
+    magic_base += a[LUK] * 1.2 - d[LUK]
+    magic_damage = np.rint(np.maximum(magic_base, a[LUK] * 1.5) * _uniform(0.8, 1.3, draws.spread_u))
+
+    damage = np.select([magic, miss, crit], [magic_damage, 0, crit_damage], normal_damage).astype(np.int64)
+
+    # Battler.take_dmg
+    taken = np.maximum(np.rint(damage * _uniform(0.9, 1.1, draws.taken_u)), 5)
+    if defending is not None:
+        taken = np.where(defending, np.rint(taken * 0.5), taken)
+    taken = np.where(miss, 0, taken).astype(np.int64)
+
+    return AttackOutcome(
+        magic=magic,
+        miss=miss,
+        crit=crit,
+        suppressed=suppressed,
+        crit_rate=np.where(crit, crit_rate, 0.0),
+        damage=damage,
+        taken=taken,
+    )
@@ -0,0 +1,146 @@
+"""
+状态效果调度模块，在战斗中按到期回合管理增益、减益和持续伤害效果。
+
+EffectWheel 是一个按到期回合分槽的时间轮：效果被施加时放入其到期回合的槽位，
+每回合结束时只取出当回合到期的槽位并移除其中的效果，
+持续伤害效果（如中毒、燃烧）则在一次遍历中统一结算。
+每回合的开销与当回合需要处理的效果数量成正比，与参战单位数量无关，
+没有任何效果的单位不会被访问。
+
+效果被刷新（restart）时直接放入新的到期槽位，旧槽位中的条目在到期时被跳过；
+效果被提前移除时同样不需要从槽位中删除。
+
+时间轮订阅所有成员的战斗事件：
+    "effect_added"    把新施加的效果放入时间轮
+    "effect_removed"  效果提前结束，不再调度
+    "summoned"        把被召唤的单位加入时间轮
+    "death"           单位死亡后其身上的效果不再结算
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+
+class EffectWheel:
+    """
+    按到期回合调度状态效果的时间轮。
+
+    用法:
+        wheel = EffectWheel(battlers)
+        ...  # 每回合结束时
+        wheel.advance()
+        ...  # 战斗结束时
+        wheel.close()
+
+    属性:
+        now (int): 已结算的回合数
+    """
+    def __init__(self, battlers: Iterable) -> None:
+        """
+        初始化时间轮，并调度成员身上已有的效果。
+
+        参数:
+            battlers (Iterable[Battler]): 参战单位
+        """
+        self.now = 0
+        self._slots: Dict[int, List] = defaultdict(list)
+        self._ticking: Dict = {}    # 持续伤害效果的有序集合
+        self._members: Dict = {}
+        for battler in battlers:
+            self.add(battler)
+
+    def add(self, battler) -> None:
+        """
+        把单位加入时间轮，并调度其身上已有的效果。
+
+        参数:
+            battler (Battler): 要加入的单位
+        """
+        if battler in self._members:
+            return
+        self._members[battler] = None
+        battler.subscribe(self._on_event)
+        for effect in battler.buffs_and_debuffs:
+            self.schedule(effect)
+
+    def remove(self, battler) -> None:
+        """
+        把单位移出时间轮，其身上的效果保留剩余回合数但不再结算。
+
+        参数:
+            battler (Battler): 要移出的单位
+        """
+        if self._members.pop(battler, 0) is not None:
+            return
+        battler.unsubscribe(self._on_event)
+        for effect in battler.buffs_and_debuffs:
+            self.unschedule(effect)
+
+    def close(self) -> None:
+        """战斗结束时取消全部订阅，剩余的效果恢复为按回合数计数。"""
+        for battler in list(self._members):
+            self.remove(battler)
+        self._slots.clear()
+        self._ticking.clear()
+
+    def schedule(self, effect) -> None:
+        """
+        按效果的剩余回合数把效果放入到期槽位。
+
+        参数:
+            effect (BuffDebuff): 要调度的效果
+        """
+        if effect.wheel is self:
+            return
+        turns = effect.turns
+        effect.wheel = self
+        effect.expires = self.now + max(1, turns)
+        self._slots[effect.expires].append(effect)
+        if effect.ticks:
+            self._ticking[effect] = None
+
+    def reschedule(self, effect) -> None:
+        """效果的到期回合改变后（如刷新持续时间）放入新的槽位。"""
+        self._slots[effect.expires].append(effect)
+
+    def unschedule(self, effect) -> None:
+        """
+        停止调度效果，效果保留当前的剩余回合数。
+
+        参数:
+            effect (BuffDebuff): 要停止调度的效果
+        """
+        if effect.wheel is not self:
+            return
+        remaining = effect.turns
+        effect.wheel = None
+        effect.turns = remaining
+        self._ticking.pop(effect, None)
+
+    def advance(self) -> None:
+        """
+        结束一回合：统一结算持续伤害，然后移除当回合到期的效果。
+
+        副作用:
+            - 持续伤害效果对目标造成伤害，可能杀死目标
+            - 到期的效果被移除，目标属性随之还原
+        """
+        self.now += 1
+        for effect in list(self._ticking):
+            if effect.wheel is self:
+                effect.tick()
+        for effect in self._slots.pop(self.now, ()):
+            if effect.wheel is self and effect.expires == self.now:
+                effect.deactivate()
+
+    def _on_event(self, event: str, battler, *args) -> None:
+        if event == "effect_added":
+            if battler in self._members:
+                self.schedule(args[0])
+        elif event == "effect_removed":
+            self.unschedule(args[0])
+        elif event == "summoned":
+            for summoned in args:
+                self.add(summoned)
+        elif event == "death":
+            self.remove(battler)
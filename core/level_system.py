@@ -6,9 +6,11 @@
 """
 
 from data import EXPERIENCE_RATE
-from rich.console import Console
 
-console = Console()
+from ui import get_console
+from core.stats import RESOURCES
+
+console = get_console()
 
 class LevelSystem:
     """
@@ -100,8 +102,8 @@ class LevelSystem:
         """
         处理角色升级效果。
 
-        执行升级时的属性提升，包括基础属性增长、增加能力点，
-        应用职业特定成长，并恢复生命值和魔法值。
+        执行升级时的属性提升，包括通用属性成长（记入属性表的 "level" 来源）、
+        增加能力点，应用职业特定成长，并恢复生命值和魔法值。
 
         参数:
             battler: 进行升级的战斗单位对象
@@ -116,12 +118,12 @@ class LevelSystem:
         console.print(f"升级! 现在的等级是: {self.level}, 有 {self.aptitude_points + 1} 个能力点", style="bold yellow")
         self.aptitude_points += 1
 
-        for stat in battler.stats:
-            battler.stats[stat] += 1
-        battler.stats["crit"] -= 1
-        battler.stats["anti_crit"] -= 1
-        battler.stats["max_hp"] += 4
-        battler.stats["max_mp"] += 2
+        growth = {stat: 1 for stat in battler.stats if stat not in RESOURCES}
+        growth.update(crit=0, anti_crit=0, max_hp=5, max_mp=3)
+        for stat in RESOURCES:
+            if stat in battler.stats:
+                battler.stats[stat] += 1
+        battler.stats.add_to_source("level", growth)
 
         self.apply_class_growth(battler)
         battler.recover_mp(9999)
@@ -131,7 +133,8 @@ class LevelSystem:
         """
         应用职业特定的属性成长。
 
-        根据角色的职业类型应用不同的属性成长方案，每个职业有独特的属性加成模式。
+        根据角色的职业类型应用不同的属性成长方案，每个职业有独特的属性加成模式，
+        成长累加在属性表的 "class_growth" 来源上。
 
         参数:
             battler: 需要应用职业成长的战斗单位对象
@@ -151,6 +154,7 @@ class LevelSystem:
             "圣骑士": {"atk": 2, "mat": 1, "max_hp": 10, "agi": -1},
             "死灵法师": {"mat": 3, "max_mp": 10, "max_hp": -15},
         }
-        for stat, val in growth.get(self.class_name, {}).items():
-            battler.stats[stat] += val
+        class_growth = growth.get(self.class_name, {})
+        battler.stats.add_to_source("class_growth", class_growth)
+        for stat, val in class_growth.items():
             console.print(f"{stat} {'+' if val > 0 else ''}{val}", style="green" if val > 0 else "red")
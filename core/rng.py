@@ -0,0 +1,220 @@
+"""
+随机数流模块，为游戏中的所有随机判定提供可注入、可复现的随机源。
+
+游戏中的随机判定不再直接使用全局 random 模块，而是按用途从命名的随机流中取数，
+例如 stream("combat").randint(1, 100)。所有随机流都由一个会话种子派生:
+相同的种子总会得到相同的随机序列，不同用途的随机流互不干扰，
+因此商店刷新不会改变下一场战斗的结果。
+
+常用的随机流名称:
+    combat    战斗中的命中、暴击、伤害浮动、技能效果和敌我行动选择
+    enemy     敌人的生成、变体和金币
+    equipment 装备品质
+    shop      商店进货
+    event     地图事件、事件奖励和饥饿伤害
+    world     世界初始化（如隐藏宝箱的内容）
+    start     开局初始物品
+
+静态数据表（敌人表、装备表等）在第一次访问时加载，加载时的随机判定
+（如敌人金币、装备品质）使用 loading 提供的独立会话，见 loading。
+
+每场战斗通过 fork 获得独立的子随机流，子流的种子只取决于会话种子和战斗序号，
+因此并行模拟中的各个进程没有任何共享状态，配合输入记录（见 mods.input_log）
+可以逐位复现一整局游戏。
+
+会话种子默认取自环境变量 RPG_SEED，未设置时随机生成。
+"""
+
+import os
+import random
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class Stream(random.Random):
+    """
+    命名随机流，即带有派生键的 random.Random。
+
+    属性:
+        session_seed (int): 派生该随机流的会话种子
+        key (str): 派生该随机流所用的键，与会话种子一起即可重建该随机流
+    """
+    def __init__(self, seed, key: str) -> None:
+        self.session_seed = seed
+        self.key = key
+        super().__init__(f"{seed}:{key}")
+
+
+class RngSession:
+    """
+    随机数会话，管理由同一个种子派生的全部随机流。
+
+    属性:
+        seed (int): 会话种子
+        streams (Dict[str, Stream]): 已创建的命名随机流
+    """
+    def __init__(self, seed: int) -> None:
+        self.seed = seed
+        self.streams: Dict[str, Stream] = {}
+        self._forks = Counter()
+
+    def stream(self, name: str) -> Stream:
+        """
+        获取命名随机流，同名随机流在会话内只创建一次。
+
+        参数:
+            name (str): 随机流名称
+
+        返回:
+            Stream: 对应的随机流
+        """
+        rng = self.streams.get(name)
+        if rng is None:
+            rng = self.streams[name] = Stream(self.seed, name)
+        return rng
+
+    def fork(self, name: str) -> Stream:
+        """
+        派生一个新的独立子随机流，例如每场战斗一个。
+
+        第 n 次 fork 同一名称得到的子流只取决于会话种子、名称和 n，
+        与其他随机流被消耗了多少无关。
+
+        参数:
+            name (str): 子随机流的名称
+
+        返回:
+            Stream: 新的子随机流，键为 "名称#序号"
+        """
+        index = self._forks[name]
+        self._forks[name] += 1
+        return Stream(self.seed, f"{name}#{index}")
+
+    def restore(self, key: str) -> Stream:
+        """
+        根据派生键重建一个随机流的初始状态，用于复现某场战斗。
+
+        参数:
+            key (str): Stream.key
+
+        返回:
+            Stream: 处于初始状态的随机流
+        """
+        return Stream(self.seed, key)
+
+    def numpy(self, name: str):
+        """
+        获取与命名随机流对应的 NumPy 随机数生成器，用于批量计算。
+
+        参数:
+            name (str): 随机流名称
+
+        返回:
+            np.random.Generator: 由会话种子和名称派生的生成器
+        """
+        import numpy as np
+        return np.random.default_rng(Stream(self.seed, f"numpy:{name}").getrandbits(128))
+
+
+def _initial_seed() -> int:
+    seed = os.environ.get("RPG_SEED")
+    return int(seed) if seed else random.SystemRandom().getrandbits(32)
+
+
+_default_session = RngSession(_initial_seed())
+_session: ContextVar[Optional[RngSession]] = ContextVar("rng_session", default=None)
+_overrides: ContextVar[Dict[str, random.Random]] = ContextVar("rng_overrides", default={})
+
+
+def current() -> RngSession:
+    """返回当前生效的随机数会话。"""
+    return _session.get() or _default_session
+
+
+def stream(name: str) -> random.Random:
+    """
+    获取当前会话中的命名随机流。
+
+    在 use_stream 的上下文内，返回被替换的随机流。
+
+    参数:
+        name (str): 随机流名称
+
+    返回:
+        random.Random: 随机流
+    """
+    override = _overrides.get().get(name)
+    return override if override is not None else current().stream(name)
+
+
+def set_seed(seed: int) -> RngSession:
+    """
+    以新种子重建默认会话，通常在游戏启动时调用一次。
+
+    参数:
+        seed (int): 会话种子
+
+    返回:
+        RngSession: 新的默认会话
+    """
+    global _default_session
+    _default_session = RngSession(seed)
+    return _default_session
+
+
+@contextmanager
+def session(seed: int):
+    """
+    在上下文内使用一个独立的随机数会话，适用于并行模拟的单个任务。
+
+    参数:
+        seed (int): 会话种子
+
+    返回:
+        RngSession: 上下文内生效的会话
+    """
+    token = _session.set(RngSession(seed))
+    try:
+        yield _session.get()
+    finally:
+        _session.reset(token)
+
+
+@contextmanager
+def use_stream(name: str, rng: random.Random):
+    """
+    在上下文内用指定的随机源替换某个命名随机流。
+
+    参数:
+        name (str): 随机流名称
+        rng (random.Random): 替换使用的随机源
+    """
+    token = _overrides.set({**_overrides.get(), name: rng})
+    try:
+        yield rng
+    finally:
+        _overrides.reset(token)
+
+
+@contextmanager
+def loading(name: str):
+    """
+    在上下文内加载静态数据表，例如敌人表或 Boss 编组。
+
+    静态数据表在第一次访问时才加载（见 tools.lazy），加载的时刻取决于谁先访问它。
+    为了让加载结果只取决于默认会话的种子和表名，与加载时刻、外层会话以及
+    其他随机流已被消耗多少都无关，加载期间的全部随机流都取自一个独立的会话。
+
+    参数:
+        name (str): 数据表名称
+    """
+    seed = Stream(_default_session.seed, f"load:{name}").getrandbits(32)
+    session_token = _session.set(RngSession(seed))
+    overrides_token = _overrides.set({})
+    try:
+        yield
+    finally:
+        _overrides.reset(overrides_token)
+        _session.reset(session_token)
@@ -0,0 +1,80 @@
+"""
+阵营名单模块，提供战斗中存活单位的有序集合。
+
+Roster 以字典作为有序集合存储单位，加入、移除和成员判断都是 O(1)，
+同时保留加入顺序并支持按下标访问，可以直接替代战斗中原先使用的列表，
+用于目标选择、随机选取（rng.choice）和界面显示。
+"""
+
+from typing import Iterable, Iterator, List, Optional
+
+
+class Roster:
+    """
+    存活单位的有序集合，接口与列表的常用部分保持一致。
+
+    按下标访问时使用缓存的元组，名单变化时才重建，
+    因此连续多次随机选取目标的开销为 O(1)。
+    """
+    def __init__(self, battlers: Optional[Iterable] = None) -> None:
+        """
+        初始化阵营名单。
+
+        参数:
+            battlers (Iterable[Battler], optional): 初始单位
+        """
+        self._members = dict.fromkeys(battlers or ())
+        self._snapshot: Optional[tuple] = None
+
+    def append(self, battler) -> None:
+        """把单位加入名单末尾，已在名单中时不做任何事。"""
+        if battler not in self._members:
+            self._members[battler] = None
+            self._snapshot = None
+
+    def remove(self, battler) -> None:
+        """
+        把单位移出名单。
+
+        异常:
+            ValueError: 单位不在名单中
+        """
+        try:
+            del self._members[battler]
+        except KeyError:
+            raise ValueError(f"{getattr(battler, 'name', battler)} 不在名单中") from None
+        self._snapshot = None
+
+    def discard(self, battler) -> None:
+        """把单位移出名单，单位不在名单中时不做任何事。"""
+        if self._members.pop(battler, 0) is None:
+            self._snapshot = None
+
+    def _items(self) -> tuple:
+        if self._snapshot is None:
+            self._snapshot = tuple(self._members)
+        return self._snapshot
+
+    def __getitem__(self, index):
+        return self._items()[index]
+
+    def __contains__(self, battler) -> bool:
+        return battler in self._members
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items())
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __add__(self, other) -> List:
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> List:
+        return list(other) + list(self)
+
+    def copy(self) -> List:
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"Roster({list(self._members)!r})"
@@ -5,10 +5,10 @@
 商店可以根据提供的物品集合随机生成库存，提供游戏中的商品交易场所。
 """
 
-import random
 import sys
 sys.path.append("..")
 import bag
+from core import rng
 
 class Shop():
     """
@@ -46,9 +46,9 @@ class Shop():
             - 向商店库存添加随机数量的物品
             - 可能修改添加物品的品质属性
         """
-        item_quantity = random.randint(len(self.item_set)//2, len(self.item_set))
+        item_quantity = rng.stream("shop").randint(len(self.item_set)//2, len(self.item_set))
         for _ in range(item_quantity):
-            base_item = random.choice(self.item_set)
+            base_item = rng.stream("shop").choice(self.item_set)
             new_item = base_item.clone(1)
             if hasattr(new_item, "reroll_quality"):
                 new_item.reroll_quality()
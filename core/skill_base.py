@@ -3,9 +3,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from core.battler import Battler
 
-from rich.console import Console
+from ui import get_console
 
-console = Console()
+console = get_console()
 
 class Skill:
     """
@@ -0,0 +1,164 @@
+"""
+刷怪表模块，预先计算每个等级段可以出现的敌人和敌人数量上限。
+
+SpawnTable 由敌人的适用等级范围（以及可选的出现权重）和各等级段的敌人数量上限生成。
+所有范围的端点把等级切分为若干等级段，同一等级段内可出现的敌人和数量上限都相同，
+因此在创建时为每个等级段生成一个 SpawnBand，之后按等级查找等级段即可，
+不必每次遭遇都重新筛选敌人、排序数量规则。
+
+SpawnBand 用别名方法（Vose）抽取敌人，每次抽取只需一次整数随机数，
+权重不均匀时再加一次浮点随机数，与候选敌人的数量无关。
+所有敌人权重相同时，抽取消耗的随机数与 random.choice 完全相同。
+
+刷怪表创建后不再改变，可以在多个游戏会话或模拟任务之间共用。
+
+用法:
+    table = SpawnTable({"slime": (1, 3), "wolf": (2, 9, 3)}, {4: 1, 7: 2})
+    band = table.band(level)
+    for _ in range(band.roll_count(rnd)):
+        enemy_id = band.sample(rnd)
+"""
+
+from bisect import bisect_right
+from typing import Dict, Optional, Sequence, Tuple
+
+
+class AliasSampler:
+    """
+    按权重抽取下标的别名表，每次抽取 O(1)。
+
+    属性:
+        size (int): 候选数量
+    """
+    __slots__ = ("size", "_prob", "_alias")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        """
+        建立别名表。
+
+        参数:
+            weights (Sequence[float]): 各候选的权重，必须为正数
+
+        异常:
+            ValueError: 没有候选或权重不是正数
+        """
+        n = len(weights)
+        if n == 0 or min(weights) <= 0:
+            raise ValueError("别名表需要至少一个候选，且权重都为正数")
+        self.size = n
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        if len(set(weights)) == 1:
+            return
+
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._prob[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # 剩下的候选因浮点误差略小于或大于 1，都视为 1
+
+    def sample(self, rnd) -> int:
+        """
+        抽取一个下标。
+
+        参数:
+            rnd (random.Random): 随机数生成器
+
+        返回:
+            int: 抽中的下标
+        """
+        index = rnd.randrange(self.size)
+        prob = self._prob[index]
+        if prob < 1.0 and rnd.random() >= prob:
+            return self._alias[index]
+        return index
+
+
+class SpawnBand:
+    """
+    一个等级段的刷怪规则。
+
+    属性:
+        enemy_ids (Tuple[str, ...]): 可出现的敌人ID
+        max_enemies (int): 每次遭遇的敌人数量上限
+    """
+    __slots__ = ("enemy_ids", "max_enemies", "_sampler")
+
+    def __init__(self, enemy_ids: Tuple[str, ...], weights: Tuple[float, ...], max_enemies: int) -> None:
+        self.enemy_ids = enemy_ids
+        self.max_enemies = max_enemies
+        self._sampler = AliasSampler(weights) if enemy_ids else None
+
+    def roll_count(self, rnd) -> int:
+        """随机决定本次遭遇的敌人数量，1 到 max_enemies 之间。"""
+        return rnd.randint(1, self.max_enemies)
+
+    def sample(self, rnd) -> str:
+        """
+        按权重抽取一个敌人ID。
+
+        异常:
+            IndexError: 该等级段没有可出现的敌人
+        """
+        if self._sampler is None:
+            raise IndexError("该等级段没有可出现的敌人")
+        return self.enemy_ids[self._sampler.sample(rnd)]
+
+
+class SpawnTable:
+    """按等级段预先计算的刷怪表。"""
+    __slots__ = ("_starts", "_bands")
+
+    def __init__(
+        self,
+        possible_enemies: Dict[str, Sequence],
+        enemy_quantity_for_level: Dict[int, int],
+        weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        生成刷怪表。
+
+        参数:
+            possible_enemies (Dict[str, Sequence]): 敌人ID -> (最低等级, 最高等级) 或
+                (最低等级, 最高等级, 权重)，等级范围包含两端
+            enemy_quantity_for_level (Dict[int, int]): 等级上限（不含）-> 敌人数量上限，
+                等级不低于所有上限时数量上限为 1
+            weights (Dict[str, float], optional): 敌人ID -> 出现权重，优先于 possible_enemies 中的权重，
+                默认所有敌人权重为 1；权重为 0 的敌人不会出现
+        """
+        weights = weights or {}
+        rules = []
+        for enemy_id, spec in possible_enemies.items():
+            low, high = spec[0], spec[1]
+            weight = weights.get(enemy_id, spec[2] if len(spec) > 2 else 1)
+            if weight > 0:
+                rules.append((enemy_id, low, high, weight))
+        quantity = sorted(enemy_quantity_for_level.items())
+
+        # 任何规则都只在这些等级处发生变化
+        cuts = {low for _, low, _, _ in rules} | {high + 1 for _, _, high, _ in rules}
+        cuts |= {max_level for max_level, _ in quantity}
+        self._starts = [float("-inf")] + sorted(cuts)
+        self._bands = []
+        shared = {}
+        for start in self._starts:
+            candidates = [(enemy_id, weight) for enemy_id, low, high, weight in rules if low <= start <= high]
+            max_enemies = next((count for max_level, count in quantity if start < max_level), 1)
+            key = (tuple(candidates), max_enemies)
+            if key not in shared:
+                enemy_ids = tuple(enemy_id for enemy_id, _ in candidates)
+                shared[key] = SpawnBand(enemy_ids, tuple(weight for _, weight in candidates), max_enemies)
+            self._bands.append(shared[key])
+
+    def band(self, level: int) -> SpawnBand:
+        """返回等级所在等级段的刷怪规则。"""
+        return self._bands[bisect_right(self._starts, level) - 1]
@@ -0,0 +1,341 @@
+"""
+属性表模块，按基础值和具名加成来源计算战斗单位的最终属性。
+
+StatBlock 是紧凑的属性存储：STATS 中的每项属性有固定的下标，数值存放在一个
+int64 的 array 中，另用一个位掩码记录哪些属性存在。它可以像字典一样读写、遍历
+和比较，复制只需复制一段连续内存，也可以直接导出为 NumPy 行（见 row 和 stat_matrix），
+供批量计算使用。不在 STATS 中的属性名仍然可以写入，保存在额外的字典中。
+属性值都是整数，写入浮点数时截断为整数。
+
+以 share=True 创建的属性表与原属性表共用存储，第一次写入时才复制（写时复制），
+例如敌人克隆时共用原型的属性，受到伤害或应用变体时才有自己的一份。
+
+StatSheet 在 StatBlock 的基础上保存每项属性的基础值，以及若干具名的加成来源，例如:
+    ("equipment", 槽位)  装备提供的属性
+    BuffDebuff 实例      增益/减益效果
+    "aptitudes"          能力点
+    "level"              等级提升的通用成长
+    "class_growth"       职业成长
+    "class_bonus"        选择职业时的初始加成
+    "variant"            敌人变体的属性加成
+
+最终属性 = 基础值 + 各来源加成之和。最终属性直接存放在属性表本身中，
+因此战斗中读取 stats["atk"] 是 O(1)；只有加成来源改变时，
+才重新计算受影响的属性。移除一个来源时从剩余来源重新求和，而不是反向做减法，
+所以不会因为先后顺序或取整产生属性漂移。
+
+直接赋值（如 stats["hp"] -= dmg）修改的是基础值，最终属性随之变化。
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, Iterator, Optional, Sequence
+
+# 会随战斗消耗的资源属性及其上限，它们只有基础值，不参与成长加成
+RESOURCES = {"hp": "max_hp", "mp": "max_mp", "hunger": "max_hunger"}
+
+# 有固定下标的属性
+STATS = (
+    "max_hp", "hp", "max_mp", "mp", "max_hunger", "hunger",
+    "atk", "def", "mat", "mdf", "agi", "luk", "crit", "anti_crit",
+)
+STAT_INDEX = {stat: index for index, stat in enumerate(STATS)}
+
+_ZEROS = array("q", bytes(8 * len(STATS)))
+_NOT_DIRTY = frozenset()
+
+
+class StatBlock(MutableMapping):
+    """
+    以固定下标存放属性的紧凑属性表，读写方式与字典相同。
+
+    遍历顺序为 STATS 中的顺序，之后是不在 STATS 中的属性（按写入顺序）。
+    """
+    __slots__ = ("_values", "_present", "_extra", "_shared")
+
+    def __init__(self, stats: Optional[Dict[str, int]] = None, share: bool = False) -> None:
+        """
+        初始化属性表。
+
+        参数:
+            stats (Dict[str, int], optional): 各项属性的值，传入 StatBlock 时直接复制其存储
+            share (bool): stats 为 StatBlock 时与其共用存储，第一次写入时才复制，
+                共用期间 stats 本身不应再被修改
+        """
+        if isinstance(stats, StatBlock):
+            self._present = stats._present
+            self._shared = share
+            if share:
+                self._values, self._extra = stats._values, stats._extra
+            else:
+                self._values = stats._values[:]
+                self._extra = dict(stats._extra) if stats._extra else None
+            return
+        self._values = _ZEROS[:]
+        self._present = 0
+        self._extra = None
+        self._shared = False
+        if stats:
+            for stat, value in stats.items():
+                StatBlock.__setitem__(self, stat, value)
+
+    def __getitem__(self, stat: str) -> int:
+        index = STAT_INDEX.get(stat)
+        if index is None:
+            if self._extra:
+                return self._extra[stat]
+        elif self._present >> index & 1:
+            return self._values[index]
+        raise KeyError(stat)
+
+    def _own(self) -> None:
+        """结束与其他属性表共用存储，复制一份自己的。"""
+        self._values = self._values[:]
+        self._extra = dict(self._extra) if self._extra else None
+        self._shared = False
+
+    def __setitem__(self, stat: str, value) -> None:
+        if self._shared:
+            self._own()
+        index = STAT_INDEX.get(stat)
+        if index is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[stat] = int(value)
+            return
+        try:
+            self._values[index] = value
+        except TypeError:
+            self._values[index] = int(value)
+        self._present |= 1 << index
+
+    def __delitem__(self, stat: str) -> None:
+        if self._shared:
+            self._own()
+        index = STAT_INDEX.get(stat)
+        if index is None:
+            if not self._extra:
+                raise KeyError(stat)
+            del self._extra[stat]
+        elif self._present >> index & 1:
+            self._present &= ~(1 << index)
+            self._values[index] = 0
+        else:
+            raise KeyError(stat)
+
+    def __contains__(self, stat) -> bool:
+        index = STAT_INDEX.get(stat)
+        if index is None:
+            return bool(self._extra) and stat in self._extra
+        return bool(self._present >> index & 1)
+
+    def __iter__(self) -> Iterator[str]:
+        present = self._present
+        for index, stat in enumerate(STATS):
+            if present >> index & 1:
+                yield stat
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return self._present.bit_count() + (len(self._extra) if self._extra else 0)
+
+    def get(self, stat: str, default=None):
+        index = STAT_INDEX.get(stat)
+        if index is None:
+            return self._extra.get(stat, default) if self._extra else default
+        return self._values[index] if self._present >> index & 1 else default
+
+    def setdefault(self, stat: str, default=0):
+        if stat not in self:
+            self[stat] = default
+        return self[stat]
+
+    def copy(self) -> "StatBlock":
+        """返回只包含属性值的副本，StatSheet 的副本为其最终属性，不含加成来源。"""
+        return StatBlock(self)
+
+    def __reduce__(self):
+        return StatBlock, (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def row(self, columns: Sequence[str] = STATS):
+        """
+        把属性导出为 NumPy 行，不存在的属性为 0。
+
+        参数:
+            columns (Sequence[str]): 属性顺序
+
+        返回:
+            np.ndarray: int64 一维数组
+        """
+        return stat_matrix([self], columns)[0]
+
+
+def stat_matrix(blocks: Iterable, columns: Sequence[str] = STATS):
+    """
+    把一组属性表整理为 (n, len(columns)) 的 int64 矩阵，不存在的属性为 0。
+
+    全部是 StatBlock 且 columns 都在 STATS 中时，直接拼接各属性表的存储，
+    不再逐项读取。
+
+    参数:
+        blocks (Iterable): 属性表序列
+        columns (Sequence[str]): 属性顺序
+
+    返回:
+        np.ndarray: int64 矩阵
+    """
+    import numpy as np
+
+    blocks = list(blocks)
+    if all(isinstance(block, StatBlock) for block in blocks) and all(c in STAT_INDEX for c in columns):
+        matrix = np.frombuffer(b"".join(block._values for block in blocks), dtype=np.int64)
+        matrix = matrix.reshape(len(blocks), len(STATS))
+        if tuple(columns) == STATS:
+            return matrix.copy()
+        return matrix[:, [STAT_INDEX[c] for c in columns]]
+    return np.array([[block.get(c, 0) for c in columns] for block in blocks], dtype=np.int64).reshape(-1, len(columns))
+
+
+class StatSheet(StatBlock):
+    """
+    带加成来源的属性表，可以直接当作属性字典使用。
+
+    属性值的读取、遍历和比较都与普通字典相同；写入时修改基础值。
+    在 batch() 的上下文内，加成来源的改变只标记受影响的属性，退出时统一重新计算。
+    """
+    __slots__ = ("_base", "_sources", "_dirty", "_batch_depth")
+
+    def __init__(self, base: Optional[Dict[str, int]] = None, share: bool = False) -> None:
+        """
+        初始化属性表。
+
+        参数:
+            base (Dict[str, int], optional): 各项属性的基础值
+            share (bool): base 为 StatBlock 时与其共用存储，见 StatBlock
+        """
+        super().__init__(base, share)
+        self._base: Optional[StatBlock] = None   # 从未有过加成来源时基础值就是最终属性，需要时才复制
+        self._sources: Dict[Hashable, Dict[str, int]] = {}
+        self._dirty = _NOT_DIRTY
+        self._batch_depth = 0
+
+    def _base_block(self) -> StatBlock:
+        """返回基础值，第一次需要区分基础值和最终属性时从最终属性复制。"""
+        if self._base is None:
+            self._base = StatBlock(self)
+        return self._base
+
+    # 直接写入属性时调整基础值，使最终属性等于写入的值
+    def __setitem__(self, stat: str, value) -> None:
+        if self._base is None and not self._sources:
+            StatBlock.__setitem__(self, stat, value)
+            return
+        base = self._base_block()
+        if stat in self._dirty:
+            bonus = self.bonus(stat)
+        else:
+            bonus = StatBlock.get(self, stat, 0) - base.get(stat, 0)
+        base[stat] = value - bonus
+        StatBlock.__setitem__(self, stat, value)
+
+    def __delitem__(self, stat: str) -> None:
+        StatBlock.__delitem__(self, stat)
+        if self._base is not None:
+            self._base.pop(stat, None)
+
+    def reset(self, base: Optional[Dict[str, int]] = None, share: bool = False) -> None:
+        """
+        把属性表恢复为只有基础值、没有任何加成来源的状态，复用属性表对象本身。
+
+        参数:
+            base (Dict[str, int], optional): 新的基础值
+            share (bool): base 为 StatBlock 时与其共用存储，见 StatBlock
+        """
+        StatBlock.__init__(self, base, share)
+        self._base = None
+        self._sources.clear()
+        self._dirty = _NOT_DIRTY
+        self._batch_depth = 0
+
+    def __reduce__(self):
+        return self.__class__, (self._base_block(),), {"sources": self._sources}
+
+    def __setstate__(self, state: dict) -> None:
+        self._sources = state["sources"]
+        self._dirty, self._batch_depth = _NOT_DIRTY, 0
+        self._refresh(stat for mods in self._sources.values() for stat in mods)
+
+    def base(self, stat: str) -> int:
+        """返回属性的基础值。"""
+        return (self._base if self._base is not None else self).get(stat, 0)
+
+    def bonus(self, stat: str) -> int:
+        """返回属性来自全部加成来源的合计值。"""
+        return sum(mods.get(stat, 0) for mods in self._sources.values())
+
+    def source(self, source: Hashable) -> Dict[str, int]:
+        """返回某个加成来源提供的属性加成，来源不存在时返回空字典。"""
+        return dict(self._sources.get(source, {}))
+
+    def source_keys(self) -> list:
+        """返回全部加成来源的标识，按加入顺序排列。"""
+        return list(self._sources)
+
+    def set_source(self, source: Hashable, modifiers: Dict[str, int]) -> None:
+        """
+        设置加成来源，替换该来源原先提供的全部加成。
+
+        参数:
+            source (Hashable): 来源标识
+            modifiers (Dict[str, int]): 属性加成，为空时等同于移除该来源
+        """
+        previous = self._sources.pop(source, {})
+        if modifiers:
+            self._sources[source] = dict(modifiers)
+        self._refresh(set(previous) | set(modifiers))
+
+    def add_to_source(self, source: Hashable, modifiers: Dict[str, int]) -> None:
+        """
+        在加成来源上累加属性加成，例如每次升级的职业成长。
+
+        参数:
+            source (Hashable): 来源标识
+            modifiers (Dict[str, int]): 要累加的属性加成
+        """
+        mods = self._sources.setdefault(source, {})
+        for stat, value in modifiers.items():
+            mods[stat] = mods.get(stat, 0) + value
+        self._refresh(modifiers)
+
+    def remove_source(self, source: Hashable) -> None:
+        """移除加成来源，来源不存在时不做任何事。"""
+        previous = self._sources.pop(source, None)
+        if previous:
+            self._refresh(previous)
+
+    @contextmanager
+    def batch(self):
+        """在上下文内合并多次来源改变，退出时统一重新计算受影响的属性。"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                dirty, self._dirty = self._dirty, _NOT_DIRTY
+                self._refresh(dirty)
+
+    def _refresh(self, stats: Iterable[str]) -> None:
+        if self._batch_depth:
+            if self._dirty is _NOT_DIRTY:
+                self._dirty = set()
+            self._dirty.update(stats)
+            return
+        base = self._base_block()
+        for stat in stats:
+            StatBlock.__setitem__(self, stat, base.setdefault(stat, 0) + self.bonus(stat))
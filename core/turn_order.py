@@ -0,0 +1,174 @@
+"""
+回合调度模块，决定战斗中各单位的行动顺序。
+
+TurnScheduler 基于优先队列（heapq）维护行动顺序，单位死亡、被召唤或敏捷改变时
+只做增量更新，每次行动的开销为 O(log n)，而不是每回合重新排序全部单位。
+
+支持两种模式:
+    round  回合制：每回合开始时按敏捷从高到低排列，每个单位每回合行动一次；
+           回合中途的敏捷变化和新召唤的单位从下一回合开始生效。
+    atb    时间轴（Active Time Battle）：每个单位按自身敏捷积累行动槽，
+           敏捷越高行动越频繁；敏捷 ATB_BASE_AGI 的单位平均每回合行动一次。
+
+敏捷相同时保持与原先一致的顺序：敌人在前、友方在后，同一阵营内按加入战斗的先后。
+已失效的队列条目（单位死亡、移除或敏捷改变）不会立即删除，而是在出队时跳过。
+"""
+
+import heapq
+from typing import Dict, Iterator, List, Optional
+
+TURN_MODES = ("round", "atb")
+
+# 时间轴模式下每回合的刻度数，以及每回合恰好行动一次的敏捷
+TICKS_PER_ROUND = 1000
+ATB_BASE_AGI = 10
+
+
+class TurnScheduler:
+    """
+    回合调度器，按敏捷决定战斗单位的行动顺序。
+
+    调度器订阅所有成员的战斗事件：收到 "summoned" 时把被召唤的单位加入调度，
+    在时间轴模式下收到 "agi_changed" 时重新计算该单位的下次行动时间。
+
+    用法:
+        scheduler.start_round()
+        while (battler := scheduler.next_actor()) is not None:
+            ...
+
+    属性:
+        mode (str): 调度模式，"round" 或 "atb"
+        now (int): 时间轴模式下的当前时刻
+    """
+    def __init__(self, allies: List, enemies: List, mode: str = "round") -> None:
+        """
+        初始化回合调度器。
+
+        参数:
+            allies (List[Battler]): 友方单位列表
+            enemies (List[Battler]): 敌方单位列表
+            mode (str): 调度模式，"round" 或 "atb"，默认为 "round"
+        """
+        if mode not in TURN_MODES:
+            raise ValueError(f"未知的回合模式: {mode}")
+        self.mode = mode
+        self.now = 0
+        self._members: Dict = {}    # 单位 -> 加入顺序
+        self._versions: Dict = {}   # 单位 -> 队列条目版本号
+        self._last_action: Dict = {}
+        self._next_order = 0
+        self._heap = []
+        self._round_end = 0
+        for battler in list(enemies) + list(allies):
+            self.add(battler)
+
+    def __contains__(self, battler) -> bool:
+        return battler in self._members
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._members))
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def ordered(self) -> List:
+        """
+        按当前敏捷返回全部成员的行动顺序，主要用于界面显示和目标选择。
+
+        返回:
+            List[Battler]: 按敏捷从高到低排列的成员列表
+        """
+        return sorted(self._members, key=self._round_key)
+
+    def add(self, battler) -> None:
+        """
+        把单位加入调度，例如战斗开始时或被召唤时。
+
+        回合制模式下新单位从下一回合开始行动；时间轴模式下从当前时刻开始积累行动槽。
+
+        参数:
+            battler (Battler): 要加入的单位
+        """
+        if battler in self._members:
+            return
+        self._members[battler] = self._next_order
+        self._next_order += 1
+        self._versions[battler] = 0
+        self._last_action[battler] = self.now
+        battler.subscribe(self._on_event)
+        if self.mode == "atb":
+            self._push_atb(battler)
+
+    def remove(self, battler) -> None:
+        """
+        把单位移出调度，例如单位死亡时。队列中的旧条目会在出队时被跳过。
+
+        参数:
+            battler (Battler): 要移出的单位
+        """
+        if self._members.pop(battler, None) is None:
+            return
+        self._versions.pop(battler, None)
+        self._last_action.pop(battler, None)
+        battler.unsubscribe(self._on_event)
+
+    def close(self) -> None:
+        """战斗结束时取消对全部成员的事件订阅。"""
+        for battler in list(self._members):
+            battler.unsubscribe(self._on_event)
+
+    def start_round(self) -> None:
+        """
+        开始新的一回合。
+
+        回合制模式下按敏捷为全部存活成员建立本回合的行动队列；
+        时间轴模式下把回合截止时刻推进 TICKS_PER_ROUND。
+        """
+        if self.mode == "atb":
+            self._round_end += TICKS_PER_ROUND
+            return
+        self._heap = [(self._round_key(b), self._versions[b], b) for b in self._members if b.alive]
+        heapq.heapify(self._heap)
+
+    def next_actor(self) -> Optional[object]:
+        """
+        取出本回合中下一个行动的单位。
+
+        返回:
+            Battler | None: 下一个行动的单位，本回合已无单位可行动时返回None
+        """
+        heap = self._heap
+        while heap:
+            key, version, battler = heap[0]
+            if self._versions.get(battler) != version or not battler.alive:
+                heapq.heappop(heap)
+                continue
+            if self.mode == "round":
+                heapq.heappop(heap)
+                return battler
+            if key[0] > self._round_end:
+                return None
+            heapq.heappop(heap)
+            self.now = key[0]
+            self._last_action[battler] = self.now
+            self._push_atb(battler)
+            return battler
+        return None
+
+    def _round_key(self, battler):
+        return -battler.stats["agi"], self._members[battler]
+
+    def _interval(self, battler) -> int:
+        return max(1, round(TICKS_PER_ROUND * ATB_BASE_AGI / max(1, battler.stats["agi"])))
+
+    def _push_atb(self, battler) -> None:
+        self._versions[battler] += 1
+        next_time = max(self.now, self._last_action[battler] + self._interval(battler))
+        heapq.heappush(self._heap, ((next_time, self._members[battler]), self._versions[battler], battler))
+
+    def _on_event(self, event: str, battler, *args) -> None:
+        if event == "summoned":
+            for summoned in args:
+                self.add(summoned)
+        elif event == "agi_changed" and self.mode == "atb" and battler in self._members:
+            self._push_atb(battler)
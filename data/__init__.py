@@ -1,13 +1,40 @@
+"""
+游戏数据包。
+
+常量在导入时直接可用；技能、物品、对话等数据表改为按需加载:
+访问 data.ALL_SKILLS 等名称时才导入对应的子模块，子模块中的数据表
+在第一次访问其中的条目时才读取数据文件（见 tools.lazy）。
+"""
+
+from importlib import import_module
+
 from .constants import DEBUG
 from .constants import MONEY_MULTIPLIER, EXPERIENCE_RATE
-from .constants import ENEMY_VARIANTS, POSSIBLE_ENEMIES
+from .constants import ENEMY_VARIANTS, POSSIBLE_ENEMIES, ENEMY_QUANTITY_FOR_LEVEL
+
+# 按需导入的名称及其所在的子模块
+_EXPORTS = {
+    "enhance_weapon": "skills_data",
+    "weakened_defense": "skills_data",
+    "SPELL_REGISTRY": "skills_data",
+    "ALL_SKILLS": "skills_data",
+
+    "equipment_data": "items_data",
+    "jewel_data": "items_data",
+    "hp_potion": "items_data",
+    "mp_potion": "items_data",
+    "grimoires": "items_data",
+    "basic_equipments": "items_data",
+    "item_factory": "items_data",
 
-from .skills_data import enhance_weapon, weakened_defense
-from .skills_data import SPELL_REGISTRY
-from .skills_data import ALL_SKILLS
+    "DIALOGUE": "event_text",
+}
 
-from .items_data import equipment_data, jewel_data, hp_potion, mp_potion, grimoires
-from .items_data import basic_equipments
-from .items_data import item_factory
 
-from .event_text import DIALOGUE
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
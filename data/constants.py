@@ -62,3 +62,13 @@ POSSIBLE_ENEMIES = {
     "giant_slime": (4, 15),
     "lizard_scout": (4, 18),
 }
+
+# 随机遭遇的敌人数量上限：玩家等级低于键时，最多出现对应数量的敌人
+ENEMY_QUANTITY_FOR_LEVEL = {
+    4: 1,
+    7: 2,
+    18: 3,
+    37: 4,
+    55: 5,
+    120: 6,
+}
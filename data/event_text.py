@@ -1,8 +1,10 @@
 
+from functools import partial
+
 from rich.panel import Panel
 from rich.text import Text
 
-from tools import load_toml_data
+from tools import load_toml_data, LazyTable
 
 # 初始事件
 def initial_event_text():
@@ -23,7 +25,7 @@ def initial_event_text():
     )
     return pannel
 
-DIALOGUE = load_toml_data('data/toml_data/dialogue.toml')
+DIALOGUE = LazyTable("dialogue", partial(load_toml_data, 'data/toml_data/dialogue.toml'))
 
 # 安全镇
 # *安娜的防具店
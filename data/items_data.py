@@ -6,15 +6,33 @@
 以及定义各个商店的物品集合。
 """
 
-import ast
-import csv
+from dataclasses import dataclass
+from functools import lru_cache
 
 import others.item as item
 from data import ALL_SKILLS
+from others.catalog import EquipmentCatalog
 from others.equipment import Equipment
 from tools import load_jewel_from_csv, load_food_from_csv
+from tools import LazyTable, lazy_attributes
+from tools.csv_schema import load_rows, column, stat_dict, str_list, stripped
 from mods.dev_tools import debug_print
 
+@dataclass(slots=True)
+class EquipmentRow:
+    """equipments.csv 的一行。"""
+    name: str
+    name_zh: str
+    description: str
+    individual_value: int
+    object_type: str
+    stat_change_list: dict = column(stat_dict)
+    level: int
+    combo: str = column(stripped, default="")
+    spell: str = column(stripped, default="")
+    tags: list = column(str_list, default_factory=list)
+    image_path: str = ""
+
 def load_equipment_from_csv(filepath="data/csv_data/equipments.csv", skill_dict=ALL_SKILLS):
     """
     从CSV文件加载装备数据。
@@ -28,43 +46,50 @@ def load_equipment_from_csv(filepath="data/csv_data/equipments.csv", skill_dict=
 
     返回:
         dict: 以装备ID为键，Equipment对象为值的字典
+
+    异常:
+        CsvRowError: 某一行无法解析
     """
     if skill_dict is None:
         skill_dict = {}
 
     equipment_dict = {}
-    with open(filepath, newline='', encoding='utf-8') as csvfile:
-        for row in csv.DictReader(csvfile):
-            name = row["name"]
-
-            combo_name = row.get("combo", "").strip()
-            spell_name = row.get("spell", "").strip()
-            kwargs = {
-                "name": row["name_zh"],
-                "description": row["description"],
-                "amount": 1,
-                "individual_value": int(row["individual_value"]) if row["individual_value"].strip() else 0,
-                "object_type": row["object_type"],
-                "stat_change_list": ast.literal_eval(row["stat_change_list"]),
-                "combo": skill_dict.get(combo_name) if combo_name else None,
-                "spell": skill_dict.get(spell_name) if spell_name else None,
-                "level": int(row["level"]) if row["level"].strip() else 0,
-                "tags": row.get("tags", "").split(",") if row.get("tags") else [],
-                "image_path": row.get("image_path", "")
-            }
-
-            equipment_dict[name] = Equipment(**kwargs)
+    for row in load_rows(filepath, EquipmentRow):
+        equipment_dict[row.name] = Equipment(
+            name=row.name_zh,
+            description=row.description,
+            amount=1,
+            individual_value=row.individual_value,
+            object_type=row.object_type,
+            stat_change_list=row.stat_change_list,
+            combo=skill_dict.get(row.combo) if row.combo else None,
+            spell=skill_dict.get(row.spell) if row.spell else None,
+            level=row.level,
+            tags=row.tags,
+            image_path=row.image_path,
+        )
 
     debug_print(f"从 CSV 加载装备数据，共加载 {len(equipment_dict)} 项装备")
     return equipment_dict
 
-equipment_data = load_equipment_from_csv()
+equipment_data = LazyTable("equipment", load_equipment_from_csv)
+
+@lru_cache(maxsize=None)
+def equipment_catalog():
+    """
+    返回全部装备的索引目录，第一次调用时建立。
+
+    返回:
+        EquipmentCatalog: 按等级、类型和标签索引的 equipment_data
+    """
+    return EquipmentCatalog(equipment_data.values())
 
 def filter_equipment_by(level=None, object_type=None, tags=None, match_all_tags=False):
     """
     根据指定条件筛选装备。
 
     可以按等级、物品类型和标签筛选装备，支持精确匹配和模糊匹配。
+    通过 equipment_catalog 的倒排索引查询，结果按 equipment_data 中的顺序排列。
 
     参数:
         level: 筛选特定等级的装备
@@ -75,57 +100,28 @@ def filter_equipment_by(level=None, object_type=None, tags=None, match_all_tags=
     返回:
         list: 符合筛选条件的Equipment对象列表
     """
-    result = equipment_data.values()
-
-    if level is not None:
-        result = filter(lambda eq: eq.level == level, result)
-    if object_type:
-        result = filter(lambda eq: eq.object_type == object_type, result)
-    if tags:
-        if match_all_tags:
-            result = filter(lambda eq: all(tag in eq.tags for tag in tags), result)
-        else:
-            result = filter(lambda eq: any(tag in eq.tags for tag in tags), result)
-
-    result = list(result)
+    result = equipment_catalog().query(level, object_type, tags, match_all_tags)
     debug_print(f"筛选装备: 等级={level}, 类型={object_type}, 标签={tags}, 匹配所有标签={match_all_tags} -> {len(result)} 个结果")
     return result
 
-# 定义商店物品
-jack_weapon_shop_set = filter_equipment_by(level=2, object_type="weapon", tags=["weapon"])
-anna_armor_shop_set = filter_equipment_by(level=2, tags=["armor", "shield", "head", "hand", "foot", "accessory"])
-
-rik_armor_shop_item_set = (
-    filter_equipment_by(level=3, object_type="weapon", tags=["weapon"])
-    + jack_weapon_shop_set
-    + filter_equipment_by(level=2, object_type="armor", tags=["armor"])
-    + filter_equipment_by(level=3, object_type="armor", tags=["armor"])
-)
-
-lok_armor_shop_item_set = filter_equipment_by(level=3, tags=["bronze"])
-
-mysterious_businessman_shop_item_set = filter_equipment_by(level=2)
-
-# 加入特殊指定装备
-jack_weapon_shop_set.append(equipment_data["war_hammer"])
-rik_armor_shop_item_set.append(equipment_data["bronze_shield"])
-lok_armor_shop_item_set += [equipment_data["bronze_armor"], equipment_data["copper_ring"]]
-
 # 初始装备
-basic_equipments = {
-    "rusty_sword": equipment_data["rusty_sword"],
-    "broken_dagger": equipment_data["broken_dagger"],
-    "old_staff": equipment_data["old_staff"],
-    "wood_bow": equipment_data["wood_bow"],
-    "wooden_club": equipment_data["wooden_club"],
-    "training_dagger": equipment_data["training_dagger"],
-    "beginner_wand": equipment_data["beginner_wand"],
-    "self_bow": equipment_data["self_bow"],
-
-    "novice_armor": equipment_data["novice_armor"],
-    "old_robes": equipment_data["old_robes"],
-    "padded_vest": equipment_data["padded_vest"],
-}
+def _basic_equipments():
+    return {
+        "rusty_sword": equipment_data["rusty_sword"],
+        "broken_dagger": equipment_data["broken_dagger"],
+        "old_staff": equipment_data["old_staff"],
+        "wood_bow": equipment_data["wood_bow"],
+        "wooden_club": equipment_data["wooden_club"],
+        "training_dagger": equipment_data["training_dagger"],
+        "beginner_wand": equipment_data["beginner_wand"],
+        "self_bow": equipment_data["self_bow"],
+
+        "novice_armor": equipment_data["novice_armor"],
+        "old_robes": equipment_data["old_robes"],
+        "padded_vest": equipment_data["padded_vest"],
+    }
+
+basic_equipments = LazyTable("basic_equipments", _basic_equipments)
 
 # 药水类物品
 hp_potion = item.Potion("生命药水 I", "恢复少量生命值的药水", 1, 25, "consumable", "hp", 70)
@@ -160,49 +156,99 @@ def item_factory(name: str, amount: int = 1):
         return None
 
 # 食物数据
-food_data = load_food_from_csv()
-bread = food_data["bread"]
+food_data = LazyTable("food", load_food_from_csv)
 
 # 宝石数据
-jewel_data = load_jewel_from_csv()
+jewel_data = LazyTable("jewels", load_jewel_from_csv)
 
 # 魔法书数据构造
-grimoire_data = [
-    ("魔法书：火球术", "基础火焰魔法，释放灼热火球。", 1, 80, ALL_SKILLS["火球术"]),
-    ("魔法书：神圣祝福", "可恢复生命，带来圣光的治愈。", 1, 120, ALL_SKILLS["神圣祝福"]),
-    ("魔法书：增强武器", "短时间内强化武器攻击力。", 1, 120, ALL_SKILLS["强化武器"]),
-    ("魔法书: 地狱火", "召唤烈焰吞噬所有敌人。", 1, 210, ALL_SKILLS["地狱火"]),
-    ("唤灵书: 骷髅召唤", "召唤骷髅战士作战。", 1, 195, ALL_SKILLS["召唤骷髅"]),
-    ("唤灵书: 火精灵", "召唤火焰元素协助作战。", 1, 325, ALL_SKILLS["召唤火精灵"]),
-]
-grimoires = [item.Grimoire(n, d, a, v, "consumable", s) for n, d, a, v, s in grimoire_data]
-
-mary_food_stall_set = [
-    bread, bread, bread,
-    food_data["mushroom_soup"],
-    food_data["meat_skewer"],
-    food_data["honey_apple"],
-    food_data["mary_cookie"],
-]
-
-itz_magic_item_set = [
-    equipment_data["staff"],
-    equipment_data["cloth_armor"],
-    hp_potion, hp_potion,
-    mp_potion,
-    equipment_data["sage_tunic"],
-    equipment_data["sage_staff"],
-    equipment_data["student_robes"],
-    equipment_data["mana_charm"],
-    *grimoires[:6],
-    equipment_data["ring_of_magic"],
-    jewel_data["mat_small_gems"],
-]
-
-debug_print(f"Jack 的武器商店物品数: {len(jack_weapon_shop_set)}")
-debug_print(f"Anna 的护甲商店物品数: {len(anna_armor_shop_set)}")
-debug_print(f"Mary 的食品商店物品数: {len(mary_food_stall_set)}")
-debug_print(f"Rik 的护甲商店物品数: {len(rik_armor_shop_item_set)}")
-debug_print(f"Itz 的魔法商店物品数: {len(itz_magic_item_set)}")
-debug_print(f"Lok 的武具商店物品数: {len(lok_armor_shop_item_set)}")
-debug_print(f"神秘商人的物品数: {len(mysterious_businessman_shop_item_set)}")
+def _grimoires():
+    grimoire_data = [
+        ("魔法书：火球术", "基础火焰魔法，释放灼热火球。", 1, 80, ALL_SKILLS["火球术"]),
+        ("魔法书：神圣祝福", "可恢复生命，带来圣光的治愈。", 1, 120, ALL_SKILLS["神圣祝福"]),
+        ("魔法书：增强武器", "短时间内强化武器攻击力。", 1, 120, ALL_SKILLS["强化武器"]),
+        ("魔法书: 地狱火", "召唤烈焰吞噬所有敌人。", 1, 210, ALL_SKILLS["地狱火"]),
+        ("唤灵书: 骷髅召唤", "召唤骷髅战士作战。", 1, 195, ALL_SKILLS["召唤骷髅"]),
+        ("唤灵书: 火精灵", "召唤火焰元素协助作战。", 1, 325, ALL_SKILLS["召唤火精灵"]),
+    ]
+    return {
+        "grimoire_data": grimoire_data,
+        "grimoires": [item.Grimoire(n, d, a, v, "consumable", s) for n, d, a, v, s in grimoire_data],
+    }
+
+def _food():
+    return {"bread": food_data["bread"]}
+
+# 定义商店物品
+def _shop_sets():
+    from data import items_data  # 魔法书和面包同样是按需创建的模块属性
+
+    jack_weapon_shop_set = filter_equipment_by(level=2, object_type="weapon", tags=["weapon"])
+    anna_armor_shop_set = filter_equipment_by(level=2, tags=["armor", "shield", "head", "hand", "foot", "accessory"])
+
+    rik_armor_shop_item_set = (
+        filter_equipment_by(level=3, object_type="weapon", tags=["weapon"])
+        + jack_weapon_shop_set
+        + filter_equipment_by(level=2, object_type="armor", tags=["armor"])
+        + filter_equipment_by(level=3, object_type="armor", tags=["armor"])
+    )
+
+    lok_armor_shop_item_set = filter_equipment_by(level=3, tags=["bronze"])
+
+    mysterious_businessman_shop_item_set = filter_equipment_by(level=2)
+
+    # 加入特殊指定装备
+    jack_weapon_shop_set.append(equipment_data["war_hammer"])
+    rik_armor_shop_item_set.append(equipment_data["bronze_shield"])
+    lok_armor_shop_item_set += [equipment_data["bronze_armor"], equipment_data["copper_ring"]]
+
+    mary_food_stall_set = [
+        items_data.bread, items_data.bread, items_data.bread,
+        food_data["mushroom_soup"],
+        food_data["meat_skewer"],
+        food_data["honey_apple"],
+        food_data["mary_cookie"],
+    ]
+
+    itz_magic_item_set = [
+        equipment_data["staff"],
+        equipment_data["cloth_armor"],
+        hp_potion, hp_potion,
+        mp_potion,
+        equipment_data["sage_tunic"],
+        equipment_data["sage_staff"],
+        equipment_data["student_robes"],
+        equipment_data["mana_charm"],
+        *items_data.grimoires[:6],
+        equipment_data["ring_of_magic"],
+        jewel_data["mat_small_gems"],
+    ]
+
+    debug_print(f"Jack 的武器商店物品数: {len(jack_weapon_shop_set)}")
+    debug_print(f"Anna 的护甲商店物品数: {len(anna_armor_shop_set)}")
+    debug_print(f"Mary 的食品商店物品数: {len(mary_food_stall_set)}")
+    debug_print(f"Rik 的护甲商店物品数: {len(rik_armor_shop_item_set)}")
+    debug_print(f"Itz 的魔法商店物品数: {len(itz_magic_item_set)}")
+    debug_print(f"Lok 的武具商店物品数: {len(lok_armor_shop_item_set)}")
+    debug_print(f"神秘商人的物品数: {len(mysterious_businessman_shop_item_set)}")
+    return {
+        "jack_weapon_shop_set": jack_weapon_shop_set,
+        "anna_armor_shop_set": anna_armor_shop_set,
+        "rik_armor_shop_item_set": rik_armor_shop_item_set,
+        "lok_armor_shop_item_set": lok_armor_shop_item_set,
+        "mysterious_businessman_shop_item_set": mysterious_businessman_shop_item_set,
+        "mary_food_stall_set": mary_food_stall_set,
+        "itz_magic_item_set": itz_magic_item_set,
+    }
+
+# 魔法书、面包和商店物品在第一次访问时才创建
+__getattr__ = lazy_attributes(globals(), {
+    "grimoire_data": _grimoires,
+    "grimoires": _grimoires,
+    "bread": _food,
+    **dict.fromkeys([
+        "jack_weapon_shop_set", "anna_armor_shop_set", "rik_armor_shop_item_set",
+        "lok_armor_shop_item_set", "mysterious_businessman_shop_item_set",
+        "mary_food_stall_set", "itz_magic_item_set",
+    ], _shop_sets),
+})
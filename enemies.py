@@ -5,14 +5,58 @@
 以及生成敌人战斗组合的功能。同时实现了敌人在战斗中的行为决策逻辑。
 """
 
-from data import POSSIBLE_ENEMIES, ENEMY_VARIANTS
-import csv
-import random
-from copy import deepcopy
+from data import POSSIBLE_ENEMIES, ENEMY_VARIANTS, ENEMY_QUANTITY_FOR_LEVEL
+from dataclasses import dataclass
+from functools import partial
 
 from core import battler
+from core import rng
+from core.spawn_table import SpawnTable
+from core.stats import StatBlock, StatSheet
+from tools import LazyTable, lazy_attributes
+from tools.csv_schema import load_rows, column, integer, str_list
 from mods.dev_tools import debug_print
 
+def drop_list(value):
+    """解析形如 "狼皮x1,凝胶x2" 的掉落物品列，返回 [(物品名, 数量)]。"""
+    drops = []
+    for part in value.split(","):
+        if "x" in part:
+            item_name, count = part.split("x")
+            drops.append((item_name.strip(), int(count)))
+    return drops
+
+@dataclass(slots=True)
+class EnemyRow:
+    """enemies.csv 的一行。"""
+    name: str
+    name_zh: str
+    max_hp: int
+    max_mp: int
+    atk: int
+    def_: int = column(integer, name="def")  # def 是关键字
+    mat: int
+    mdf: int
+    agi: int
+    luk: int
+    crit: int
+    anti_crit: int
+    xp_reward: int
+    gold_min: int
+    gold_max: int
+    level: int
+    spells: list = column(str_list, default_factory=list)
+    drop_items: list = column(drop_list, default_factory=list)
+
+    def stats(self):
+        """返回敌人的属性字典，生命值和魔法值为满值。"""
+        return {
+            "max_hp": self.max_hp, "max_mp": self.max_mp,
+            "atk": self.atk, "def": self.def_, "mat": self.mat, "mdf": self.mdf,
+            "agi": self.agi, "luk": self.luk, "crit": self.crit, "anti_crit": self.anti_crit,
+            "hp": self.max_hp, "mp": self.max_mp,
+        }
+
 def load_enemies_from_csv(filepath):
     """
     从CSV文件加载敌人数据。
@@ -25,51 +69,40 @@ def load_enemies_from_csv(filepath):
 
     返回:
         dict: 以敌人ID为键，Enemy对象为值的字典
+
+    异常:
+        CsvRowError: 某一行无法解析
     """
     from data import SPELL_REGISTRY, item_factory
 
     enemies = {}
-    with open(filepath, newline='', encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            stats = {key: int(row[key]) if row[key].strip() else 0 for key in (
-                "max_hp", "max_mp", "atk", "def", "mat", "mdf", "agi", "luk", "crit", "anti_crit"
-            )}
-            stats["hp"] = stats["max_hp"]
-            stats["mp"] = stats["max_mp"]
-
-            xp = int(row["xp_reward"]) if row["xp_reward"].strip() else 0
-            gold = random.randint(int(row["gold_min"]) if row["gold_min"].strip() else 0, int(row["gold_max"]) if row["gold_max"].strip() else 0)
-            level = row["level"]
-
-            drop_items = []
-            drop_field = row.get("drop_items", "").strip()
-            if drop_field:
-                for part in drop_field.split(","):
-                    if "x" in part:
-                        item_name, count = part.split("x")
-                        item = item_factory(item_name.strip(), int(count))
-                        if item:
-                            drop_items.append(item)
-
-            enemy = Enemy(row["name_zh"], stats, xp_reward=xp, gold_reward=gold, level=level, drop_items=drop_items)
-
-            spell_names = row.get("spells", "").strip()
-            if spell_names:
-                for spell_name in spell_names.split(","):
-                    spell_name = spell_name.strip()
-                    spell_object = SPELL_REGISTRY.get(spell_name)
-                    if spell_object:
-                        enemy.spells.append(spell_object)
-                    else:
-                        debug_print(f"[警告] 技能 `{spell_name}` 不存在于 SPELL_REGISTRY 中")
-            else:
-                default_spell = SPELL_REGISTRY.get("enemy_fireball")
-                if default_spell:
-                    enemy.spells.append(default_spell)
-            assign_enemy_action_weights(enemy, row["name"])
-            enemies[row["name"]] = enemy
-        debug_print(f"从 CSV 加载敌人数据, 共加载 {len(enemies)} 项数据")
+    for row in load_rows(filepath, EnemyRow):
+        stats = row.stats()
+        gold = rng.stream("enemy").randint(row.gold_min, row.gold_max)
+
+        drop_items = []
+        for item_name, count in row.drop_items:
+            item = item_factory(item_name, count)
+            if item:
+                drop_items.append(item)
+
+        enemy = Enemy(row.name_zh, stats, xp_reward=row.xp_reward, gold_reward=gold, level=row.level, drop_items=drop_items)
+
+        if row.spells:
+            for spell_name in row.spells:
+                spell_object = SPELL_REGISTRY.get(spell_name)
+                if spell_object:
+                    enemy.spells.append(spell_object)
+                else:
+                    debug_print(f"[警告] 技能 `{spell_name}` 不存在于 SPELL_REGISTRY 中")
+        else:
+            default_spell = SPELL_REGISTRY.get("enemy_fireball")
+            if default_spell:
+                enemy.spells.append(default_spell)
+        assign_enemy_action_weights(enemy, row.name)
+        enemy.enemy_id = row.name
+        enemies[row.name] = enemy
+    debug_print(f"从 CSV 加载敌人数据, 共加载 {len(enemies)} 项数据")
     return enemies
 
 def assign_enemy_action_weights(enemy, enemy_type):
@@ -101,12 +134,24 @@ def assign_enemy_action_weights(enemy, enemy_type):
             enemy.action_weights = {"attack": 45, "defend": 20, "spell": 35}
 
 
+# 未按敌人类型分配行动权重时使用的默认权重，各实例共用，只读
+DEFAULT_ACTION_WEIGHTS = {"attack": 60, "defend": 10, "spell": 30}
+
 class Enemy(battler.Battler):
     """
     敌人类，表示游戏中可战斗的对手角色。
 
     继承自Battler基类，添加了敌人特有的属性如经验奖励、金币奖励、
     物品掉落和行动决策逻辑。
+
+    ENEMY_DATA 中的敌人是原型，clone() 得到的敌人与原型共用不可变的数据：
+    原始属性（写时复制）、掉落物品和默认行动权重，见 clone。
+    战斗结束后不再使用的敌人可以交给 EnemyPool 回收，之后用 respawn 重置为新的敌人。
+
+    属性:
+        enemy_id (str): 敌人ID，即 ENEMY_DATA 中的键，不是从数据表加载的敌人为None
+        original_stats (StatBlock): 原始属性，与原型共用，不应修改
+        drop_items (list): 击败后掉落的物品，第一次访问时才创建列表，其中的物品与原型共用，只读
     """
 
     def __init__(self, name, stats, xp_reward, gold_reward, level, drop_items=None) -> None:
@@ -127,13 +172,22 @@ class Enemy(battler.Battler):
         self.xp_reward = xp_reward
         self.gold_reward = gold_reward
         self.level = level
-        self.original_stats = stats.copy()
-        self.action_weights = {
-            "attack": 60,
-            "defend": 10,
-            "spell": 30
-        }
-        self.drop_items = drop_items or []
+        self.enemy_id = None
+        self.original_stats = StatBlock(stats)
+        self.action_weights = DEFAULT_ACTION_WEIGHTS
+        self._drop_prototypes = tuple(drop_items or ())
+        self._drop_items = None
+
+    @property
+    def drop_items(self):
+        """击败后掉落的物品列表。"""
+        if self._drop_items is None:
+            self._drop_items = list(self._drop_prototypes)
+        return self._drop_items
+
+    @drop_items.setter
+    def drop_items(self, items):
+        self._drop_items = items
 
     def clone(self, variant_name=None):
         """
@@ -142,16 +196,60 @@ class Enemy(battler.Battler):
         复制当前敌人的所有属性和状态，并根据指定或随机选择的变体
         修改其属性。
 
+        克隆不经过 __init__，也不做深复制：属性与原型的 original_stats 共用存储，
+        第一次写入（受到伤害、应用变体等）时才复制；掉落物品和行动权重直接共用原型的。
+
         参数:
             variant_name: 要应用的变体名称，若为None则随机选择
 
         返回:
             Enemy: 敌人的新实例，可能包含变体效果
         """
-        cloned = Enemy(self.name, deepcopy(self.original_stats), self.xp_reward, self.gold_reward, self.level, drop_items=deepcopy(self.drop_items))
+        cloned = Enemy.__new__(Enemy)
+        # 第二个参数即 share=True；创建对象时按关键字传参要多构造一个字典，克隆时能省则省
+        battler.Battler.__init__(cloned, self.name, StatSheet(self.original_stats, True))
         cloned.spells = self.spells.copy()
+        cloned._spawn_from(self, variant_name)
+        return cloned
+
+    def respawn(self, prototype, variant_name=None):
+        """
+        把战斗过的敌人重置为原型的一个新克隆，复用自身的属性表和各个列表。
+
+        重置后的敌人与 prototype.clone(variant_name) 得到的敌人相同，
+        随机变体的抽取方式也相同，因此不影响随机数序列。
+
+        参数:
+            prototype: 原型敌人，通常是 ENEMY_DATA 中的敌人
+            variant_name: 要应用的变体名称，若为None则随机选择
+
+        副作用:
+            - 清除属性加成、增益/减益效果、事件订阅者和战斗状态
+            - 恢复存活状态，并重新抽取变体
+        """
+        self.name = prototype.name
+        self.stats.reset(prototype.original_stats, share=True)
+        self.alive = True
+        self.buffs_and_debuffs.clear()
+        self.is_ally = False
+        self.is_defending = False
+        self.damage_taken = 0
+        self.listeners.clear()
+        self.spells[:] = prototype.spells
+        self._spawn_from(prototype, variant_name)
+
+    def _spawn_from(self, prototype, variant_name):
+        """从原型复制奖励和共用数据，并抽取、应用变体。"""
+        self.enemy_id = prototype.enemy_id
+        self.xp_reward = prototype.xp_reward
+        self.gold_reward = prototype.gold_reward
+        self.level = prototype.level
+        self.original_stats = prototype.original_stats
+        self.action_weights = DEFAULT_ACTION_WEIGHTS
+        self._drop_prototypes = prototype._drop_prototypes
+        self._drop_items = None
         if not variant_name:
-            roll = random.random()
+            roll = rng.stream("enemy").random()
             if roll < 0.03:
                 variant_name = "cursed"
             elif roll < 0.05:
@@ -162,8 +260,7 @@ class Enemy(battler.Battler):
                 variant_name = "elite"
 
         if variant_name:
-            apply_variant(cloned, variant_name)
-        return cloned
+            apply_variant(self, variant_name)
 
     def decide_action(self, allies):
         """
@@ -194,7 +291,7 @@ class Enemy(battler.Battler):
             weights["attack"] = round(weights["attack"] / total * 100)
             weights["defend"] = round(weights["defend"] / total * 100)
 
-        action_type = random.choices(
+        action_type = rng.stream("combat").choices(
             ["attack", "defend", "spell"], 
             weights=[weights["attack"], weights["defend"], weights["spell"]]
         )[0]
@@ -202,11 +299,11 @@ class Enemy(battler.Battler):
         debug_print(f"{self.name} 当前 MP: {self.stats['mp']}, 可用法术: {[s.name for s in usable_spells]}")
 
         if action_type == "attack":
-            return {"type": "attack", "target": random.choice(allies)}
+            return {"type": "attack", "target": rng.stream("combat").choice(allies)}
         elif action_type == "defend":
             return {"type": "defend"}
         else:
-            spell = random.choice(usable_spells)
+            spell = rng.stream("combat").choice(usable_spells)
             return {"type": "spell", "spell": spell, "target": None}
 
 
@@ -237,78 +334,175 @@ def apply_variant(enemy, variant_name):
                 if stat in enemy.stats:
                     enemy.stats[stat] = int(enemy.stats[stat] * value)
 
-    # 属性加成
+    # 属性加成，记入属性表的 "variant" 来源
     if "stat_bonus" in variant:
-        for stat, value in variant["stat_bonus"].items():
-            if stat in enemy.stats:
-                enemy.stats[stat] += value
+        enemy.stats.set_source("variant", {
+            stat: value for stat, value in variant["stat_bonus"].items() if stat in enemy.stats
+        })
 
     # 奖励调整
     enemy.xp_reward = int(enemy.xp_reward * variant.get("xp_multiplier", 1.0))
     enemy.gold_reward = int(enemy.gold_reward * variant.get("gold_multiplier", 1.0))
     debug_print(f"应用变体：{enemy.name} -> {variant_name}")
 
-def create_enemy_group(level, possible_enemies, enemy_quantity_for_level):
+class EnemyPool:
+    """
+    随机遭遇的敌人对象池，按敌人ID分别保存战斗结束后回收的敌人。
+
+    acquire 优先取出回收的敌人，用 Enemy.respawn 重置后返回，池中没有时才克隆原型。
+    长时间的自动探索和模拟中，敌人对象及其属性表、列表都会被反复使用，
+    不会每场战斗都分配新的对象。
+
+    回收的敌人不能再被其他地方使用，例如 Boss 战这类长期保存的敌人不应放入对象池。
+    对象池没有加锁，每个游戏会话或模拟任务应使用自己的对象池。
+
+    属性:
+        hits (int): 从池中取得敌人的次数
+        misses (int): 池中没有可用的敌人、需要克隆原型的次数
+        max_free (int): 每种敌人最多保存的回收数量，为0时不回收
+
+    用法:
+        pool = EnemyPool(ENEMY_DATA)
+        group = [pool.acquire("slime") for _ in range(3)]
+        combat.combat(player, group)
+        pool.release(group)
+    """
+    def __init__(self, prototypes, max_free: int = 8) -> None:
+        """
+        初始化对象池。
+
+        参数:
+            prototypes: 以敌人ID为键的原型敌人，通常是 ENEMY_DATA
+            max_free (int): 每种敌人最多保存的回收数量
+        """
+        self.prototypes = prototypes
+        self.max_free = max_free
+        self.hits = 0
+        self.misses = 0
+        self._free = {}
+        self._pooled = set()
+
+    @property
+    def hit_rate(self) -> float:
+        """从池中取得敌人的比例，尚未取用过时为0。"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def free_count(self, enemy_id=None) -> int:
+        """返回池中某种敌人（省略时为全部敌人）的回收数量。"""
+        if enemy_id is not None:
+            return len(self._free.get(enemy_id, ()))
+        return len(self._pooled)
+
+    def acquire(self, enemy_id, variant_name=None):
+        """
+        取得一个敌人，与 ENEMY_DATA[enemy_id].clone(variant_name) 得到的敌人相同。
+
+        参数:
+            enemy_id: 敌人ID
+            variant_name: 要应用的变体名称，若为None则随机选择
+
+        返回:
+            Enemy: 重置后的回收敌人，或新克隆的敌人
+        """
+        prototype = self.prototypes[enemy_id]
+        free = self._free.get(enemy_id)
+        if free:
+            enemy = free.pop()
+            self._pooled.discard(id(enemy))
+            self.hits += 1
+            enemy.respawn(prototype, variant_name)
+            return enemy
+        self.misses += 1
+        return prototype.clone(variant_name)
+
+    def release(self, enemies) -> None:
+        """
+        回收战斗结束后不再使用的敌人。
+
+        没有敌人ID的敌人、已经回收的敌人和超出 max_free 的敌人会被忽略。
+
+        参数:
+            enemies: 要回收的敌人
+        """
+        for enemy in enemies:
+            enemy_id = getattr(enemy, "enemy_id", None)
+            if enemy_id is None or id(enemy) in self._pooled:
+                continue
+            free = self._free.setdefault(enemy_id, [])
+            if len(free) < self.max_free:
+                enemy.listeners.clear()     # 不再持有战斗执行器
+                free.append(enemy)
+                self._pooled.add(id(enemy))
+
+    def stats(self) -> dict:
+        """返回命中次数、未命中次数、命中率和回收数量。"""
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 4), "free": self.free_count()}
+
+def create_enemy_group(level, spawn_table, pool):
     """
     根据玩家等级创建敌人组合。
 
-    基于玩家等级和可能的敌人池，随机生成适合挑战难度的敌人组合。
+    从刷怪表中取得玩家等级所在的等级段，随机决定敌人数量，再按权重抽取每个敌人。
+    刷怪表已经预先计算好各等级段的候选敌人和数量上限，生成每个敌人的开销是常数。
 
     参数:
         level: 玩家等级
-        possible_enemies: 可选敌人池及其适用等级范围
-        enemy_quantity_for_level: 不同等级段的敌人数量上限
+        spawn_table (SpawnTable): 刷怪表，例如 DEFAULT_SPAWN_TABLE 或地区的刷怪表
+        pool (EnemyPool): 调用方（游戏会话或模拟任务）的对象池，
+            战斗结束后可以用 pool.release 回收敌人
 
     返回:
         list: 包含Enemy对象的敌人组合
+
+    异常:
+        IndexError: 该等级没有可出现的敌人
     """
-    valid_enemy_ids = [
-        enemy_id for enemy_id, (low, high) in possible_enemies.items()
-        if low <= level <= high
-    ]
-
-    # 确定敌人数量
-    max_enemies = next(
-        (enemy_quantity_for_level[max_level] for max_level in sorted(enemy_quantity_for_level) if level < max_level),
-        1
-    )
-    num_enemies = random.randint(1, max_enemies)
+    band = spawn_table.band(level)
+    num_enemies = band.roll_count(rng.stream("enemy"))
 
     group = []
     for _ in range(num_enemies):
-        enemy_id = random.choice(valid_enemy_ids)
-        enemy = ENEMY_DATA[enemy_id].clone()  # 这里每个 enemy 都有自己独立的变体生成逻辑
+        enemy_id = band.sample(rng.stream("enemy"))
+        enemy = pool.acquire(enemy_id)  # 这里每个 enemy 都有自己独立的变体生成逻辑
         group.append(enemy)
     return group
 
-ENEMY_DATA = load_enemies_from_csv("data/csv_data/enemies.csv")
+ENEMY_DATA = LazyTable("enemies", partial(load_enemies_from_csv, "data/csv_data/enemies.csv"))
 
-g_possible_enemies = POSSIBLE_ENEMIES
+# 不区分地区的刷怪表，用于宝箱陷阱等不属于某个地区的遭遇和平衡性模拟
+DEFAULT_SPAWN_TABLE = SpawnTable(POSSIBLE_ENEMIES, ENEMY_QUANTITY_FOR_LEVEL)
 
 # Boss 固定战
+BOSS_GROUPS = {
+    "caesarus_bandit": ["caesarus_bandit_leader", "bandit", "bandit"],
+    "giant_slime": ["giant_slime", "slime", "slime", "slime"],
+    "slime_king": ["slime_king", "giant_slime", "giant_slime"],
+    "wolf_king": ["wolf_king", "wolf", "wolf", "wolf"],
+}
+
+def create_boss_group(key):
+    """
+    根据 BOSS_GROUPS 中的编组创建一组新的 Boss 战敌人。
+
+    参数:
+        key: BOSS_GROUPS 中的编组名称
+
+    返回:
+        list: 包含Enemy对象的敌人组合
+    """
+    return [ENEMY_DATA[enemy_id].clone() for enemy_id in BOSS_GROUPS[key]]
+
 # TODO 每杀死一个, 游戏中便减少一个
-caesarus_bandit_lists = [
-    ENEMY_DATA["caesarus_bandit_leader"].clone(),
-    ENEMY_DATA["bandit"].clone(),
-    ENEMY_DATA["bandit"].clone(),
-]
-
-giant_slime_lists = [
-    ENEMY_DATA["giant_slime"].clone(),
-    ENEMY_DATA["slime"].clone(),
-    ENEMY_DATA["slime"].clone(),
-    ENEMY_DATA["slime"].clone(),
-]
-
-slime_king_lists = [
-    ENEMY_DATA["slime_king"].clone(),
-    ENEMY_DATA["giant_slime"].clone(),
-    ENEMY_DATA["giant_slime"].clone(),
-]
-
-wolf_king_lists = [
-    ENEMY_DATA["wolf_king"].clone(),
-    ENEMY_DATA["wolf"].clone(),
-    ENEMY_DATA["wolf"].clone(),
-    ENEMY_DATA["wolf"].clone(),
-]
+def _boss_lists():
+    return {
+        "caesarus_bandit_lists": create_boss_group("caesarus_bandit"),
+        "giant_slime_lists": create_boss_group("giant_slime"),
+        "slime_king_lists": create_boss_group("slime_king"),
+        "wolf_king_lists": create_boss_group("wolf_king"),
+    }
+
+# Boss 战的敌人在第一次访问时才创建
+__getattr__ = lazy_attributes(globals(), dict.fromkeys(
+    ["caesarus_bandit_lists", "giant_slime_lists", "slime_king_lists", "wolf_king_lists"], _boss_lists
+))
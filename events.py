@@ -6,15 +6,16 @@
 和触发条件，丰富了游戏的探索体验和互动元素。
 """
 
-import random
 from typing import List, Callable
 
 import combat
 import enemies
 from ui import text
 from core import shops
+from core import rng
 from data import DIALOGUE
 from data import POSSIBLE_ENEMIES
+from core.spawn_table import SpawnTable
 from bag import InventoryInterface as interface
 from ui import enter_clear_screen, clear_screen
 
@@ -65,42 +66,38 @@ class Event():
         返回:
             bool: 事件成功时返回True，否则返回False
         """
-        return self.success_chance >= random.randint(0, 100)
+        return self.success_chance >= rng.stream("event").randint(0, 100)
 
 class RandomCombatEvent(Event):
     """
     随机战斗事件类，用于生成基于玩家等级的随机战斗。
 
-    根据玩家等级和预设的敌人数量规则生成适合的敌人组合。
+    根据玩家等级从刷怪表中生成适合的敌人组合。
     """
 
-    def __init__(self, name) -> None:
+    def __init__(self, name, pool: enemies.EnemyPool, spawn_table: SpawnTable = None) -> None:
         """
         初始化随机战斗事件。
 
-        设置事件名称并定义不同玩家等级对应的最大敌人数量。
-
         参数:
             name: 事件名称
+            pool (EnemyPool): 所在游戏会话的敌人对象池
+            spawn_table (SpawnTable, optional): 刷怪表，通常是所在地区的刷怪表，
+                默认为 enemies.DEFAULT_SPAWN_TABLE
         """
         super().__init__(name, 100, False)
-        self.enemy_quantity_for_level = {
-            4: 1,
-            7: 2,
-            18: 3,
-            37: 4,
-            55: 5,
-            120: 6,
-        }
+        self.pool = pool
+        self.spawn_table = spawn_table or enemies.DEFAULT_SPAWN_TABLE
 
     def effect(self, player):
         """
         触发随机战斗事件的效果。
 
-        根据玩家等级创建敌人组合并开始战斗。
+        根据玩家等级创建敌人组合并开始战斗，战斗结束后把敌人交回对象池。
         """
-        enemy_group = enemies.create_enemy_group(player.ls.level, enemies.g_possible_enemies, self.enemy_quantity_for_level)
+        enemy_group = enemies.create_enemy_group(player.ls.level, self.spawn_table, self.pool)
         combat.combat(player, enemy_group)
+        self.pool.release(enemy_group)
 
 class FixedCombatEvent(Event):
     """
@@ -299,11 +296,15 @@ class InnEvent(HealingEvent):
         else:
             print(self.refuse)
 
+# 宝箱陷阱引来的敌人：不分地区，任何等级最多 4 个
+HIDDEN_CHEST_SPAWNS = SpawnTable(POSSIBLE_ENEMIES, {100: 4})
+
 class HiddenChestEvent(Event):
     """
     隐藏宝箱事件类，表示玩家可以发现并尝试打开的宝箱。
 
     成功打开宝箱可以获得奖励，失败则会触发陷阱造成伤害并引发战斗。
+    陷阱引来的敌人取自事件自己的对象池，不与其他事件共用。
     """
 
     def __init__(self, name, item_name) -> None:
@@ -316,6 +317,7 @@ class HiddenChestEvent(Event):
         """
         super().__init__(name, 100, False)
         self.item_name = item_name
+        self.pool = enemies.EnemyPool(enemies.ENEMY_DATA)
 
     def effect(self, player):
         """
@@ -330,9 +332,9 @@ class HiddenChestEvent(Event):
             print(DIALOGUE['hidden_chest']['refuse'])
             return
         lock_chance = player.stats["luk"] * 2 + player.stats["agi"] * 1.25 + player.ls.level
-        if random.randint(0, 200) < min(lock_chance, 125):
-            gold = random.randint(12, 35) + player.ls.level
-            exp = random.randint(5, 25) * player.ls.level
+        if rng.stream("event").randint(0, 200) < min(lock_chance, 125):
+            gold = rng.stream("event").randint(12, 35) + player.ls.level
+            exp = rng.stream("event").randint(5, 25) * player.ls.level
             item = equipment_data[self.item_name]
             print(DIALOGUE['hidden_chest']['success'])
             player.add_money(gold)
@@ -342,8 +344,9 @@ class HiddenChestEvent(Event):
             damage = int(player.stats["max_hp"] * 0.2)
             print(DIALOGUE['hidden_chest']['fail'])
             player.take_dmg(damage)
-            enemy_group = enemies.create_enemy_group(player.ls.level, POSSIBLE_ENEMIES, {100: 4})
+            enemy_group = enemies.create_enemy_group(player.ls.level, HIDDEN_CHEST_SPAWNS, self.pool)
             combat.combat(player, enemy_group)
+            self.pool.release(enemy_group)
 
 class SimpleEvent(Event):
     """
@@ -383,7 +386,7 @@ def make_simple_reward_event(key, reward_funcs):
         effect_func: 可用于SimpleEvent的effect_func
     """
     def effect_func(player):
-        print(DIALOGUE[key][random.choice(['talk', 'talk2', 'talk3'])])
+        print(DIALOGUE[key][rng.stream("event").choice(['talk', 'talk2', 'talk3'])])
         for func in reward_funcs:
             func(player)
     return effect_func
@@ -399,18 +402,18 @@ def heal(amount_func):
 
 find_coins_effect = make_simple_reward_event(
     'find_coins',
-    [give_gold(lambda player: random.randint(3, 7) * player.ls.level)]
+    [give_gold(lambda player: rng.stream("event").randint(3, 7) * player.ls.level)]
 )
 
 admire_scenery_effect = make_simple_reward_event(
     'admire_scenery',
-    [give_exp(lambda player: random.randint(5, 15) + player.ls.level)]
+    [give_exp(lambda player: rng.stream("event").randint(5, 15) + player.ls.level)]
 )
 
 friendly_villager_effect = make_simple_reward_event(
     'friendly_villager',
     [
-        give_gold(lambda player: random.randint(5, 10)),
+        give_gold(lambda player: rng.stream("event").randint(5, 10)),
         heal(lambda player: int(player.stats["max_hp"] * 0.1))
     ]
 )
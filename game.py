@@ -1,15 +1,13 @@
 import sys
-from rich.console import Console
+import argparse
 
-import player
-import data.event_text
+from core import rng
+from ui import get_console
 from ui import text
-from world import map
 from ui import enter_clear_screen, clear_screen
-from bag import InventoryInterface as interface
-from mods import command_parser as cp
+from ui import fx
 
-console = Console()
+console = get_console()
 
 
 # *标题菜单*
@@ -40,6 +38,8 @@ def inventory_selections(player):
     参数:
         player: 玩家对象，包含背包属性
     """
+    from bag import InventoryInterface as interface
+
     while (option := input("> ").lower()) != "q":
         match option:
             case "u": clear_screen(); item = interface(player.inventory).use_item(); item.activate(player) if item is not None else None
@@ -61,6 +61,8 @@ def play(p=None):
     参数:
         p: 可选的玩家对象，用于继续游戏或转生。默认为None，表示创建新角色。
     """
+    import player
+    import data.event_text
     from mods.give_initial_items import give_initial_items, apply_class_bonuses
 
     if p is None:
@@ -85,10 +87,15 @@ def game_loop(p):
     参数:
         p: 玩家对象，包含玩家的所有状态和属性
     """
+    from world import map
+    from bag import InventoryInterface as interface
+    from mods import command_parser as cp
+
     map.world_map.get_current_region_info()
     enter_clear_screen()
     event_chances = (60, 25, 15) # 战斗、商店、治疗的概率
     while p.alive:
+        fx.stop_skipping()
         text.play_menu()
         match cp.handle_command(input("> "), p):
             case "w": clear_screen(); map.world_map.generate_random_event(p, *event_chances); p.decrease_hunger(1); enter_clear_screen()
@@ -106,5 +113,56 @@ def game_loop(p):
         play(p)
 
 
+def main(argv=None):
+    """
+    解析命令行参数并启动游戏。
+
+    游戏数据在第一次访问时才加载，加载时会生成随机内容（如装备品质、敌人金币），
+    其随机会话由默认会话的种子派生，因此必须先设置会话种子，再访问这些数据。
+
+    参数:
+        argv: 命令行参数列表，默认为 sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description="文字冒险 RPG")
+    parser.add_argument("--seed", type=int, default=None, help="会话种子，默认取自环境变量 RPG_SEED 或随机生成")
+    parser.add_argument("--record-input", metavar="FILE", help="把本局的所有输入记录到文件")
+    parser.add_argument("--replay-input", metavar="FILE", help="从文件回放输入，未指定种子时使用文件中记录的种子")
+    parser.add_argument("--combat-log", metavar="FILE", help="把本局所有战斗的结构化记录追加到文件，可用 mods.benchmarks combat_replay 重放")
+    parser.add_argument("--profile-startup", action="store_true", help="分析启动时每个模块导入和数据加载的耗时与内存分配，打印报告后退出")
+    parser.add_argument("--profile-json", metavar="FILE", help="与 --profile-startup 一起使用，把分析结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        # 在全新的解释器中分析，本进程已经导入的模块不会干扰统计
+        import subprocess
+        command = [sys.executable, "-m", "mods.startup_profiler"]
+        if args.profile_json:
+            command += ["--json", args.profile_json]
+        sys.exit(subprocess.call(command))
+
+    from mods import input_log
+    from core import combat_log
+
+    seed = args.seed
+    if seed is None and args.replay_input:
+        seed = input_log.read_seed(args.replay_input)
+    session = rng.set_seed(seed) if seed is not None else rng.current()
+
+    if args.replay_input:
+        input_log.InputReplayer(args.replay_input).install()
+    if args.record_input:
+        input_log.InputRecorder(args.record_input, session.seed).install()
+
+    if not args.combat_log:
+        title_screen_selections()
+        return
+    with combat_log.CombatLog(args.combat_log) as log:
+        combat_log.set_default_log(log)
+        try:
+            title_screen_selections()
+        finally:
+            combat_log.set_default_log(None)
+
+
 if __name__ == "__main__":
-    title_screen_selections()
+    main()
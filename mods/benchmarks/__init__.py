@@ -0,0 +1,52 @@
+"""
+基准测试包，衡量各项性能优化相对改造前实现的收益。
+
+每项优化一个模块，模块中的 run 函数运行基准测试，在改造后的实现没有达到
+该项优化承诺的改进（更快、更省内存等）时返回 False。行为与改造前一致的检查
+在 tests/ 中，用 pytest 运行。各模块在运行时才导入，可以通过命令行单独运行:
+    python -m mods.benchmarks <名称> [--samples N] [--seed S] [--log FILE]
+
+检查失败时以非零状态码退出，便于在提交前手动验证。
+"""
+
+import argparse
+import inspect
+from importlib import import_module
+
+from ui import get_console
+
+console = get_console()
+
+# 基准测试名称，即本包中的模块名
+BENCHMARKS = (
+    "damage_kernel",
+    "combat_replay",
+    "content_snapshot",
+    "csv_schema",
+    "equipment_index",
+    "item_memory",
+    "stat_block",
+    "enemy_clone",
+    "enemy_pool",
+    "spawn_table",
+    "inventory_index",
+    "inventory_aggregates",
+    "inventory_transaction",
+    "compact_inventory",
+    "inventory_paging",
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="运行基准测试")
+    parser.add_argument("name", choices=sorted(BENCHMARKS), help="要运行的基准测试")
+    parser.add_argument("--samples", type=int, default=None, help="样本数量，默认取各基准测试自己的默认值")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--log", default=None, help="战斗记录文件（combat_replay）")
+    args = parser.parse_args(argv)
+    benchmark = import_module(f"{__name__}.{args.name}").run
+    accepted = inspect.signature(benchmark).parameters
+    options = {key: value for key, value in vars(args).items() if key in accepted and value is not None}
+    ok = benchmark(**options)
+    console.print("通过" if ok else "失败", style="bold green" if ok else "bold red")
+    return 0 if ok else 1
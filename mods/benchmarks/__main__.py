@@ -0,0 +1,5 @@
+import sys
+
+from mods.benchmarks import main
+
+sys.exit(main())
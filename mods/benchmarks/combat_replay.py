@@ -0,0 +1,90 @@
+"""
+战斗记录重放的基准测试：记录若干场无界面战斗，再全速重放并与记录逐条比对。
+
+也可以用 --log 重放游戏中 --combat-log 写下的记录文件，用于重现问题。
+重放结果与记录一致的检查见 tests/test_combat_log.py。
+"""
+
+import os
+import tempfile
+import time
+
+from mods.benchmarks.common import console
+
+
+def record_fights(path: str, fights: int, seed: int) -> float:
+    """以不同职业、装备、策略和行动顺序模式进行若干场无界面战斗并写入记录，返回耗时。"""
+    import player  # noqa: F401  先导入 player 以避免 combat 的循环导入
+    import combat
+    import enemies
+    import simulate
+    from core import rng
+    from core.combat_log import CombatLog
+    from ui import null_output
+
+    from data import equipment_data, hp_potion, mp_potion
+
+    classes = sorted(set(simulate.CLASS_ALIASES.values()))
+    groups = [ids for ids in simulate.enemy_groups().values() if ids is not None]
+    equipment_ids = sorted(equipment_data)
+    start = time.perf_counter()
+    with CombatLog(path) as log, rng.session(seed) as session, null_output():
+        picker = session.stream("benchmark")
+        for i in range(fights):
+            build = simulate.PlayerBuild(
+                class_name=picker.choice(classes),
+                equipment=picker.sample(equipment_ids, 2),
+                policy=picker.choice(sorted(simulate.POLICIES)),
+                turn_mode=picker.choice(("round", "atb")),
+            )
+            p = simulate.build_player(build, picker.randint(1, 10))
+            p.inventory.add_item(hp_potion, picker.randint(1, 3))
+            p.inventory.add_item(mp_potion, picker.randint(1, 3))
+            group = [enemies.ENEMY_DATA[enemy_id].clone() for enemy_id in picker.choice(groups)]
+            combat.headless_combat(p, group, simulate.POLICIES[build.policy](), turn_mode=build.turn_mode, log=log)
+    return time.perf_counter() - start
+
+
+def run(samples: int = 200, seed: int = 0, log: str = None) -> bool:
+    """
+    重放战斗记录并逐条比对，统计重放速度。
+
+    未指定记录文件时，先以不同的职业、策略和行动顺序模式进行 samples 场战斗
+    写入临时记录文件，再重放该文件；此时重放必须比原来的战斗快。
+
+    参数:
+        samples (int): 未指定记录文件时生成的战斗场数
+        seed (int): 随机种子
+        log (str, optional): 要重放的记录文件
+
+    返回:
+        bool: 全部战斗的重放结果与记录一致，且（生成记录时）重放比原来的战斗快
+    """
+    from core import combat_log
+
+    path = log
+    record_time = None
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        record_time = record_fights(path, samples, seed)
+        console.print(f"记录 {samples} 场战斗，耗时 {record_time:.3f}s，文件大小 {os.path.getsize(path) / 1024:.1f} KiB")
+
+    try:
+        battles = list(combat_log.read_log(path))
+        records = sum(len(battle) for battle in battles)
+        start = time.perf_counter()
+        for index, battle in enumerate(battles):
+            try:
+                combat_log.replay_combat(battle)
+            except combat_log.ReplayMismatch as error:
+                console.print(f"第 {index + 1} 场战斗重放不一致: {error}", style="bold red")
+                return False
+        elapsed = time.perf_counter() - start
+    finally:
+        if log is None:
+            os.remove(path)
+    faster = record_time is None or elapsed < record_time
+    console.print(f"重放 {len(battles)} 场战斗、{records} 条记录，耗时 {elapsed:.3f}s ({records / max(elapsed, 1e-9):.0f} 条/秒)",
+                  style="green" if faster else "bold red")
+    return faster
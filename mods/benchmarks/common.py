@@ -0,0 +1,68 @@
+"""
+基准测试共用的计时、内存测量和报告函数。
+"""
+
+import time
+
+from ui import get_console
+
+console = get_console()
+
+
+def timed(func, *args, **kwargs):
+    """执行 func，返回 (结果, 耗时秒数)。"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def best_time(func, repeat: int = 5) -> float:
+    """重复执行 func，返回最短的一次耗时（秒），执行期间暂停垃圾回收。"""
+    import gc
+    gc.collect()
+    gc.disable()
+    try:
+        return min(timed(func)[1] for _ in range(repeat))
+    finally:
+        gc.enable()
+
+
+def traced_memory(build):
+    """
+    用 tracemalloc 测量 build() 的结果占用的内存。只用于测量内存，tracemalloc 会明显拖慢执行，不要同时计时。
+
+    返回:
+        tuple: (build 的结果, 字节数)
+    """
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(label: str, before_name: str, before: float, after_name: str, after: float, unit: str = "ms",
+            required: bool = True) -> bool:
+    """
+    输出改造前后的一项耗时或内存，必须改进的项目在改造后不占优时标红。
+
+    参数:
+        label (str): 比较的项目
+        before_name, after_name (str): 两种实现的名称
+        before, after (float): 两者的耗时（秒）或内存（字节）
+        unit (str): 显示单位，"ms"、"µs" 按秒换算，"B" 原样显示
+        required (bool): 是否是必须改进的项目，否则只作参考
+
+    返回:
+        bool: after 是否小于 before
+    """
+    scale = {"ms": 1e3, "µs": 1e6, "B": 1}[unit]
+    digits = 0 if unit == "B" else 2
+    better = after < before
+    console.print(f"{label}: {before_name} {before * scale:.{digits}f}{unit}, {after_name} {after * scale:.{digits}f}{unit} "
+                  f"({before / max(after, 1e-12):.1f}x)", style="green" if better else "bold red" if required else None)
+    return better
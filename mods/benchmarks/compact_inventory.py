@@ -0,0 +1,97 @@
+"""
+紧凑背包的基准测试：比较 Inventory 与 CompactInventory 保存大量随机生成装备时的内存和各项操作耗时。
+
+两种库存内容、合计值、筛选和整理结果相同的检查见 tests/test_compact_inventory.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console, traced_memory
+
+
+def generated_rolls(samples: int, seed: int) -> list:
+    """生成 samples 件随机品质的装备，外加 samples // 10 种材料，顺序打乱。"""
+    import random
+    from data.constants import QUALITY_CONFIG
+    from others.equipment import Equipment
+    from others.item import Item
+
+    rnd = random.Random(seed)
+    kinds = ["weapon", "armor", "head", "hand", "foot"]
+    templates = [
+        Equipment(f"生成装备{i}", "", 1, rnd.randint(10, 500), kinds[i % len(kinds)], {"atk": rnd.randint(1, 9)},
+                  quality_data=QUALITY_CONFIG[0][:3])
+        for i in range(samples // len(QUALITY_CONFIG) + 1)
+    ]
+    rolls = []
+    for template in templates:
+        for quality in QUALITY_CONFIG:
+            roll = template.clone(rnd.randint(1, 3))
+            roll.set_quality(quality[:3])
+            rolls.append(roll)
+    rolls = rolls[:samples]
+    rolls += [Item(f"生成材料{i}", "", 1, 5, "material") for i in range(samples // 10)]
+    rnd.shuffle(rolls)
+    return rolls
+
+
+def fill(inventory, rolls):
+    for item in rolls:
+        inventory.add_item(item)
+    return inventory
+
+
+def remove(inventory, names):
+    for name in names:
+        inventory.remove_items_by_name(name, 1)
+    return inventory
+
+
+def run(samples: int = 20_000, seed: int = 0) -> bool:
+    """
+    比较两种库存保存 samples 堆装备的内存，以及入包、筛选、移除和整理的耗时。
+
+    内存用 tracemalloc 单独测量，耗时在 tracemalloc 之外取多次中最短的一次。
+    筛选的耗时包括求结果的长度，CompactInventory 只在访问物品时才创建物品对象。
+
+    参数:
+        samples (int): 装备堆数
+        seed (int): 随机种子
+
+    返回:
+        bool: CompactInventory 的内存是否更少、筛选和整理是否更快
+    """
+    import random
+    from bag import CompactInventory, Inventory
+    from ui.sink import null_output
+
+    rolls = generated_rolls(samples, seed)
+    removals = [item.name for item in random.Random(seed).sample(rolls, len(rolls) // 5)]
+
+    def time_on_new(cls, prepare, action):
+        """对新建并经 prepare 处理的库存执行 action，返回三次中最短的耗时。"""
+        times = []
+        for _ in range(3):
+            inventory = prepare(cls())
+            with null_output():
+                times.append(best_time(lambda: action(inventory), repeat=1))
+        return min(times)
+
+    def measure(cls):
+        _, memory = traced_memory(lambda: fill(cls(), rolls))
+        inventory = fill(cls(), rolls)
+        return memory, {
+            "入包": best_time(lambda: fill(cls(), rolls), repeat=3),
+            "筛选": best_time(lambda: (len(inventory.get_items_by_type("weapon")), len(inventory.get_equipments()))),
+            "移除": time_on_new(cls, lambda inventory: fill(inventory, rolls), lambda inventory: remove(inventory, removals)),
+            "整理": time_on_new(cls, lambda inventory: remove(fill(inventory, rolls), removals),
+                              lambda inventory: inventory.sort_items()),
+        }
+
+    list_memory, list_times = measure(Inventory)
+    compact_memory, compact_times = measure(CompactInventory)
+    console.print(f"{len(rolls)} 堆物品")
+    smaller = compare("每堆的内存", "Inventory", list_memory / len(rolls), "CompactInventory",
+                      compact_memory / len(rolls), unit="B")
+    required = ("筛选", "整理")
+    faster = [compare(name, "Inventory", list_times[name], "CompactInventory", compact_times[name], required=name in required)
+              for name in list_times]
+    return smaller and all(better for name, better in zip(list_times, faster) if name in required)
@@ -0,0 +1,35 @@
+"""
+数据快照的基准测试：比较逐个解析数据文件与读取数据快照（含源文件哈希校验）的耗时。
+
+快照内容和失效机制的检查见 tests/test_content_snapshot.py。
+"""
+
+import os
+import statistics
+import tempfile
+
+from mods.benchmarks.common import compare, console, timed
+
+
+def run(samples: int = 50) -> bool:
+    """
+    比较解析全部数据文件与读取快照的耗时，各取 samples 次的中位数。
+
+    参数:
+        samples (int): 计时的重复次数
+
+    返回:
+        bool: 读取快照是否比解析快
+    """
+    from tools import content_snapshot as snapshot
+
+    def parse_all():
+        return snapshot.compile_sources(snapshot._read_sources(snapshot.source_files()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "content.snapshot.json")
+        snapshot.build(path)
+        parse_time = statistics.median(timed(parse_all)[1] for _ in range(samples))
+        load_time = statistics.median(timed(snapshot.load, path)[1] for _ in range(samples))
+        console.print(f"快照大小 {os.path.getsize(path) / 1024:.1f} KiB")
+    return compare("耗时", "解析", parse_time, "快照", load_time)
@@ -0,0 +1,70 @@
+"""
+CSV 行模式的基准测试：比较逐行手工解析（csv.DictReader + ast.literal_eval）与编译后的行模式解析装备表的耗时。
+
+两种解析得到相同字段的检查见 tests/test_csv_schema.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console
+
+
+def catalog_text(samples: int) -> str:
+    """把 equipments.csv 的数据行重复到 samples 行，返回 CSV 文本，模拟大型物品目录。"""
+    import csv
+    import io
+    from tools import content_snapshot
+
+    table = content_snapshot.read("data/csv_data/equipments.csv")
+    data_rows = table["rows"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table["columns"])
+    writer.writerows(data_rows[i % len(data_rows)] for i in range(samples))
+    return buffer.getvalue()
+
+
+def manual_parse(text: str) -> list:
+    """改造前的逐行手工解析，返回 (名称, 单价, 属性加成, 等级, 连携, 法术) 的列表。"""
+    import ast
+    import csv
+    import io
+    from tools.csv_schema import SEPARATOR_PREFIX
+
+    result = []
+    for row in csv.DictReader(io.StringIO(text)):
+        if row["name"].startswith(SEPARATOR_PREFIX):
+            continue
+        result.append((
+            row["name"],
+            int(row["individual_value"]) if row["individual_value"].strip() else 0,
+            ast.literal_eval(row["stat_change_list"]),
+            int(row["level"]) if row["level"].strip() else 0,
+            row.get("combo", "").strip(),
+            row.get("spell", "").strip(),
+        ))
+    return result
+
+
+def schema_parse(text: str) -> list:
+    """用编译后的 EquipmentRow 行模式解析，返回行对象的列表。"""
+    from data.items_data import EquipmentRow
+    from tools import content_snapshot
+    from tools.csv_schema import parse_rows
+
+    parsed = content_snapshot.parse_file("catalog.csv", text.encode("utf-8"))
+    return parse_rows(parsed, EquipmentRow, "catalog.csv")
+
+
+def run(samples: int = 20_000) -> bool:
+    """
+    比较两种方式解析 samples 行装备表的耗时。
+
+    参数:
+        samples (int): 目录的行数
+
+    返回:
+        bool: 行模式是否更快
+    """
+    text = catalog_text(samples)
+    console.print(f"{samples} 行装备")
+    return compare("耗时", "手工解析", best_time(lambda: manual_parse(text), repeat=3),
+                   "行模式", best_time(lambda: schema_parse(text), repeat=3))
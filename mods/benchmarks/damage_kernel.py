@@ -0,0 +1,63 @@
+"""
+批量伤害计算的基准测试：比较 core.damage_kernel 与逐次调用 Battler.normal_attack 结算同一批攻击的耗时。
+
+两条路径结果一致的检查见 tests/test_damage_kernel.py。
+"""
+
+from mods.benchmarks.common import compare, console, timed
+
+
+def random_stats(n: int, generator):
+    """生成 n 行随机的攻防属性矩阵，列顺序同 STAT_COLUMNS。"""
+    import numpy as np
+    from core.damage_kernel import STAT_COLUMNS
+    ranges = {
+        "atk": (1, 60), "def": (0, 40), "mat": (0, 60), "mdf": (0, 40),
+        "agi": (1, 40), "luk": (0, 30), "crit": (0, 60), "anti_crit": (0, 30),
+    }
+    return np.column_stack([generator.integers(low, high + 1, n) for low, high in (ranges[col] for col in STAT_COLUMNS)]).astype(np.float64)
+
+
+def make_battler(name, row):
+    """用属性矩阵的一行创建不会被打死的战斗单位。"""
+    from core.battler import Battler
+    from core.damage_kernel import STAT_COLUMNS
+    stats = {col: int(value) for col, value in zip(STAT_COLUMNS, row)}
+    stats.update(hp=10**9, max_hp=10**9, mp=0, max_mp=0)
+    return Battler(name, stats)
+
+
+def scalar_attacks(attackers, defenders):
+    """逐次调用 Battler.normal_attack 结算攻击，返回伤害数组。"""
+    import numpy as np
+    from ui import null_output
+    damage = np.zeros(len(attackers), np.int64)
+    with null_output():
+        for i in range(len(attackers)):
+            damage[i] = make_battler("A", attackers[i]).normal_attack(make_battler("D", defenders[i]))
+    return damage
+
+
+def run(samples: int = 100_000, seed: int = 0) -> bool:
+    """
+    比较批量结算与标量结算 samples 次攻击的耗时。
+
+    参数:
+        samples (int): 攻击次数
+        seed (int): 随机种子
+
+    返回:
+        bool: 批量结算是否更快
+    """
+    import numpy as np
+    import player  # noqa: F401  先导入 player 以避免 combat 的循环导入
+    from core import damage_kernel as kernel
+    from core import rng
+
+    generator = np.random.default_rng(seed)
+    attackers, defenders = random_stats(samples, generator), random_stats(samples, generator)
+    with rng.session(seed):
+        _, scalar_time = timed(scalar_attacks, attackers, defenders)
+    _, kernel_time = timed(kernel.resolve_attacks, attackers, defenders, rng=np.random.default_rng(seed))
+    console.print(f"{samples} 次攻击")
+    return compare("耗时", "标量", scalar_time, "批量", kernel_time)
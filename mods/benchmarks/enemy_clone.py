@@ -0,0 +1,74 @@
+"""
+敌人克隆的基准测试：比较改造前（深复制属性和掉落物品后重新构造）与原型克隆生成敌人的耗时，
+并统计 create_enemy_group 生成每个敌人的平均耗时。
+
+两种方式生成相同敌人的检查见 tests/test_enemy_clone.py。
+"""
+
+from contextlib import contextmanager
+
+from mods.benchmarks.common import best_time, compare, console, timed
+
+
+def clone_plan(samples: int) -> list:
+    """对每个原型依次使用无变体和各个变体，共 samples 个 (原型, 变体名称)。"""
+    from data import ENEMY_VARIANTS
+    from enemies import ENEMY_DATA
+    variants = ["none"] + sorted(ENEMY_VARIANTS)   # "none" 不在 ENEMY_VARIANTS 中，不应用变体
+    prototypes = list(ENEMY_DATA.values())
+    return [(prototypes[i % len(prototypes)], variants[i % len(variants)]) for i in range(samples)]
+
+
+def legacy_clone(prototype, variant_name):
+    """改造前的 Enemy.clone：深复制属性和掉落物品后重新构造。"""
+    from copy import deepcopy
+    from enemies import Enemy, apply_variant
+    cloned = Enemy(prototype.name, deepcopy(dict(prototype.original_stats)), prototype.xp_reward,
+                   prototype.gold_reward, prototype.level, drop_items=deepcopy(prototype.drop_items))
+    cloned.spells = prototype.spells.copy()
+    apply_variant(cloned, variant_name)
+    return cloned
+
+
+@contextmanager
+def quiet_debug():
+    """关闭调试输出，应用变体时的 debug_print 比克隆本身慢得多。"""
+    from mods import dev_tools
+    debug, dev_tools.DEBUG = dev_tools.DEBUG, False
+    try:
+        yield
+    finally:
+        dev_tools.DEBUG = debug
+
+
+def run(samples: int = 20_000) -> bool:
+    """
+    比较两种方式生成 samples 个敌人的耗时。
+
+    参数:
+        samples (int): 生成的敌人数量
+
+    返回:
+        bool: 原型克隆是否更快
+    """
+    import gc
+    from enemies import DEFAULT_SPAWN_TABLE, ENEMY_DATA, EnemyPool, create_enemy_group
+
+    plan = clone_plan(samples)
+    with quiet_debug():
+        legacy_time = best_time(lambda: [legacy_clone(p, v) for p, v in plan], repeat=3)
+        clone_time = best_time(lambda: [p.clone(v) for p, v in plan], repeat=3)
+        plain_time = best_time(lambda: [p.clone("none") for p, _ in plan], repeat=3)
+        fresh = EnemyPool(ENEMY_DATA, max_free=0)
+        gc.disable()
+        try:
+            groups, group_time = timed(lambda: [create_enemy_group(level, DEFAULT_SPAWN_TABLE, fresh)
+                                                for level in range(1, 11) for _ in range(samples // 20)])
+        finally:
+            gc.enable()
+    console.print(f"{samples} 个敌人")
+    faster = compare("每个敌人", "改造前", legacy_time / samples, "原型克隆", clone_time / samples, unit="µs")
+    spawned = sum(len(group) for group in groups)
+    console.print(f"其中不含变体的克隆 {plain_time / samples * 1e6:.1f}µs; "
+                  f"create_enemy_group: {spawned} 个敌人, 平均 {group_time / max(spawned, 1) * 1e6:.1f}µs/个")
+    return faster
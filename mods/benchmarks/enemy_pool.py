@@ -0,0 +1,85 @@
+"""
+敌人对象池的基准测试：连续进行随机遭遇战，比较使用对象池与每场战斗都克隆新敌人时
+新建的敌人数量、垃圾回收次数和耗时。
+
+两种方式战斗结果相同的检查见 tests/test_enemy_pool.py。
+"""
+
+import time
+
+from mods.benchmarks.common import console
+
+
+def encounters(pool, samples: int, seed: int, checkpoints=()):
+    """
+    用 pool 生成敌人进行 samples 场随机遭遇战，每场战斗后把敌人交回对象池。
+
+    参数:
+        pool (EnemyPool): 对象池，max_free=0 时相当于每场都克隆新敌人
+        samples (int): 战斗场数
+        seed (int): 随机种子
+        checkpoints: 记录已新建敌人数量的场次
+
+    返回:
+        tuple: (每场的结果, 各记录场次已新建的敌人数量, 垃圾回收次数, 耗时)
+    """
+    import gc
+    import combat
+    from core import rng
+    from enemies import DEFAULT_SPAWN_TABLE, create_enemy_group
+    from mods.benchmarks.enemy_clone import quiet_debug
+    from simulate import PlayerBuild, build_player, null_output
+
+    build = PlayerBuild()
+    outcomes, created = [], []
+    collections = [0]
+
+    def count(phase, info):
+        if phase == "start":
+            collections[0] += 1
+
+    gc.collect()
+    gc.callbacks.append(count)
+    start = time.perf_counter()
+    try:
+        with quiet_debug(), rng.session(seed), null_output():
+            for fight in range(1, samples + 1):
+                level = fight % 18 + 1
+                player = build_player(build, level)
+                group = create_enemy_group(level, DEFAULT_SPAWN_TABLE, pool=pool)
+                result = combat.headless_combat(player, group)
+                outcomes.append((result.winner, result.rounds, result.player_hp, [e.name for e in group]))
+                pool.release(group)
+                if fight in checkpoints:
+                    created.append(pool.misses)
+    finally:
+        gc.callbacks.remove(count)
+    return outcomes, created, collections[0], time.perf_counter() - start
+
+
+def run(samples: int = 400, seed: int = 0) -> bool:
+    """
+    比较两种方式进行 samples 场战斗的分配情况。
+
+    参数:
+        samples (int): 战斗场数
+        seed (int): 随机种子
+
+    返回:
+        bool: 使用对象池时后半程新建的敌人是否不到每场克隆的十分之一（分配保持平稳）
+    """
+    from enemies import ENEMY_DATA, EnemyPool
+
+    checkpoints = (samples // 4, samples // 2, samples)
+    pooled = EnemyPool(ENEMY_DATA)
+    _, pooled_created, pooled_gc, pooled_time = encounters(pooled, samples, seed, checkpoints)
+    _, fresh_created, fresh_gc, fresh_time = encounters(EnemyPool(ENEMY_DATA, max_free=0), samples, seed, checkpoints)
+
+    flat = (pooled_created[-1] - pooled_created[-2]) * 10 < fresh_created[-1] - fresh_created[-2]
+    marks = " / ".join(str(n) for n in checkpoints)
+    console.print(f"新建敌人 (第 {marks} 场): 每场克隆 {fresh_created}, 对象池 {pooled_created}",
+                  style="green" if flat else "bold red")
+    console.print(f"垃圾回收: 每场克隆 {fresh_gc} 次, 对象池 {pooled_gc} 次")
+    console.print(f"耗时: 每场克隆 {fresh_time:.2f}s, 对象池 {pooled_time:.2f}s")
+    console.print(f"对象池: {pooled.stats()}")
+    return flat
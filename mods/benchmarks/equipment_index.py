@@ -0,0 +1,73 @@
+"""
+装备索引的基准测试：比较逐件筛选（filter 链）与倒排索引查询大型装备目录的耗时。
+
+两种方式结果相同的检查见 tests/test_equipment_index.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console, timed
+
+# 各商店的筛选条件以及若干组合条件
+QUERIES = [
+    dict(level=2, object_type="weapon", tags=["weapon"]),
+    dict(level=2, tags=["armor", "shield", "head", "hand", "foot", "accessory"]),
+    dict(level=3, object_type="weapon", tags=["weapon"]),
+    dict(level=2, object_type="armor", tags=["armor"]),
+    dict(level=3, tags=["bronze"]),
+    dict(level=2),
+    dict(object_type="armor"),
+    dict(tags=["shield", "bronze"], match_all_tags=True),
+    dict(level=5, tags=["weapon", "missing_tag"], match_all_tags=True),
+]
+
+
+def generated_catalog(samples: int, seed: int) -> list:
+    """把 equipment_data 中的装备复制到 samples 件并随机分配 1~10 级。"""
+    import random
+    from data.items_data import equipment_data
+    from others.equipment import Equipment
+
+    generator = random.Random(seed)
+    templates = list(equipment_data.values())
+    catalog_items = []
+    for i in range(samples):
+        t = templates[i % len(templates)]
+        catalog_items.append(Equipment(
+            t.base_name, t.description, 1, t.base_value, t.object_type, t.base_stats, t.combo, t.spell,
+            generator.randint(1, 10), t.tags, t.image_path, quality_data=(t.quality, t.price_mult, t.stat_mult),
+        ))
+    return catalog_items
+
+
+def scan(catalog_items, level=None, object_type=None, tags=None, match_all_tags=False) -> list:
+    """改造前的 filter_equipment_by：逐件筛选。"""
+    result = catalog_items
+    if level is not None:
+        result = filter(lambda eq: eq.level == level, result)
+    if object_type:
+        result = filter(lambda eq: eq.object_type == object_type, result)
+    if tags:
+        if match_all_tags:
+            result = filter(lambda eq: all(tag in eq.tags for tag in tags), result)
+        else:
+            result = filter(lambda eq: any(tag in eq.tags for tag in tags), result)
+    return list(result)
+
+
+def run(samples: int = 20_000, seed: int = 0) -> bool:
+    """
+    比较逐件筛选与索引查询依次执行 QUERIES 的耗时。
+
+    参数:
+        samples (int): 目录中的装备数量
+        seed (int): 分配等级的随机种子
+
+    返回:
+        bool: 索引查询是否更快
+    """
+    from others.catalog import EquipmentCatalog
+
+    catalog_items = generated_catalog(samples, seed)
+    catalog, build_time = timed(EquipmentCatalog, catalog_items)
+    console.print(f"{samples} 件装备, {len(QUERIES)} 个查询, 建立索引 {build_time * 1000:.1f}ms")
+    return compare("耗时", "逐件筛选", best_time(lambda: [scan(catalog_items, **query) for query in QUERIES], repeat=3),
+                   "索引查询", best_time(lambda: [catalog.query(**query) for query in QUERIES], repeat=3))
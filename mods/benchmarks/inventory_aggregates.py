@@ -0,0 +1,52 @@
+"""
+背包合计值的基准测试：比较读取累计的总数量、总价值和分组与逐项重新计算的耗时
+（相当于每次刷新背包界面、战斗中查找消耗品）。
+
+累计值和分组始终与重新计算的结果一致的检查见 tests/test_inventory_aggregates.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console
+
+TYPES = ["consumable", "food", "material"]
+
+
+def mixed_items(samples: int, rnd) -> list:
+    """生成 samples 种物品，每4种中有1种装备，其余轮流属于 TYPES 中的类型。"""
+    from others.equipment import Equipment
+    from others.item import Item
+    return [
+        Equipment(f"测试装备{i}", "", 1, rnd.randint(1, 100), "weapon", {"atk": 1}, quality_data=("", 1.0, 1.0))
+        if i % 4 == 0 else Item(f"测试物品{i}", "", 1, rnd.randint(1, 100), TYPES[i % 3])
+        for i in range(samples)
+    ]
+
+
+def run(samples: int = 10_000, seed: int = 0) -> bool:
+    """
+    比较 samples 种物品的背包每次读取总价值、总数量和消耗品的耗时。
+
+    参数:
+        samples (int): 物品种类数
+        seed (int): 随机种子
+
+    返回:
+        bool: 读取累计值是否更快
+    """
+    import random
+    from bag import Inventory
+
+    rnd = random.Random(seed)
+    inventory = Inventory()
+    for item in mixed_items(samples, rnd):
+        inventory.add_item(item, rnd.randint(1, 5))
+
+    def scan():
+        listed = inventory.items
+        return (sum(item.amount * item.individual_value for item in listed), sum(item.amount for item in listed),
+                [item for item in listed if item.object_type == "consumable"])
+
+    def read():
+        return inventory.total_worth, inventory.get_total_item_count(), inventory.get_items_by_type("consumable")
+
+    console.print(f"{len(inventory.items)} 堆物品")
+    return compare("每次读取", "逐项计算", best_time(scan), "累计值", best_time(read))
@@ -0,0 +1,81 @@
+"""
+背包索引的基准测试：比较索引改造前后的背包在大量不同物品时添加、计数和移除的耗时。
+
+改造前的背包由 LegacyInventory 复现，两种背包结果相同的检查见 tests/test_inventory_index.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console
+
+
+class LegacyInventory:
+    """索引改造前的背包：物品保存在列表中，每次按名称查找都逐个比较。"""
+    def __init__(self):
+        self.items = []
+
+    def add_item(self, item, amount):
+        for existing in self.items:
+            if existing.name == item.name:
+                existing.amount += amount
+                return
+        self.items.append(item.clone(amount))
+
+    def count_item_by_name(self, name):
+        for item in self.items:
+            if item.name == name:
+                return item.amount
+        return 0
+
+    def remove_items_by_name(self, name, amount):
+        for item in self.items:
+            if item.name == name:
+                if item.amount >= amount:
+                    item.amount -= amount
+                    if item.amount == 0:
+                        self.items.remove(item)
+                    return True
+        return False
+
+
+def hoarder_session(samples: int, seed: int):
+    """
+    生成一次大背包的操作序列：依次添加 samples 种物品，再随机补充、计数和移除（模拟战利品入包和任务交付）。
+
+    返回:
+        function: 在给定背包上执行这些操作的函数，返回 (计数结果, 移除结果, 最终的 (名称, 数量) 列表)
+    """
+    import random
+    from others.item import Item
+
+    rnd = random.Random(seed)
+    items = [Item(f"测试物品{i}", "", 1, rnd.randint(1, 100), "material") for i in range(samples)]
+    loot = [(rnd.choice(items), rnd.randint(1, 3)) for _ in range(samples)]
+    turn_ins = [(rnd.choice(items).name, rnd.randint(1, 3)) for _ in range(samples)]
+
+    def session(inventory):
+        for item in items:
+            inventory.add_item(item, 1)
+        for item, amount in loot:
+            inventory.add_item(item, amount)
+        counts = [inventory.count_item_by_name(name) for name, _ in turn_ins]
+        removed = [inventory.remove_items_by_name(name, amount) for name, amount in turn_ins]
+        return counts, removed, [(item.name, item.amount) for item in inventory.items]
+    return session
+
+
+def run(samples: int = 2_000, seed: int = 0) -> bool:
+    """
+    比较两种背包执行同一组操作的耗时。
+
+    参数:
+        samples (int): 物品种类数
+        seed (int): 随机种子
+
+    返回:
+        bool: 名称索引是否更快
+    """
+    from bag import Inventory
+
+    session = hoarder_session(samples, seed)
+    console.print(f"{samples} 种物品")
+    return compare("耗时", "逐个查找", best_time(lambda: session(LegacyInventory()), repeat=3),
+                   "名称索引", best_time(lambda: session(Inventory()), repeat=3))
@@ -0,0 +1,78 @@
+"""
+背包分页的基准测试：比较打开刚好一页和大量物品的背包（生成并输出表格）的耗时，
+以及分页前输出全部物品的耗时。
+
+分页内容正确、物品改变后缓存的行随之更新的检查见 tests/test_inventory_paging.py。
+"""
+
+import io
+
+from rich.console import Console
+
+from mods.benchmarks.common import best_time, console
+
+
+def full_inventory_panel(inventory):
+    """分页前的背包表格：每次都为全部物品生成一行。"""
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style="bold white", box=box.SIMPLE_HEAVY)
+    for column in ("编号", "名称", "类型", "数量", "单价"):
+        table.add_column(column)
+    for i, item in enumerate(inventory.items, 1):
+        table.add_row(str(i), item.name, str(item.object_type), f"x{item.amount}", f"{item.individual_value}G")
+    return Panel.fit(table, subtitle="['0' 关闭背包]", border_style="bold green")
+
+
+def material_items(samples: int, seed: int) -> list:
+    """生成 samples 种数量和单价随机的材料。"""
+    import random
+    from others.item import Item
+    rnd = random.Random(seed)
+    return [Item(f"测试物品{i}", "", rnd.randint(1, 5), rnd.randint(1, 100), "material") for i in range(samples)]
+
+
+def filled(cls, items):
+    inventory = cls()
+    for item in items:
+        inventory.add_item(item)
+    return inventory
+
+
+def open_bag(inventory):
+    """打开背包：生成第一页的表格并输出到内存中的控制台。"""
+    out = Console(file=io.StringIO(), width=100)
+    panel, summary = inventory.get_formatted_inventory_table()
+    out.print(panel)
+    out.print(summary)
+
+
+def run(samples: int = 10_000, seed: int = 0) -> bool:
+    """
+    对 Inventory 和 CompactInventory 比较打开一页和 samples 件物品的背包的耗时。
+
+    参数:
+        samples (int): 大背包的物品种类数
+        seed (int): 随机种子
+
+    返回:
+        bool: 两种库存打开大背包的耗时是否都不超过打开一页背包的2倍，且都比分页前快
+    """
+    from bag import CompactInventory, Inventory
+    from bag.inventory import PAGE_SIZE
+
+    items = material_items(samples, seed)
+    legacy = filled(Inventory, items)
+    legacy_time = best_time(lambda: Console(file=io.StringIO(), width=100).print(full_inventory_panel(legacy)), repeat=1)
+    console.print(f"分页前打开 {samples} 件背包 {legacy_time * 1000:.2f}ms")
+    ok = True
+    for cls in (Inventory, CompactInventory):
+        small, large = filled(cls, items[:PAGE_SIZE]), filled(cls, items)
+        small_time, large_time = best_time(lambda: open_bag(small), repeat=20), best_time(lambda: open_bag(large), repeat=20)
+        flat = large_time < small_time * 2 and large_time < legacy_time
+        console.print(f"{cls.__name__}: 打开 {PAGE_SIZE} 件背包 {small_time * 1000:.2f}ms, "
+                      f"{samples} 件背包 {large_time * 1000:.2f}ms", style="green" if flat else "bold red")
+        ok = ok and flat
+    return ok
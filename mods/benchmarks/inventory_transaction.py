@@ -0,0 +1,50 @@
+"""
+库存事务的基准测试：比较大批量战利品逐件入包与一次事务入包的耗时。
+
+事务结果与逐件入包相同、失败的事务不留下任何改变的检查见 tests/test_inventory_transaction.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console
+
+
+def loot_drops(samples: int, seed: int) -> list:
+    """生成 samples 件掉落，名称在 samples // 10 种材料中重复。"""
+    import random
+    from others.item import Item
+    rnd = random.Random(seed)
+    kinds = [Item(f"测试材料{i}", "", 1, rnd.randint(1, 50), "material") for i in range(samples // 10)]
+    return [rnd.choice(kinds).clone(rnd.randint(1, 3)) for _ in range(samples)]
+
+
+def one_by_one(drops):
+    from bag import Inventory
+    inventory = Inventory()
+    for item in drops:
+        inventory.add_item(item)
+    return inventory
+
+
+def batched(drops):
+    from bag import Inventory
+    inventory = Inventory()
+    with inventory.transaction() as loot:
+        for item in drops:
+            loot.add(item)
+    return inventory
+
+
+def run(samples: int = 20_000, seed: int = 0) -> bool:
+    """
+    比较两种方式把 samples 件掉落放入空背包的耗时。
+
+    参数:
+        samples (int): 掉落物品件数
+        seed (int): 随机种子
+
+    返回:
+        bool: 一次事务是否更快
+    """
+    drops = loot_drops(samples, seed)
+    console.print(f"{samples} 件掉落")
+    return compare("耗时", "逐件入包", best_time(lambda: one_by_one(drops), repeat=3),
+                   "一次事务", best_time(lambda: batched(drops), repeat=3))
@@ -0,0 +1,78 @@
+"""
+物品享元的基准测试：比较享元改造前后大量装备（模拟商店补货：克隆后重新随机品质）占用的内存和耗时。
+
+改造前的布局由 LegacyEquipment 复现，两种布局属性相同的检查见 tests/test_item_memory.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console, traced_memory
+
+
+class LegacyEquipment:
+    """享元改造前的装备实例布局：每个实例在 __dict__ 中保存全部属性，克隆时复制字典和列表。"""
+    def __init__(self, template, quality_data):
+        self.description = template.description
+        self.amount = 1
+        self.object_type = template.object_type
+        self.base_name = template.base_name
+        self.base_stats = dict(template.base_stats)
+        self.base_value = template.base_value
+        self.stat_change_list = self.base_stats.copy()
+        self.combo = template.combo
+        self.spell = template.spell
+        self.level = template.level
+        self.tags = list(template.tags)
+        self.quality, self.price_mult, self.stat_mult = quality_data
+        for key, val in self.base_stats.items():
+            self.stat_change_list[key] = int(val * self.stat_mult)
+        self.name = f"{self.quality}{self.base_name}"
+        self.individual_value = int(self.base_value * self.price_mult)
+        self.image_path = template.image_path
+
+
+def restock_plan(samples: int, seed: int) -> list:
+    """随机选择 samples 个 (模板, 品质数据)，并预先生成各品质的共享数据，只统计实例本身。"""
+    import random
+    from data.items_data import equipment_data
+    from others.equipment import Equipment
+
+    generator = random.Random(seed)
+    templates = list(equipment_data.values())
+    plan = [(generator.choice(templates), generator.choice(Equipment.QUALITY_CONFIG)[:3]) for _ in range(samples)]
+    for template, quality_data in plan:
+        template.clone(1).set_quality(quality_data)
+    return plan
+
+
+def flyweight_restock(plan) -> list:
+    """改造后的补货：克隆模板后设置品质。"""
+    items = []
+    for template, quality_data in plan:
+        item = template.clone(1)
+        item.set_quality(quality_data)
+        items.append(item)
+    return items
+
+
+def run(samples: int = 100_000, seed: int = 0) -> bool:
+    """
+    比较两种布局生成 samples 件装备的内存和耗时。
+
+    参数:
+        samples (int): 装备数量
+        seed (int): 选择模板和品质的随机种子
+
+    返回:
+        bool: 享元布局占用的内存是否更少
+    """
+    plan = restock_plan(samples, seed)
+
+    def legacy_restock():
+        return [LegacyEquipment(t, q) for t, q in plan]
+
+    _, legacy_memory = traced_memory(legacy_restock)
+    _, memory = traced_memory(lambda: flyweight_restock(plan))
+    console.print(f"{samples} 件装备")
+    smaller = compare("每件的内存", "改造前", legacy_memory / samples, "享元", memory / samples, unit="B")
+    compare("耗时", "改造前", best_time(legacy_restock, repeat=3), "享元", best_time(lambda: flyweight_restock(plan), repeat=3),
+            required=False)
+    return smaller
@@ -0,0 +1,60 @@
+"""
+刷怪表的基准测试：比较改造前（每次遭遇筛选敌人、排序数量规则并用 random.choice 抽取）
+与预先计算的刷怪表生成敌人ID的耗时。
+
+两种方式结果相同、带权重抽样频率相符的检查见 tests/test_spawn_table.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console, timed
+
+
+def encounter_levels(samples: int) -> list:
+    return [level % 18 + 1 for level in range(samples)]
+
+
+def legacy_encounters(levels, rnd) -> list:
+    """改造前的 create_enemy_group 选择敌人ID的过程。"""
+    from data import ENEMY_QUANTITY_FOR_LEVEL, POSSIBLE_ENEMIES
+    result = []
+    for level in levels:
+        valid_enemy_ids = [
+            enemy_id for enemy_id, (low, high) in POSSIBLE_ENEMIES.items()
+            if low <= level <= high
+        ]
+        max_enemies = next(
+            (ENEMY_QUANTITY_FOR_LEVEL[max_level] for max_level in sorted(ENEMY_QUANTITY_FOR_LEVEL) if level < max_level),
+            1
+        )
+        result.append([rnd.choice(valid_enemy_ids) for _ in range(rnd.randint(1, max_enemies))])
+    return result
+
+
+def table_encounters(table, levels, rnd) -> list:
+    """用刷怪表选择敌人ID。"""
+    result = []
+    for level in levels:
+        band = table.band(level)
+        result.append([band.sample(rnd) for _ in range(band.roll_count(rnd))])
+    return result
+
+
+def run(samples: int = 200_000, seed: int = 0) -> bool:
+    """
+    比较两种方式进行 samples 次遭遇的耗时。
+
+    参数:
+        samples (int): 遭遇次数
+        seed (int): 随机种子
+
+    返回:
+        bool: 刷怪表是否更快
+    """
+    import random
+    from core.spawn_table import SpawnTable
+    from data import ENEMY_QUANTITY_FOR_LEVEL, POSSIBLE_ENEMIES
+
+    levels = encounter_levels(samples)
+    table, build_time = timed(SpawnTable, POSSIBLE_ENEMIES, ENEMY_QUANTITY_FOR_LEVEL)
+    console.print(f"{samples} 次遭遇, 建表 {build_time * 1e6:.0f}µs")
+    return compare("每次遭遇", "改造前", best_time(lambda: legacy_encounters(levels, random.Random(seed)), repeat=3) / samples,
+                   "刷怪表", best_time(lambda: table_encounters(table, levels, random.Random(seed)), repeat=3) / samples, unit="µs")
@@ -0,0 +1,97 @@
+"""
+属性表的基准测试：比较敌人属性存储在改造前（字典）与改造后（StatBlock）的内存占用、复制耗时和导出 NumPy 矩阵的耗时。
+
+改造前每个敌人克隆时复制一份原始属性字典，再由它创建字典实现的属性表（最终属性和基础值各一个字典），
+由 DictStatSheet 复现；改造后 Enemy.clone 只创建一个与原型共用存储的 StatSheet，
+原始属性直接与原型共用，第一次写入（受到伤害）时才复制 array。内存和每个敌人的复制耗时都计入这次写入。
+
+属性值和导出矩阵一致的检查见 tests/test_stat_block.py。
+"""
+
+from mods.benchmarks.common import best_time, compare, console, timed, traced_memory
+
+
+class DictStatSheet(dict):
+    """改造前以字典保存的属性表，只保留复制和写入用到的部分。"""
+    def __init__(self, base) -> None:
+        super().__init__(base)
+        self._base = dict(self)
+        self._sources = {}
+        self._dirty = set()
+        self._batch_depth = 0
+
+    def __setitem__(self, stat: str, value) -> None:
+        if stat in self._dirty:
+            bonus = sum(mods.get(stat, 0) for mods in self._sources.values())
+        else:
+            bonus = dict.get(self, stat, 0) - self._base.get(stat, 0)
+        self._base[stat] = value - bonus
+        dict.__setitem__(self, stat, value)
+
+
+def enemy_stats(samples: int) -> list:
+    """依次取各敌人原型的原始属性，共 samples 个。"""
+    from enemies import ENEMY_DATA
+    prototypes = [enemy.original_stats for enemy in ENEMY_DATA.values() if "hp" in enemy.original_stats]
+    return [prototypes[i % len(prototypes)] for i in range(samples)]
+
+
+def legacy_clones(plan) -> list:
+    """改造前的克隆：复制原始属性字典并创建字典属性表，然后受到一次伤害。"""
+    enemies = []
+    for stats in plan:
+        original = dict(stats)
+        sheet = DictStatSheet(original)
+        sheet["hp"] -= 1
+        enemies.append((sheet, original))
+    return enemies
+
+
+def block_clones(plan) -> list:
+    """改造后的克隆：创建共用存储的 StatSheet，然后受到一次伤害。"""
+    from core.stats import StatSheet
+    enemies = []
+    for stats in plan:
+        sheet = StatSheet(stats, True)      # 与 Enemy.clone 相同，即 share=True
+        sheet["hp"] -= 1        # 第一次受到伤害时复制 array
+        enemies.append(sheet)
+    return enemies
+
+
+def run(samples: int = 20_000) -> bool:
+    """
+    比较 samples 个敌人在两种属性存储下的内存、复制耗时和导出矩阵的耗时。
+
+    另外列出单个属性表的复制耗时: dict(stats)、StatBlock(block)（复制 array）
+    和 StatBlock(block, share=True)（写时复制）。单个 StatBlock 的复制要创建 Python 对象，
+    比 C 实现的 dict 复制慢，因此只作参考；省下的是每个敌人不再需要的字典和属性表初始化。
+
+    参数:
+        samples (int): 复制的敌人属性数量
+
+    返回:
+        bool: StatBlock 的内存、每个敌人的复制耗时和导出耗时是否都优于字典
+    """
+    import numpy as np
+    from core.damage_kernel import STAT_COLUMNS
+    from core.stats import StatBlock, stat_matrix
+
+    plan = enemy_stats(samples)
+    legacy_plan = [dict(stats) for stats in plan]
+    _, legacy_memory = traced_memory(lambda: legacy_clones(legacy_plan))
+    sheets, memory = traced_memory(lambda: block_clones(plan))
+    console.print(f"{samples} 个敌人")
+    smaller = compare("每个敌人的内存", "字典", legacy_memory / samples, "StatBlock", memory / samples, unit="B")
+    faster = compare("每个敌人的复制", "字典", best_time(lambda: legacy_clones(legacy_plan)) / samples,
+                     "StatBlock", best_time(lambda: block_clones(plan)) / samples, unit="µs")
+
+    dict_time = best_time(lambda: [dict(stats) for stats in legacy_plan])
+    copy_time = best_time(lambda: [StatBlock(stats) for stats in plan])
+    share_time = best_time(lambda: [StatBlock(stats, True) for stats in plan])
+    console.print(f"单个属性表的复制（参考）: dict {dict_time / samples * 1e9:.0f}ns, "
+                  f"StatBlock {copy_time / samples * 1e9:.0f}ns, share=True {share_time / samples * 1e9:.0f}ns")
+
+    _, scan_time = timed(lambda: np.array([[sheet.get(col, 0) for col in STAT_COLUMNS] for sheet in sheets], dtype=np.float64))
+    _, export_time = timed(lambda: stat_matrix(sheets, STAT_COLUMNS).astype(np.float64))
+    exported = compare("导出矩阵", "逐项读取", scan_time, "stat_matrix", export_time)
+    return smaller and faster and exported
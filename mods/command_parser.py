@@ -7,18 +7,18 @@
 
 from data import DEBUG
 
-from rich.console import Console
-
 import events
 import mods.debug_help
+from ui import get_console
 from ui import text
 from core import shops
 from mods import dev_tools as debug
 from bag import InventoryInterface as interface
 from enemies import ENEMY_DATA
 from ui import clear_screen, enter_clear_screen, screen_wrapped
+from ui import fx
 
-console = Console()
+console = get_console()
 
 SHOP_DICT = {
     # "jack": events.shop_jack_weapon,
@@ -131,6 +131,7 @@ def handle_p_command(tokens, player):
         "-mana": screen_wrapped(lambda: player.recover_mp(9999) if DEBUG else None),
         "-level": screen_wrapped(lambda: handle_level_command(tokens, player)),
         "-auto": screen_wrapped(lambda: player.change_auto_mode() if DEBUG else None),
+        "-pace": screen_wrapped(lambda: handle_pace_command(tokens)),
     }
 
     if len(tokens) == 1 or tokens[1] == "--help":
@@ -162,7 +163,7 @@ def handle_pi_command(tokens, player):
         "-C": screen_wrapped(lambda: interface(inv).compare_equipment()),
         "-ua": screen_wrapped(lambda: player.unequip_all()),
         "-vi": screen_wrapped(lambda: print(interface(inv).view_item().get_detailed_info())),
-        "-show": screen_wrapped(lambda: inv.show_inventory_item()),
+        "-show": screen_wrapped(lambda: inv.show_inventory_item(int(tokens[2]) - 1 if len(tokens) > 2 and tokens[2].isdigit() else 0)),
         "--help": lambda: show_help("p.i"),
         "--give-all": lambda: (debug.handle_debug_command("give-all", inv), enter_clear_screen()),
         "-spawn": screen_wrapped(lambda: handle_spawn_item_command(tokens, player)),
@@ -202,6 +203,23 @@ def handle_level_command(tokens, player):
             for _ in range(target_level - current_level):
                 player.add_exp(player.ls.xp_to_next_level)
 
+def handle_pace_command(tokens):
+    """
+    处理节奏配置命令。
+
+    不带参数时显示当前配置和可选配置，带参数时切换到指定配置。
+
+    参数:
+        tokens: 命令分割后的标记列表
+    """
+    if len(tokens) < 3:
+        print(f"当前节奏: {fx.current_profile().name}，可选: {', '.join(fx.PROFILES)}")
+        return
+    try:
+        print(f"节奏已切换为: {fx.set_profile(tokens[2]).name}")
+    except ValueError as e:
+        print(e)
+
 def handle_spawn_item_command(tokens, player):
     """
     处理生成物品命令。
@@ -9,6 +9,7 @@ p 玩家相关命令:
   -se       查看玩家装备(show_equipment_info)
   -sk       查看玩家技能(show_skills)
   -stats    显示玩家详细数据(debug_show_stats)
+  -pace x   切换界面节奏 instant/fast/cinematic，回车可跳过停顿
   -heal     恢复全部生命值(fully_heal)[debug]
   -mana     恢复全部魔法值(fully_recover_mp)[debug]
   -bag      查看背包[debug]
@@ -23,7 +24,7 @@ p.i 玩家背包相关命令:
   -C            比较装备(compare_equipment)
   -ua           卸下全部装备(unequip_all)
   -vi           查看物品详情(view_item_detail)
-  -show         查看背包物品(show_inventory_item)
+  -show         查看背包物品(show_inventory_item) (用法: p.i -show [页码])
   -sort         整理背包物品
   -count        统计背包物品数量
   --give-all    全物品[debug]
@@ -10,9 +10,10 @@ from data import DEBUG
 import os
 import inspect
 from datetime import datetime
-from rich.console import Console
 
-console = Console()
+from ui import get_console
+
+console = get_console()
 
 def debug_print(*args, **kwargs):
     """
@@ -82,28 +83,25 @@ def spawn_all_items(inventory_instance):
     """
     在指定背包中生成所有类型的物品。
 
-    向背包中添加游戏中所有类型的物品，包括所有装备、药水、宝石和魔法书。
+    在一个库存事务中向背包添加游戏中所有类型的物品，包括所有装备、药水、宝石和魔法书。
     主要用于测试或快速填充玩家背包以进行游戏测试。
 
     参数:
         inventory_instance: 要添加物品的背包实例
     """
     from data import equipment_data, jewel_data, hp_potion, mp_potion, grimoires
-    for eq in equipment_data.values():
-        inventory_instance.add_item(eq.clone(amount=1))
+    with inventory_instance.transaction() as tx:
+        for eq in equipment_data.values():
+            tx.add(eq, 1)
+        for p in [hp_potion, mp_potion]:
+            tx.add(p, 3)
+        for j in jewel_data.values():
+            tx.add(j, 2)
+        for g in grimoires:
+            tx.add(g, 1)
     debug_print(f"已刷入 {len(equipment_data)} 件装备")
-
-    potions = [hp_potion, mp_potion]
-    for p in potions:
-        inventory_instance.add_item(p.clone(amount=3))
     debug_print("已刷入全部药水")
-
-    for j in jewel_data.values():
-        inventory_instance.add_item(j.clone(amount=2))
     debug_print("已刷入全部宝石")
-
-    for g in grimoires:
-        inventory_instance.add_item(g.clone(amount=1))
     debug_print(f"已刷入 {len(grimoires)} 本魔法书")
 
 def handle_debug_command(command, inventory_instance):
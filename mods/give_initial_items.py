@@ -6,15 +6,15 @@
 确保游戏开始时角色具有合适的基础能力。
 """
 
-import random
 import sys
 sys.path.append("..")
-from rich.console import Console
 
+from ui import get_console
 from ui import enter_clear_screen
+from core import rng
 from data import equipment_data, jewel_data, hp_potion, mp_potion, grimoires, basic_equipments
 
-console = Console()
+console = get_console()
 
 def give_initial_items(my_player):
     """
@@ -48,29 +48,29 @@ def give_initial_items(my_player):
     if option == "1":
         default_selection_warrior(my_player)
     elif option == "2":
-        basic_equipments[random.choice(["training_dagger", "broken_dagger"])].add_to_inventory_player(my_player.inventory)
+        basic_equipments[rng.stream("start").choice(["training_dagger", "broken_dagger"])].add_to_inventory_player(my_player.inventory)
         basic_equipments["padded_vest"].add_to_inventory_player(my_player.inventory)
         jewel_data["agi_gems"].add_to_inventory_player(my_player.inventory)
         my_player.add_money(50)
         my_player.ls.class_name = "盗贼"
     elif option == "3":
         equipment_data["fire_staff"].add_to_inventory_player(my_player.inventory)
-        basic_equipments[random.choice(["old_robes", "padded_vest"])].add_to_inventory_player(my_player.inventory)
+        basic_equipments[rng.stream("start").choice(["old_robes", "padded_vest"])].add_to_inventory_player(my_player.inventory)
         my_player.ls.class_name = "法师"
     elif option == "4":
-        basic_equipments[random.choice(["wood_bow", "self_bow"])].add_to_inventory_player(my_player.inventory)
+        basic_equipments[rng.stream("start").choice(["wood_bow", "self_bow"])].add_to_inventory_player(my_player.inventory)
         equipment_data["leather_armor"].add_to_inventory_player(my_player.inventory)
         jewel_data["crit_gems"].add_to_inventory_player(my_player.inventory)
         my_player.ls.class_name = "弓箭手"
     elif option == "5":
-        equipment_data[random.choice(["rusty_sword", "long_sword"])].add_to_inventory_player(my_player.inventory)
-        basic_equipments[random.choice(["novice_armor", "padded_vest"])].add_to_inventory_player(my_player.inventory)
+        equipment_data[rng.stream("start").choice(["rusty_sword", "long_sword"])].add_to_inventory_player(my_player.inventory)
+        basic_equipments[rng.stream("start").choice(["novice_armor", "padded_vest"])].add_to_inventory_player(my_player.inventory)
         equipment_data["wooden_shield"].add_to_inventory_player(my_player.inventory)
         grimoires[1].add_to_inventory_player(my_player.inventory)
         my_player.ls.class_name = "圣骑士"
     elif option == "6":
-        basic_equipments[random.choice(["old_staff", "beginner_wand"])].add_to_inventory_player(my_player.inventory)
-        basic_equipments[random.choice(["old_robes", "padded_vest"])].add_to_inventory_player(my_player.inventory)
+        basic_equipments[rng.stream("start").choice(["old_staff", "beginner_wand"])].add_to_inventory_player(my_player.inventory)
+        basic_equipments[rng.stream("start").choice(["old_robes", "padded_vest"])].add_to_inventory_player(my_player.inventory)
         grimoires[4].add_to_inventory_player(my_player.inventory)
         my_player.ls.class_name = "死灵法师"
     else:
@@ -105,8 +105,8 @@ def apply_class_bonuses(my_player):
 
     if my_player.ls.class_name in class_bonuses:
         bonuses = class_bonuses[my_player.ls.class_name]
+        my_player.stats.set_source("class_bonus", bonuses)
         for stat, value in bonuses.items():
-            my_player.stats[stat] += value
             if value > 0:
                 console.print(f"[cyan]{stat} +{value}[/cyan]")
             else:
@@ -130,7 +130,7 @@ def default_selection_warrior(my_player):
         - 向玩家库存添加攻击宝石
         - 设置玩家职业为战士
     """
-    basic_equipments[random.choice(["rusty_sword", "wooden_club"])].add_to_inventory_player(my_player.inventory)
-    basic_equipments[random.choice(["novice_armor", "padded_vest"])].add_to_inventory_player(my_player.inventory)
+    basic_equipments[rng.stream("start").choice(["rusty_sword", "wooden_club"])].add_to_inventory_player(my_player.inventory)
+    basic_equipments[rng.stream("start").choice(["novice_armor", "padded_vest"])].add_to_inventory_player(my_player.inventory)
     jewel_data["atk_gems"].add_to_inventory_player(my_player.inventory)
     my_player.ls.class_name = "战士"
@@ -0,0 +1,103 @@
+"""
+输入记录模块，用于录制和回放玩家的键盘输入。
+
+游戏中的所有玩家输入都经由内置的 input 函数读取，本模块通过替换 builtins.input
+把每一行输入写入日志文件，或从日志文件中依次读出输入。日志的第一行记录会话种子，
+配合 core.rng 的随机流，相同的种子和输入日志可以逐位复现一整局游戏。
+
+日志格式:
+    # seed <会话种子>
+    <第1行输入>
+    <第2行输入>
+    ...
+"""
+
+import builtins
+from typing import Optional, TextIO
+
+SEED_HEADER = "# seed "
+
+
+def read_seed(path: str) -> Optional[int]:
+    """
+    读取输入日志中记录的会话种子。
+
+    参数:
+        path (str): 日志文件路径
+
+    返回:
+        int | None: 会话种子，日志没有种子记录时返回None
+    """
+    with open(path, encoding="utf-8") as f:
+        first = f.readline().rstrip("\n")
+    return int(first[len(SEED_HEADER):]) if first.startswith(SEED_HEADER) else None
+
+
+class InputRecorder:
+    """
+    输入录制器，把每一行玩家输入追加写入日志文件。
+
+    属性:
+        file (TextIO): 日志文件
+    """
+    def __init__(self, path: str, seed: int) -> None:
+        self.file: TextIO = open(path, "w", encoding="utf-8")
+        self.file.write(f"{SEED_HEADER}{seed}\n")
+        self.file.flush()
+        self._input = builtins.input
+
+    def __call__(self, prompt: str = "") -> str:
+        line = self._input(prompt)
+        self.file.write(line + "\n")
+        self.file.flush()
+        return line
+
+    def install(self) -> "InputRecorder":
+        """替换 builtins.input，开始录制。"""
+        self._input = builtins.input
+        builtins.input = self
+        return self
+
+    def uninstall(self) -> None:
+        """恢复原来的 input 并关闭日志文件。"""
+        builtins.input = self._input
+        self.file.close()
+
+
+class InputReplayer:
+    """
+    输入回放器，按顺序从日志文件中读出玩家输入。
+
+    日志读完后自动恢复原来的 input，玩家可以从回放结束的位置继续游戏。
+
+    属性:
+        lines (list): 尚未回放的输入
+    """
+    def __init__(self, path: str) -> None:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if lines and lines[0].startswith(SEED_HEADER):
+            lines = lines[1:]
+        self.lines = lines
+        self._position = 0
+        self._input = builtins.input
+
+    def __call__(self, prompt: str = "") -> str:
+        if self._position >= len(self.lines):
+            self.uninstall()
+            return self._input(prompt)
+        line = self.lines[self._position]
+        self._position += 1
+        print(f"{prompt}{line}")
+        return line
+
+    def install(self) -> "InputReplayer":
+        """替换 builtins.input，开始回放。"""
+        self._input = builtins.input
+        builtins.input = self
+        return self
+
+    def uninstall(self) -> None:
+        """恢复原来的 input。"""
+        if builtins.input is self:
+            builtins.input = self._input
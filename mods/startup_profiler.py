@@ -0,0 +1,295 @@
+"""
+启动性能分析模块，统计游戏启动时每个模块导入和每个数据加载的耗时与内存分配。
+
+在一个全新的解释器中依次导入游戏启动时用到的模块，再加载一局游戏需要的
+全部数据表（装备、技能、敌人、对话、世界地图等），记录:
+    import  每个模块导入的耗时（自身/累计）和内存分配
+    load    每次数据加载的耗时和内存分配，按 rng.loading 的数据表名称区分，
+            另外单独统计数据快照的读取与编译（tools.content_snapshot）
+自身耗时不含嵌套在其中的其他导入或加载，报告按自身耗时从高到低排序。
+
+内存分配为 tracemalloc 统计的净增加量（字节）。开启 tracemalloc 会让整体变慢，
+各项耗时之间的相对大小仍然可比；只关心耗时时可以使用 --no-memory。
+
+用法:
+    python game.py --profile-startup [--profile-json FILE]
+    python -m mods.startup_profiler [--json FILE] [--top N] [--no-memory]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 游戏启动和开始新游戏时导入的模块
+STARTUP_MODULES = [
+    "game",
+    "player",
+    "combat",
+    "enemies",
+    "events",
+    "world.map",
+    "bag",
+    "mods.give_initial_items",
+    "mods.command_parser",
+]
+
+
+@dataclass
+class ProfileEntry:
+    """
+    一个模块导入或数据加载的统计结果。
+
+    属性:
+        kind (str): "import" 或 "load"
+        name (str): 模块名或数据表名
+        calls (int): 次数
+        total (float): 累计耗时（秒），包含嵌套的导入和加载
+        self_time (float): 自身耗时（秒）
+        memory (int): 累计净分配内存（字节）
+        self_memory (int): 自身净分配内存（字节）
+    """
+    kind: str
+    name: str
+    calls: int = 0
+    total: float = 0.0
+    self_time: float = 0.0
+    memory: int = 0
+    self_memory: int = 0
+
+
+class _ImportTimer:
+    """放在 sys.meta_path 最前面的查找器，为随后执行的每个模块计时。"""
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                self._wrap(spec)
+                return spec
+        return None
+
+    def _wrap(self, spec) -> None:
+        loader = spec.loader
+        # 内置模块和冻结模块的加载器是类本身，不能逐个替换，它们的导入开销也可以忽略
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return
+        original = loader.exec_module
+        profiler = self.profiler
+
+        def exec_module(module):
+            with profiler.measure("import", spec.name):
+                original(module)
+            profiler.patch(module)
+
+        try:
+            loader.exec_module = exec_module
+        except AttributeError:
+            pass
+
+
+class StartupProfiler:
+    """
+    统计模块导入和数据加载的耗时与内存分配。
+
+    用法:
+        profiler = StartupProfiler()
+        with profiler:
+            import game
+        profiler.report()
+
+    属性:
+        entries (Dict[Tuple[str, str], ProfileEntry]): 统计结果
+        wall_time (float): 分析期间的总耗时（秒）
+        peak_memory (int): 分析期间 tracemalloc 记录的内存峰值（字节）
+    """
+    def __init__(self, trace_memory: bool = True) -> None:
+        """
+        参数:
+            trace_memory (bool): 是否统计内存分配
+        """
+        self.trace_memory = trace_memory
+        self.entries: Dict[Tuple[str, str], ProfileEntry] = {}
+        self.wall_time = 0.0
+        self.peak_memory = 0
+        self._stack: List[list] = []
+        self._finder = _ImportTimer(self)
+        self._started = 0.0
+
+    def _memory(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+
+    @contextlib.contextmanager
+    def measure(self, kind: str, name: str):
+        """
+        在上下文内统计一项导入或加载，嵌套的统计项不计入外层的自身耗时。
+
+        参数:
+            kind (str): "import" 或 "load"
+            name (str): 统计项名称
+        """
+        frame = [time.perf_counter(), self._memory(), 0.0, 0]  # 开始时间、开始内存、子项耗时、子项内存
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            memory = self._memory() - frame[1]
+            if self._stack:
+                self._stack[-1][2] += elapsed
+                self._stack[-1][3] += memory
+            entry = self.entries.get((kind, name))
+            if entry is None:
+                entry = self.entries[(kind, name)] = ProfileEntry(kind, name)
+            entry.calls += 1
+            entry.total += elapsed
+            entry.self_time += elapsed - frame[2]
+            entry.memory += memory
+            entry.self_memory += memory - frame[3]
+
+    def _timed(self, name: str, func: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            with self.measure("load", name):
+                return func(*args, **kwargs)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def patch(self, module) -> None:
+        """模块导入完成后，为其中的数据加载入口加上统计。"""
+        if module.__name__ == "core.rng":
+            original = module.loading
+
+            @contextlib.contextmanager
+            def loading(name):
+                with self.measure("load", name), original(name):
+                    yield
+
+            module.loading = loading
+        elif module.__name__ == "tools.content_snapshot":
+            module.load = self._timed("content_snapshot.load", module.load)
+            module.build = self._timed("content_snapshot.build", module.build)
+
+    def __enter__(self) -> "StartupProfiler":
+        if self.trace_memory:
+            tracemalloc.start()
+        sys.meta_path.insert(0, self._finder)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall_time = time.perf_counter() - self._started
+        sys.meta_path.remove(self._finder)
+        if self.trace_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def sorted_entries(self) -> List[ProfileEntry]:
+        """按自身耗时从高到低返回全部统计项。"""
+        return sorted(self.entries.values(), key=lambda entry: entry.self_time, reverse=True)
+
+    def to_json(self) -> dict:
+        """返回可写入 JSON 的统计结果。"""
+        return {
+            "wall_time": self.wall_time,
+            "peak_memory": self.peak_memory,
+            "trace_memory": self.trace_memory,
+            "entries": [asdict(entry) for entry in self.sorted_entries()],
+        }
+
+    def report(self, top: int = 30) -> None:
+        """
+        打印按自身耗时排序的报告。
+
+        参数:
+            top (int): 显示的条目数
+        """
+        from ui import get_console
+        from rich.table import Table
+
+        table = Table(title="启动耗时分析（按自身耗时排序）")
+        table.add_column("类型")
+        table.add_column("名称", overflow="fold")
+        table.add_column("次数", justify="right")
+        table.add_column("自身 ms", justify="right")
+        table.add_column("累计 ms", justify="right")
+        if self.trace_memory:
+            table.add_column("自身 KiB", justify="right")
+            table.add_column("累计 KiB", justify="right")
+        for entry in self.sorted_entries()[:top]:
+            row = [entry.kind, entry.name, str(entry.calls),
+                   f"{entry.self_time * 1000:.1f}", f"{entry.total * 1000:.1f}"]
+            if self.trace_memory:
+                row += [f"{entry.self_memory / 1024:.1f}", f"{entry.memory / 1024:.1f}"]
+            table.add_row(*row)
+
+        console = get_console()
+        console.print(table)
+        imports = sum(entry.self_time for entry in self.entries.values() if entry.kind == "import")
+        loads = sum(entry.self_time for entry in self.entries.values() if entry.kind == "load")
+        summary = f"总耗时 {self.wall_time * 1000:.1f}ms（模块导入 {imports * 1000:.1f}ms，数据加载 {loads * 1000:.1f}ms）"
+        if self.trace_memory:
+            summary += f"，内存峰值 {self.peak_memory / 1024:.1f} KiB"
+        console.print(summary)
+
+
+def load_content() -> None:
+    """加载一局游戏需要的全部数据：世界地图及其事件和任务，以及所有已导入模块中的数据表。"""
+    from tools.lazy import LazyTable
+    from world import map
+
+    map.world_map
+    for module in list(sys.modules.values()):
+        for value in list(getattr(module, "__dict__", {}).values()):
+            if isinstance(value, LazyTable):
+                value.load()
+
+
+def profile_startup(trace_memory: bool = True) -> StartupProfiler:
+    """
+    导入 STARTUP_MODULES 并加载全部数据，返回统计结果。
+
+    应在全新的解释器中调用，否则已经导入的模块不会被统计。
+    期间的标准输出（如调试信息）会被丢弃。
+
+    参数:
+        trace_memory (bool): 是否统计内存分配
+
+    返回:
+        StartupProfiler: 统计结果
+    """
+    profiler = StartupProfiler(trace_memory)
+    with profiler, contextlib.redirect_stdout(io.StringIO()):
+        for name in STARTUP_MODULES:
+            import_module(name)
+        load_content()
+    return profiler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="分析游戏启动时的模块导入和数据加载耗时")
+    parser.add_argument("--json", metavar="FILE", help="把统计结果写入 JSON 文件")
+    parser.add_argument("--top", type=int, default=30, help="报告中显示的条目数")
+    parser.add_argument("--no-memory", action="store_true", help="不统计内存分配")
+    args = parser.parse_args(argv)
+
+    profiler = profile_startup(trace_memory=not args.no_memory)
+    profiler.report(args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(profiler.to_json(), f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+装备目录模块，为装备建立按等级、类型和标签的倒排索引。
+
+每件装备在目录中有一个序号，每个等级、每种类型、每个标签各对应一个位图
+（Python 整数，第 i 位为 1 表示第 i 件装备属于该分组）。组合查询只需要对位图
+做按位与/或，再按序号取出装备。结果很少时逐个取出位图中最低的 1 位，
+耗时与结果数量成正比；结果较多时扫描位图的二进制字符串，耗时与目录大小成正比，
+这时逐个取位反而更慢（每次整数运算都要处理整个位图）。
+即使目录中有上万件装备，查询也能在亚毫秒内完成。查询结果保持装备加入目录的顺序。
+
+用法:
+    catalog = EquipmentCatalog(equipment_data.values())
+    catalog.query(level=2, object_type="weapon", tags=["weapon"])
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# 位图长度超过结果数量的这个倍数时，逐个取出最低的 1 位比扫描二进制字符串更快
+_SPARSE_RATIO = 256
+
+
+class EquipmentCatalog:
+    """
+    带倒排索引的装备目录。
+
+    属性:
+        items (List[Equipment]): 按加入顺序排列的装备
+    """
+    def __init__(self, items: Iterable = ()) -> None:
+        """
+        建立目录并索引给定的装备。
+
+        参数:
+            items (Iterable[Equipment]): 要加入目录的装备
+        """
+        self.items: List = []
+        self._all = 0
+        self._by_level: Dict[int, int] = defaultdict(int)
+        self._by_type: Dict[str, int] = defaultdict(int)
+        self._by_tag: Dict[str, int] = defaultdict(int)
+        for equipment in items:
+            self.add(equipment)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, equipment) -> None:
+        """
+        把一件装备加入目录。
+
+        参数:
+            equipment (Equipment): 要加入的装备，使用其 level、object_type 和 tags 建立索引
+        """
+        bit = 1 << len(self.items)
+        self.items.append(equipment)
+        self._all |= bit
+        self._by_level[equipment.level] |= bit
+        self._by_type[equipment.object_type] |= bit
+        for tag in set(equipment.tags):
+            self._by_tag[tag] |= bit
+
+    def _mask(self, level: Optional[int], object_type: Optional[str],
+              tags: Optional[Sequence[str]], match_all_tags: bool) -> int:
+        mask = self._all
+        if level is not None:
+            mask &= self._by_level.get(level, 0)
+        if object_type:
+            mask &= self._by_type.get(object_type, 0)
+        if tags:
+            tag_masks = [self._by_tag.get(tag, 0) for tag in tags]
+            if match_all_tags:
+                for tag_mask in tag_masks:
+                    mask &= tag_mask
+            else:
+                combined = 0
+                for tag_mask in tag_masks:
+                    combined |= tag_mask
+                mask &= combined
+        return mask
+
+    def query(self, level: Optional[int] = None, object_type: Optional[str] = None,
+              tags: Optional[Sequence[str]] = None, match_all_tags: bool = False) -> List:
+        """
+        按条件查询装备，省略的条件不做限制。
+
+        参数:
+            level (int, optional): 装备等级
+            object_type (str, optional): 装备类型，如 "weapon"、"armor"
+            tags (Sequence[str], optional): 标签
+            match_all_tags (bool): 是否要求包含全部标签，默认为包含任一标签即可
+
+        返回:
+            List[Equipment]: 符合条件的装备，按加入目录的顺序排列
+        """
+        mask = self._mask(level, object_type, tags, match_all_tags)
+        if not mask:
+            return []
+        if mask == self._all:
+            return list(self.items)
+        items = self.items
+        result = []
+        if mask.bit_count() * _SPARSE_RATIO < mask.bit_length():
+            # 结果很少：每次取出最低的 1 位（mask & -mask），其位置即装备序号
+            while mask:
+                low = mask & -mask
+                result.append(items[low.bit_length() - 1])
+                mask ^= low
+            return result
+        # 结果较多：二进制字符串倒序后第 i 个字符即第 i 位，用 find 跳过连续的 0
+        bits = bin(mask)[:1:-1]
+        index = bits.find("1")
+        while index != -1:
+            result.append(items[index])
+            index = bits.find("1", index + 1)
+        return result
+
+    def count(self, level: Optional[int] = None, object_type: Optional[str] = None,
+              tags: Optional[Sequence[str]] = None, match_all_tags: bool = False) -> int:
+        """返回符合条件的装备数量，参数同 query。"""
+        return self._mask(level, object_type, tags, match_all_tags).bit_count()
@@ -6,16 +6,67 @@
 具有不同品质等级和属性加成。
 """
 
-import random
-import ascii_magic
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
-from rich.console import Console
 
 import data.constants as constants
-from others.item import Item
+from ui import get_console
+from others.item import Item, ItemDef, define, definition_property
+from core import rng
 
-console = Console()
+console = get_console()
+
+@dataclass(frozen=True, slots=True)
+class EquipmentDef(ItemDef):
+    """
+    装备定义，name 和 individual_value 是不含品质的基础名称和基础价值。
+
+    同一品质的装备名称、价值和属性加成都相同，variant() 把它们缓存在定义上，
+    所有该品质的装备实例共用同一份。
+
+    属性:
+        stats (Tuple[Tuple[str, int], ...]): 基础属性加成
+        combo (Any): 关联的套装效果
+        spell (Any): 关联的法术效果
+        level (int): 装备等级
+        tags (Tuple[str, ...]): 装备标签
+        image_path (str): 装备图像路径
+    """
+    stats: Tuple[Tuple[str, int], ...] = ()
+    combo: Any = None
+    spell: Any = None
+    level: int = 1
+    tags: Tuple[str, ...] = ()
+    image_path: str = ""
+    _variants: Dict = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def base_stats(self) -> Dict[str, int]:
+        """基础属性加成的字典副本。"""
+        return dict(self.stats)
+
+    def variant(self, quality_data: Tuple[str, float, float], apply_quality: bool = True) -> Tuple[str, int, Dict[str, int]]:
+        """
+        返回某一品质的装备名称、价值和属性加成。
+
+        参数:
+            quality_data (Tuple[str, float, float]): (品质名称, 价格乘数, 属性乘数)
+            apply_quality (bool): 是否按属性乘数修正属性加成
+
+        返回:
+            Tuple[str, int, Dict[str, int]]: (名称, 价值, 属性加成)，属性加成为共享的字典，不应修改
+        """
+        key = (tuple(quality_data), apply_quality)
+        variant = self._variants.get(key)
+        if variant is None:
+            quality, price_mult, stat_mult = quality_data
+            if apply_quality:
+                stats = {stat: int(val * stat_mult) for stat, val in self.stats}
+            else:
+                stats = dict(self.stats)
+            variant = self._variants[key] = (f"{quality}{self.name}", int(self.individual_value * price_mult), stats)
+        return variant
 
 class Equipment(Item):
     """
@@ -24,22 +75,42 @@ class Equipment(Item):
     扩展基础物品类，添加装备特有的属性如品质系统、属性修正、套装效果等。
     装备可以提升角色的各项属性，有不同的品质等级影响其属性加成强度。
 
+    装备实例只保存数量和品质，以及由品质决定的名称、价值和属性加成，
+    其余属性都取自共享的 EquipmentDef。
+
     属性:
-        base_name (str): 装备的基础名称
-        base_stats (Dict[str, int]): 基础属性加成，不受品质影响
-        base_value (int): 基础价值
-        stat_change_list (Dict[str, int]): 最终属性加成，受品质影响
-        combo (Any): 关联的套装效果
-        spell (Any): 关联的法术效果
-        level (int): 装备等级
-        tags (List[str]): 装备标签
+        definition (EquipmentDef): 共享的装备定义
+        name (str): 带品质前缀的装备名称
+        individual_value (int): 计入品质的价值
+        stat_change_list (Dict[str, int]): 最终属性加成，受品质影响，与同品质的装备共用，不应修改
         quality (str): 装备品质
         price_mult (float): 品质对价格的影响系数
         stat_mult (float): 品质对属性加成的影响系数
-        image_path (str): 装备图像路径
+        base_name (str): 装备的基础名称，取自定义
+        base_stats (Dict[str, int]): 基础属性加成，不受品质影响，取自定义
+        base_value (int): 基础价值，取自定义
+        combo (Any): 关联的套装效果，取自定义
+        spell (Any): 关联的法术效果，取自定义
+        level (int): 装备等级，取自定义
+        tags (Tuple[str, ...]): 装备标签，取自定义
+        image_path (str): 装备图像路径，取自定义
     """
+    __slots__ = ("name", "individual_value", "stat_change_list", "_quality")
+
     QUALITY_CONFIG = constants.QUALITY_CONFIG
 
+    base_name = definition_property("name", "装备的基础名称")
+    base_value = definition_property("individual_value", "基础价值")
+    base_stats = definition_property("base_stats", "基础属性加成")
+    combo = definition_property("combo", "关联的套装效果")
+    spell = definition_property("spell", "关联的法术效果")
+    level = definition_property("level", "装备等级")
+    tags = definition_property("tags", "装备标签")
+    image_path = definition_property("image_path", "装备图像路径")
+    quality = property(lambda self: self._quality[0], doc="装备品质")
+    price_mult = property(lambda self: self._quality[1], doc="品质对价格的影响系数")
+    stat_mult = property(lambda self: self._quality[2], doc="品质对属性加成的影响系数")
+
     def __init__(
         self,
         name: str,
@@ -77,26 +148,18 @@ class Equipment(Item):
             quality_data (Tuple[str, float, float], optional): 品质数据，默认为None
             apply_quality (bool, optional): 是否应用品质效果，默认为True
         """
-        super().__init__(name, description, amount, individual_value, object_type)
-        self.base_name = name
-        self.base_stats = stat_change_list.copy()
-        self.base_value = individual_value
-        self.stat_change_list = self.base_stats.copy()
-        self.combo = combo
-        self.spell = spell
-        self.level = level
-        self.tags = tags or []
-
-        self.quality, self.price_mult, self.stat_mult = quality_data if quality_data else self._generate_quality()
-
-        if apply_quality:
-            self._apply_quality()
-
-        self.name = f"{self.quality}{self.base_name}"
-        self.individual_value = int(self.base_value * self.price_mult)
-        self.image_path = image_path or constants.DEFAULT_EQUIPMENT_IMAGES.get(
-            object_type, "img/equipments/default_unknown.png"
+        self.definition = define(
+            EquipmentDef, name, description, individual_value, object_type,
+            tuple(stat_change_list.items()), combo, spell, level, tuple(tags or ()),
+            image_path or constants.DEFAULT_EQUIPMENT_IMAGES.get(object_type, "img/equipments/default_unknown.png"),
         )
+        self.amount = amount
+        self._set_variant(quality_data if quality_data else self._generate_quality(), apply_quality)
+
+    def _set_variant(self, quality_data: Tuple[str, float, float], apply_quality: bool = True) -> None:
+        """设置品质，并从装备定义取得该品质的名称、价值和属性加成。"""
+        self._quality = tuple(quality_data)
+        self.name, self.individual_value, self.stat_change_list = self.definition.variant(self._quality, apply_quality)
 
     def _generate_quality(self) -> Tuple[str, float, float]:
         """
@@ -109,22 +172,9 @@ class Equipment(Item):
             Tuple[str, float, float]: 包含(品质名称, 价格乘数, 属性乘数)的元组
         """
         names, price_ms, stat_ms, weights = zip(*self.QUALITY_CONFIG)
-        idx = random.choices(range(len(names)), weights=weights, k=1)[0]
+        idx = rng.stream("equipment").choices(range(len(names)), weights=weights, k=1)[0]
         return names[idx], price_ms[idx], stat_ms[idx]
 
-    def _apply_quality(self) -> None:
-        """
-        根据装备品质修正属性加成。
-
-        应用品质系数到装备的基础属性上，计算最终的属性加成值。
-        这将根据品质的不同，调整装备的实际属性效果强度。
-
-        副作用:
-            修改stat_change_list字典中的值
-        """
-        for key, val in self.base_stats.items():
-            self.stat_change_list[key] = int(val * self.stat_mult)
-
     def display_image_as_ascii(self) -> str:
         """
         将装备图像转换为ASCII艺术展示。
@@ -141,6 +191,7 @@ class Equipment(Item):
         path = Path(self.image_path)
         if not path.is_file():
             return "[图片缺失]"
+        import ascii_magic
         art = ascii_magic.AsciiArt.from_image(self.image_path)
         return art.to_ascii(columns=32)
 
@@ -226,17 +277,41 @@ class Equipment(Item):
             - 修改装备的品质、价值和属性加成
             - 更新装备名称
         """
-        self.quality, self.price_mult, self.stat_mult = self._generate_quality()
-        self._apply_quality()
-        self.name = f"{self.quality}{self.base_name}"
-        self.individual_value = int(self.base_value * self.price_mult)
+        self.set_quality(self._generate_quality())
+
+    def set_quality(self, quality_data: Tuple[str, float, float]) -> None:
+        """
+        将装备设置为指定品质并应用。
+
+        根据给定的品质数据更新装备名称、属性加成和价值，
+        用于需要固定品质的场景，例如平衡性模拟。
+
+        参数:
+            quality_data (Tuple[str, float, float]): (品质名称, 价格乘数, 属性乘数)
+
+        副作用:
+            - 修改装备的品质、价值和属性加成
+            - 更新装备名称
+        """
+        self._set_variant(quality_data)
+
+    def variant_key(self) -> Tuple[Tuple[str, float, float], bool]:
+        """返回 (品质数据, 是否按品质修正属性)，见 Item.variant_key。"""
+        return self._quality, self.stat_change_list is self.definition.variant(self._quality)[2]
+
+    @classmethod
+    def from_variant(cls, definition, amount, variant_key=None) -> 'Equipment':
+        """用装备定义、数量和 variant_key() 的结果重建装备，名称、价值和属性加成与原装备共用。"""
+        item = super().from_variant(definition, amount)
+        item._set_variant(*variant_key)
+        return item
 
     def clone(self, amount: int) -> 'Equipment':
         """
         创建此装备的副本。
 
         创建一个具有相同属性但可能不同数量的新装备实例。
-        克隆保留原装备的所有属性，包括品质、属性加成等。
+        副本与原装备共用装备定义，并保留原装备的品质、属性加成等。
 
         参数:
             amount (int): 新装备实例的数量
@@ -244,20 +319,9 @@ class Equipment(Item):
         返回:
             Equipment: 此装备的副本
         """
-        clone = self.__class__(
-            name=self.base_name,
-            description=self.description,
-            amount=amount,
-            individual_value=self.base_value,
-            object_type=self.object_type,
-            stat_change_list=self.base_stats.copy(),
-            combo=self.combo,
-            spell=self.spell,
-            level=self.level,
-            tags=self.tags.copy(),
-            image_path=self.image_path,
-            quality_data=(self.quality, self.price_mult, self.stat_mult),
-            apply_quality=False,
-        )
-        clone.stat_change_list = self.stat_change_list.copy()
+        clone = super().clone(amount)
+        clone._quality = self._quality
+        clone.name = self.name
+        clone.individual_value = self.individual_value
+        clone.stat_change_list = self.stat_change_list
         return clone
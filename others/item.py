@@ -4,12 +4,93 @@
 该模块实现了游戏中的物品系统，包括基本物品类(Item)及其衍生的特殊物品类型，
 如药水(Potion)、魔法书(Grimoire)、宝石(Jewel)和食物(Food)。每种物品类型
 都有其特定的属性和使用效果，支持物品的使用、出售、购买和丢弃等基本操作。
+
+同一种物品的不变数据保存在共享的物品定义(ItemDef)中，物品实例使用 __slots__，
+只保存数量等自身状态。
 """
 
-from rich.console import Console
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Dict
+
+from ui import get_console
 from ui import typewriter
 
-console = Console()
+console = get_console()
+
+@dataclass(frozen=True, slots=True)
+class ItemDef:
+    """
+    物品定义，保存同一种物品共有的不可变数据（享元）。
+
+    物品实例只保存自身的状态（数量，装备另有品质和属性），名称、描述等都从定义中读取，
+    因此堆叠、商店补货和掉落时克隆物品不再复制这些数据。
+    定义由 define() 创建并登记，内容相同的定义在进程内只有一份，复制和序列化后仍是同一个对象。
+
+    属性:
+        name (str): 物品名称
+        description (str): 物品描述
+        individual_value (int): 物品单价
+        object_type (str): 物品类型
+    """
+    name: str
+    description: str
+    individual_value: int
+    object_type: str
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return define, (type(self), *(getattr(self, f.name) for f in fields(self) if f.compare))
+
+@dataclass(frozen=True, slots=True)
+class PotionDef(ItemDef):
+    """药水定义。"""
+    stat: str
+    amount_to_change: int
+
+@dataclass(frozen=True, slots=True)
+class GrimoireDef(ItemDef):
+    """魔法书定义。"""
+    spell: object
+
+@dataclass(frozen=True, slots=True)
+class JewelDef(ItemDef):
+    """宝石定义。"""
+    stat: str
+    amount_to_change: int
+
+@dataclass(frozen=True, slots=True)
+class FoodDef(ItemDef):
+    """食物定义。"""
+    hunger_restore: int
+    hp_restore: int
+    mp_restore: int
+
+# 已登记的物品定义，键和值是同一个对象
+_definitions: Dict[ItemDef, ItemDef] = {}
+
+def define(def_cls, *values) -> ItemDef:
+    """
+    返回内容为 values 的物品定义，已登记过相同的定义时复用它。
+
+    参数:
+        def_cls (type): 定义类型，如 ItemDef、PotionDef
+        *values: 按字段顺序排列的字段值，必须都可哈希
+
+    返回:
+        ItemDef: 登记表中的定义对象
+    """
+    definition = def_cls(*values)
+    return _definitions.setdefault(definition, definition)
+
+def definition_property(name: str, doc: str) -> property:
+    """从物品定义中读取的只读属性。"""
+    return property(attrgetter(f"definition.{name}"), doc=doc)
 
 def prompt_for_amount(max_amount, prompt="多少个？") -> int:
     """
@@ -44,12 +125,20 @@ class Item:
     作为其他特殊物品类型的父类，提供通用的物品处理逻辑。
 
     属性:
-        name (str): 物品名称
-        description (str): 物品描述
+        definition (ItemDef): 共享的物品定义
         amount (int): 物品数量
-        individual_value (int): 物品单价
-        object_type (str): 物品类型
+        name (str): 物品名称，取自定义
+        description (str): 物品描述，取自定义
+        individual_value (int): 物品单价，取自定义
+        object_type (str): 物品类型，取自定义
     """
+    __slots__ = ("definition", "amount")
+
+    name = definition_property("name", "物品名称")
+    description = definition_property("description", "物品描述")
+    individual_value = definition_property("individual_value", "物品单价")
+    object_type = definition_property("object_type", "物品类型")
+
     def __init__(self, name, description, amount, individual_value, object_type):
         """
         初始化物品实例。
@@ -63,11 +152,8 @@ class Item:
             individual_value (int): 物品单价（游戏内货币）
             object_type (str): 物品类型标识符
         """
-        self.name = name
-        self.description = description
+        self.definition = define(ItemDef, name, description, individual_value, object_type)
         self.amount = amount
-        self.individual_value = individual_value
-        self.object_type = object_type
 
     def _get_valid_amount(self, prompt_text) -> int:
         """
@@ -140,7 +226,7 @@ class Item:
         print("取消出售")
         return 0, 0
 
-    def buy(self, player):
+    def buy(self, player, stock=None):
         """
         购买物品。
 
@@ -149,9 +235,11 @@ class Item:
 
         参数:
             player: 玩家对象，包含金钱和背包属性
+            stock (Inventory, optional): 出售此物品的店铺库存。提供时，店铺扣除库存和
+                玩家得到物品在同一组库存事务中完成，任何一方失败都不改变两个库存
 
         副作用:
-            - 减少店铺物品数量
+            - 减少店铺物品数量，数量为0时从店铺库存中移除
             - 向玩家背包添加物品
             - 减少玩家金钱
             - 输出购买信息
@@ -171,9 +259,15 @@ class Item:
                 print("没有足够的钱")
                 return
 
-        item_for_player = self.clone(amount_to_buy)
-        self.amount -= amount_to_buy
-        item_for_player.add_to_inventory_player(player.inventory)
+        if stock is None:
+            item_for_player = self.clone(amount_to_buy)
+            self.amount -= amount_to_buy
+            item_for_player.add_to_inventory_player(player.inventory)
+        else:
+            with stock.transaction() as sold, player.inventory.transaction() as bought:
+                sold.remove(self.name, amount_to_buy)
+                bought.add(self, amount_to_buy)
+            console.print(f"{amount_to_buy} 个 [yellow]{self.name}[/yellow] 已添加到库存")
         player.money -= total_price
         console.print(f"💰: {player.money}")
 
@@ -208,12 +302,7 @@ class Item:
         副作用:
             - 增加背包中现有物品数量或添加新物品到背包
         """
-        for item in inventory.items:
-            if self.name == item.name:
-                item.amount += amount
-                return
-        new_item = self.clone(amount)
-        inventory.items.append(new_item)
+        inventory.add_item(self, amount)
 
     def show_info(self):
         """
@@ -247,7 +336,7 @@ class Item:
         """
         创建物品的克隆。
 
-        创建一个新的物品实例，具有相同的属性但可能不同的数量。
+        创建一个同类型的新物品实例，与原物品共用物品定义，只有数量不同。
 
         参数:
             amount (int): 新物品实例的数量
@@ -255,7 +344,36 @@ class Item:
         返回:
             Item: 新创建的物品实例
         """
-        return Item(self.name, self.description, amount, self.individual_value, self.object_type)
+        clone = self.__class__.__new__(self.__class__)
+        clone.definition = self.definition
+        clone.amount = amount
+        return clone
+
+    def variant_key(self):
+        """
+        返回同一物品定义下区分不同物品的数据，普通物品为None。
+
+        与物品定义、数量一起可以用 from_variant 重建物品，供紧凑存储使用。
+        """
+        return None
+
+    @classmethod
+    def from_variant(cls, definition, amount, variant_key=None):
+        """
+        用物品定义、数量和 variant_key() 的结果重建物品。
+
+        参数:
+            definition (ItemDef): 物品定义
+            amount (int): 数量
+            variant_key: variant_key() 的返回值
+
+        返回:
+            Item: 重建的物品
+        """
+        item = cls.__new__(cls)
+        item.definition = definition
+        item.amount = amount
+        return item
 
 class Potion(Item):
     """
@@ -267,6 +385,11 @@ class Potion(Item):
         stat (str): 要恢复的属性，如"hp"或"mp"
         amount_to_change (int): 恢复的数量
     """
+    __slots__ = ()
+
+    stat = definition_property("stat", "要恢复的属性")
+    amount_to_change = definition_property("amount_to_change", "恢复的数量")
+
     def __init__(self, name, description, amount, individual_value, object_type, stat, amount_to_change) -> None:
         """
         初始化药水实例。
@@ -282,9 +405,8 @@ class Potion(Item):
             stat (str): 要恢复的属性，如"hp"或"mp"
             amount_to_change (int): 恢复的数量
         """
-        super().__init__(name, description, amount, individual_value, object_type)
-        self.stat = stat
-        self.amount_to_change = amount_to_change
+        self.definition = define(PotionDef, name, description, individual_value, object_type, stat, amount_to_change)
+        self.amount = amount
 
     def activate(self, caster):
         """
@@ -305,9 +427,6 @@ class Potion(Item):
         elif self.stat == "mp":
             caster.recover_mp(self.amount_to_change)
 
-    def clone(self, amount):
-        return Potion(self.name, self.description, amount, self.individual_value, self.object_type, self.stat, self.amount_to_change)
-
 class Grimoire(Item):
     """
     魔法书类，可用于学习法术的物品。
@@ -317,6 +436,10 @@ class Grimoire(Item):
     属性:
         spell: 魔法书包含的法术对象
     """
+    __slots__ = ()
+
+    spell = definition_property("spell", "魔法书包含的法术对象")
+
     def __init__(self, name, description, amount, individual_value, object_type, spell) -> None:
         """
         初始化魔法书实例。
@@ -331,8 +454,8 @@ class Grimoire(Item):
             object_type (str): 物品类型标识符
             spell: 魔法书包含的法术对象
         """
-        super().__init__(name, description, amount, individual_value, object_type)
-        self.spell = spell
+        self.definition = define(GrimoireDef, name, description, individual_value, object_type, spell)
+        self.amount = amount
 
     def activate(self, caster):
         """
@@ -358,9 +481,6 @@ class Grimoire(Item):
             print(f"阅读 {self.name}, 你学会了释放: {self.spell.name}")
             caster.spells.append(self.spell)
 
-    def clone(self, amount):
-        return Grimoire(self.name, self.description, amount, self.individual_value, self.object_type, self.spell)
-
 class Jewel(Item):
     """
     宝石类，可永久提升属性的消耗品。
@@ -371,6 +491,11 @@ class Jewel(Item):
         stat (str): 要提升的属性名称
         amount_to_change (int): 属性提升的数量
     """
+    __slots__ = ()
+
+    stat = definition_property("stat", "要提升的属性名称")
+    amount_to_change = definition_property("amount_to_change", "属性提升的数量")
+
     def __init__(self, name, description, amount, individual_value, stat, amount_to_change) -> None:
         """
         初始化宝石实例。
@@ -385,9 +510,8 @@ class Jewel(Item):
             stat (str): 要提升的属性名称
             amount_to_change (int): 属性提升的数量
         """
-        super().__init__(name, description, amount, individual_value, "consumable")
-        self.stat = stat
-        self.amount_to_change = amount_to_change
+        self.definition = define(JewelDef, name, description, individual_value, "consumable", stat, amount_to_change)
+        self.amount = amount
 
     def activate(self, caster):
         """
@@ -407,9 +531,6 @@ class Jewel(Item):
             caster.stats[self.stat] += self.amount_to_change
             typewriter(f"\033[33m{self.stat} 增加了 {self.amount_to_change} 点\033[0m")
 
-    def clone(self, amount):
-        return Jewel(self.name, self.description, amount, self.individual_value, self.stat, self.amount_to_change)
-
 class Food(Item):
     """
     食物类，可恢复饱食度和可能恢复生命值或魔法值的消耗品。
@@ -421,6 +542,12 @@ class Food(Item):
         hp_restore (int): 恢复的生命值
         mp_restore (int): 恢复的魔法值
     """
+    __slots__ = ()
+
+    hunger_restore = definition_property("hunger_restore", "恢复的饱食度")
+    hp_restore = definition_property("hp_restore", "恢复的生命值")
+    mp_restore = definition_property("mp_restore", "恢复的魔法值")
+
     def __init__(self, name, description, amount, individual_value, hunger_restore, hp_restore=0, mp_restore=0) -> None:
         """
         初始化食物实例。
@@ -436,10 +563,8 @@ class Food(Item):
             hp_restore (int, optional): 恢复的生命值，默认为0
             mp_restore (int, optional): 恢复的魔法值，默认为0
         """
-        super().__init__(name, description, amount, individual_value, "food")
-        self.hunger_restore = hunger_restore
-        self.hp_restore = hp_restore
-        self.mp_restore = mp_restore
+        self.definition = define(FoodDef, name, description, individual_value, "food", hunger_restore, hp_restore, mp_restore)
+        self.amount = amount
 
     def activate(self, player):
         """
@@ -484,6 +609,3 @@ class Food(Item):
         if self.mp_restore > 0:
             food_info += f"魔法值: +{self.mp_restore}\n"
         return base_info + food_info
-
-    def clone(self, amount):
-        return Food(self.name, self.description, amount, self.individual_value, self.hunger_restore, self.hp_restore, self.mp_restore)
@@ -7,19 +7,26 @@
 """
 
 from data import MONEY_MULTIPLIER
-import random
-from rich.console import Console
 
 import bag
+from ui import get_console
 from ui import text
 from ui import clear_screen
 from core import battler
+from core import rng
+from core.stats import StatSheet
 from data import ALL_SKILLS
 from others.equipment import Equipment
 from core.level_system import LevelSystem
 from bag.interface import InventoryInterface as interface
 
-console = Console()
+console = get_console()
+
+# 每点能力提升的属性
+APTITUDE_STATS = {
+    "str": {"atk": 3}, "dex": {"agi": 2, "crit": 1},
+    "int": {"mat": 3}, "wis": {"max_mp": 15}, "const": {"max_hp": 30}
+}
 
 
 class Player(battler.Battler):
@@ -54,13 +61,13 @@ class Player(battler.Battler):
         参数:
             name (str): 玩家角色名称
         """
-        stats = {
+        stats = StatSheet({
             "max_hp": 500, "hp": 500,
             "max_mp": 100, "mp": 100,
             "max_hunger": 120, "hunger": 100,
             "atk": 12, "def": 10, "mat": 12, "mdf": 10,
             "agi": 10, "luk": 10, "crit": 3, "anti_crit": 3
-        }
+        })
         super().__init__(name, stats)
 
         self.ls = LevelSystem()
@@ -104,7 +111,8 @@ class Player(battler.Battler):
         装备物品。
 
         将指定装备放入对应的装备槽位，更新玩家属性，并处理移除旧装备的逻辑。
-        装备可能提供属性加成、连招技能或法术能力。
+        装备可能提供属性加成、连招技能或法术能力，属性加成以 ("equipment", 槽位)
+        为来源记录在属性表中，更换装备时直接替换该来源。
 
         参数:
             equipment (Equipment): 要装备的物品
@@ -119,17 +127,17 @@ class Player(battler.Battler):
             if equipment: print(f"{equipment.name} 无法装备")
             return
 
-        current = self.equipment[equipment.object_type]
+        slot = equipment.object_type
+        current = self.equipment[slot]
         if current:
             print(f"{current.name} 已解除装备")
             current.add_to_inventory(self.inventory, 1)
             if current.combo: self.combos.remove(current.combo); print(f"不能再使用组合: {current.combo.name}")
             if current.spell: self.spells.remove(current.spell); print(f"不能再使用技能: {current.spell.name}")
             for stat, value in current.stat_change_list.items():
-                self.stats[stat] -= value; print(f"{stat} -{value}")
+                print(f"{stat} -{value}")
 
-        for stat, value in equipment.stat_change_list.items():
-            self.stats[stat] += value
+        self.stats.set_source(("equipment", slot), equipment.stat_change_list)
 
         self.equipment[equipment.object_type] = equipment.clone(1)
         if equipment.combo and equipment.combo not in self.combos:
@@ -156,8 +164,9 @@ class Player(battler.Battler):
         for slot, eq in self.equipment.items():
             if not eq: continue
             console.print(f"- 已卸下 [cyan]{eq.name}[/cyan]")
+            self.stats.remove_source(("equipment", slot))
             for stat, value in eq.stat_change_list.items():
-                self.stats[stat] -= value; console.print(f"[red]  {stat} -{value}[/red]")
+                console.print(f"[red]  {stat} -{value}[/red]")
             if eq.combo in self.combos: self.combos.remove(eq.combo); console.print(f"  不再可用连招: [red]{eq.combo.name}[/red]")
             if eq.spell in self.spells: self.spells.remove(eq.spell); console.print(f"  不再可用技能: [red]{eq.spell.name}[/red]")
             self.inventory.add_item(eq)
@@ -216,15 +225,15 @@ class Player(battler.Battler):
             else:
                 clear_screen(); print("请输入有效的数字")
 
-    def update_stats_to_aptitudes(self, aptitude):
+    def update_stats_to_aptitudes(self, aptitude=None):
         """
         根据能力值更新玩家属性。
 
-        根据提升的能力类型，更新对应的玩家属性值。
-        不同能力会影响不同的属性组合。
+        按当前全部能力值重新计算属性表中的 "aptitudes" 加成来源，
+        不同能力会影响不同的属性组合，每点能力的加成见 APTITUDE_STATS。
 
         参数:
-            aptitude (str): 要更新的能力类型
+            aptitude (str, optional): 刚提升的能力类型，仅为兼容旧调用保留
 
         映射关系:
             - str(力量): 提升攻击力
@@ -233,12 +242,11 @@ class Player(battler.Battler):
             - wis(智慧): 提升最大魔法值
             - const(体质): 提升最大生命值
         """
-        mapping = {
-            "str": {"atk": 3}, "dex": {"agi": 2, "crit": 1},
-            "int": {"mat": 3}, "wis": {"max_mp": 15}, "const": {"max_hp": 30}
-        }
-        for stat, val in mapping.get(aptitude, {}).items():
-            self.stats[stat] += val
+        bonus = {}
+        for name, points in self.aptitudes.items():
+            for stat, val in APTITUDE_STATS.get(name, {}).items():
+                bonus[stat] = bonus.get(stat, 0) + val * points
+        self.stats.set_source("aptitudes", bonus)
 
     def buy_from_vendor(self, vendor):
         """
@@ -253,12 +261,10 @@ class Player(battler.Battler):
         text.shop_buy(self)
         inv = interface(vendor.inventory)
         inv.show_inventory()
-        while (choice := input("> ")) != "0":
+        while (choice := inv.read_choice()) != "0":
             if choice.isdigit() and (idx := int(choice)) <= len(vendor.inventory.items):
                 item = vendor.inventory.items[idx - 1]
-                item.buy(self)
-                if item.amount <= 0:
-                    vendor.inventory.items.pop(idx - 1)
+                item.buy(self, vendor.inventory)
                 inv.show_inventory()
             else:
                 break
@@ -284,12 +290,12 @@ class Player(battler.Battler):
         if self.stats['hunger'] <= 20:
             console.print(f"警告: 饱食度过低 ({self.stats['hunger']}/{self.stats['max_hunger']})，需要进食!", style="yellow")
         if self.stats['hunger'] <= 0:
-            damage = round(100 * random.uniform(0.75, 1.25))
+            damage = round(100 * rng.stream("event").uniform(0.75, 1.25))
             self.stats["hp"] -= damage
             console.print(f"你因饥饿受到了{damage}点伤害!", style="red")
             if self.stats["hp"] <= 0:
                 console.print("你因饥饿而昏倒了...", style="red")
-                self.alive = False
+                self.die()
 
     def increase_max_hunger(self, amount):
         """
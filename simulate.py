@@ -0,0 +1,256 @@
+"""
+平衡性模拟模块，批量执行无界面战斗并统计胜率。
+
+该模块提供 simulate 入口：给定玩家构筑（职业、等级、装备、技能），
+对 ENEMY_DATA 中的每种敌人、随机遭遇组合以及固定 Boss 编组，
+在多个玩家等级下各执行 N 场无界面战斗，并输出胜率、平均回合数和
+剩余生命值的矩阵（CSV）。任务通过 ProcessPoolExecutor 分发到多个进程，
+每个任务在独立的随机数会话（core.rng）中运行，会话种子只由总种子和任务本身决定，
+因此结果与进程数无关、可复现。
+
+用法示例:
+    python simulate.py --class 战士 --levels 1-10 --equip rusty_sword novice_armor --fights 200 --seed 42
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import player
+import combat
+import enemies
+from core import rng
+from core.turn_order import TURN_MODES
+from ui import null_output
+from data import ALL_SKILLS, equipment_data
+from data.constants import QUALITY_CONFIG
+from mods.give_initial_items import apply_class_bonuses
+
+# 模拟时装备统一使用"普通的"品质，避免品质随机性影响结果
+STANDARD_QUALITY = QUALITY_CONFIG[1][:3]
+
+CLASS_ALIASES = {
+    "warrior": "战士",
+    "rogue": "盗贼",
+    "mage": "法师",
+    "archer": "弓箭手",
+    "paladin": "圣骑士",
+    "necromancer": "死灵法师",
+}
+
+POLICIES = {
+    "attack": combat.AttackPolicy,
+    "skill": combat.SkillPolicy,
+    "auto": combat.AutoModePolicy,
+}
+
+CSV_FIELDS = ["group", "level", "fights", "wins", "win_rate", "avg_rounds", "avg_hp_remaining", "escapes", "timeouts"]
+
+
+@dataclass
+class PlayerBuild:
+    """
+    玩家构筑描述，模拟中每场战斗都会据此重新创建玩家。
+
+    属性:
+        class_name (str): 职业名称，对应 apply_class_bonuses 中的职业
+        equipment (List[str]): 要装备的装备ID列表（equipment_data 的键）
+        spells (List[str]): 额外掌握的技能名称（ALL_SKILLS 的键）
+        policy (str): 玩家行动策略名称，见 POLICIES
+        turn_mode (str): 行动顺序模式，"round" 或 "atb"
+    """
+    class_name: str = "战士"
+    equipment: List[str] = field(default_factory=list)
+    spells: List[str] = field(default_factory=list)
+    policy: str = "skill"
+    turn_mode: str = "round"
+
+
+def build_player(build: PlayerBuild, level: int):
+    """
+    根据构筑和等级创建玩家。
+
+    应用职业加成、升级到指定等级、装备标准品质的装备并学会指定技能。
+
+    参数:
+        build (PlayerBuild): 玩家构筑
+        level (int): 目标等级
+
+    返回:
+        Player: 创建好的玩家对象
+    """
+    p = player.Player("模拟玩家")
+    p.ls.class_name = build.class_name
+    apply_class_bonuses(p)
+    while p.ls.level < level:
+        p.add_exp(p.ls.xp_to_next_level)
+    for equipment_id in build.equipment:
+        equipment = equipment_data[equipment_id].clone(1)
+        equipment.set_quality(STANDARD_QUALITY)
+        p.equip_item(equipment)
+    for spell_name in build.spells:
+        spell = ALL_SKILLS[spell_name]
+        if spell not in p.spells:
+            p.spells.append(spell)
+    p.recover_mp(9999)
+    p.heal(9999)
+    return p
+
+
+def enemy_groups() -> Dict[str, Optional[List[str]]]:
+    """
+    列出参与模拟的所有敌人编组。
+
+    包括 ENEMY_DATA 中的每种单体敌人（跳过分隔行和生命值未配置的条目）、
+    按等级生成的随机遭遇（值为None），以及 BOSS_GROUPS 中的固定 Boss 编组。
+
+    返回:
+        dict: 编组名称到敌人ID列表的映射
+    """
+    with null_output():  # 第一次访问时加载敌人表，加载信息不能混入标准输出中的 CSV
+        groups = {
+            f"enemy:{enemy_id}": [enemy_id]
+            for enemy_id, enemy in enemies.ENEMY_DATA.items()
+            if not enemy_id.startswith("->") and enemy.stats["max_hp"] > 0
+        }
+    groups["random"] = None
+    for key, enemy_ids in enemies.BOSS_GROUPS.items():
+        groups[f"boss:{key}"] = list(enemy_ids)
+    return groups
+
+
+def task_seed(seed: int, group: str, level: int) -> int:
+    """根据总种子和任务内容派生任务种子，与任务的执行顺序和进程无关。"""
+    return random.Random(f"{seed}:{group}:{level}").getrandbits(64)
+
+
+def run_task(task: Tuple[PlayerBuild, str, Optional[List[str]], int, int, int]) -> dict:
+    """
+    执行一个模拟任务：对同一编组和等级连续进行多场战斗。
+
+    参数:
+        task: (构筑, 编组名称, 敌人ID列表, 玩家等级, 战斗场数, 任务种子)
+
+    返回:
+        dict: 该任务的统计结果，字段见 CSV_FIELDS
+    """
+    build, group, enemy_ids, level, fights, seed = task
+    policy = POLICIES[build.policy]()
+
+    pool = enemies.EnemyPool(enemies.ENEMY_DATA)
+    wins = escapes = timeouts = rounds = 0
+    hp_remaining = 0.0
+    with rng.session(seed), null_output():
+        for _ in range(fights):
+            p = build_player(build, level)
+            if enemy_ids is None:
+                enemy_group = enemies.create_enemy_group(level, enemies.DEFAULT_SPAWN_TABLE, pool)
+            else:
+                enemy_group = [pool.acquire(enemy_id) for enemy_id in enemy_ids]
+            result = combat.headless_combat(p, enemy_group, policy, turn_mode=build.turn_mode)
+            pool.release(enemy_group)
+            wins += result.winner == "allies"
+            escapes += result.winner == "escaped"
+            timeouts += result.winner == "timeout"
+            rounds += result.rounds
+            hp_remaining += max(0, result.player_hp) / result.player_max_hp
+
+    return {
+        "group": group,
+        "level": level,
+        "fights": fights,
+        "wins": wins,
+        "win_rate": round(wins / fights, 4),
+        "avg_rounds": round(rounds / fights, 2),
+        "avg_hp_remaining": round(hp_remaining / fights, 4),
+        "escapes": escapes,
+        "timeouts": timeouts,
+    }
+
+
+def simulate(build: PlayerBuild, levels: List[int], fights: int = 100, seed: int = 0, workers: int = None, groups: Dict[str, Optional[List[str]]] = None) -> List[dict]:
+    """
+    运行平衡性模拟。
+
+    将 (编组 × 等级) 拆分为独立任务，并行分发到多个进程执行。
+    每个任务拥有独立派生的随机种子，相同参数下结果完全一致。
+
+    参数:
+        build (PlayerBuild): 玩家构筑
+        levels (List[int]): 要模拟的玩家等级列表
+        fights (int): 每个任务的战斗场数，默认为100
+        seed (int): 总随机种子，默认为0
+        workers (int, optional): 进程数，默认为CPU核心数，为1时在当前进程中执行
+        groups (dict, optional): 敌人编组，默认为 enemy_groups() 的全部编组
+
+    返回:
+        List[dict]: 按编组和等级排列的统计结果
+    """
+    groups = groups if groups is not None else enemy_groups()
+    tasks = [
+        (build, group, enemy_ids, level, fights, task_seed(seed, group, level))
+        for group, enemy_ids in groups.items()
+        for level in levels
+    ]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [run_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def write_csv(rows: List[dict], file) -> None:
+    writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def parse_levels(value: str) -> List[int]:
+    """解析等级参数，支持 "5"、"1-10" 和 "1,3,5" 形式。"""
+    levels = []
+    for part in value.split(","):
+        if "-" in part:
+            low, high = part.split("-", 1)
+            levels.extend(range(int(low), int(high) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量模拟战斗并输出平衡性矩阵")
+    parser.add_argument("--class", dest="class_name", default="战士", help="职业名称或英文别名")
+    parser.add_argument("--levels", default="1-10", help="玩家等级，如 5、1-10、1,3,5")
+    parser.add_argument("--equip", nargs="*", default=[], help="要装备的装备ID")
+    parser.add_argument("--spells", nargs="*", default=[], help="额外掌握的技能名称")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="skill", help="玩家行动策略")
+    parser.add_argument("--turn-mode", choices=TURN_MODES, default="round", help="行动顺序模式")
+    parser.add_argument("--fights", type=int, default=100, help="每个编组每个等级的战斗场数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认为CPU核心数")
+    parser.add_argument("--output", default="balance.csv", help="CSV输出路径，'-' 表示标准输出")
+    args = parser.parse_args(argv)
+
+    build = PlayerBuild(
+        class_name=CLASS_ALIASES.get(args.class_name, args.class_name),
+        equipment=args.equip,
+        spells=args.spells,
+        policy=args.policy,
+        turn_mode=args.turn_mode,
+    )
+    rows = simulate(build, parse_levels(args.levels), args.fights, args.seed, args.workers)
+    if args.output == "-":
+        write_csv(rows, sys.stdout)
+    else:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_csv(rows, f)
+        print(f"已写入 {len(rows)} 行模拟结果到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-import json
 from typing import Dict
 import core.allies as allies
+from tools import content_snapshot
 from skills.skills_types import *
 
 SPELL_CLASS_MAP: Dict[str, type] = {
@@ -40,8 +40,7 @@ def load_skills_from_json(path="data/json_data/skills.json"):
         ValueError: 如果遇到未知的技能类型
         其他异常: 可能在文件读取或JSON解析中出现
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = content_snapshot.read(path)
     defaults = {
         "is_targeted": True,
         "default_target": None,
@@ -1,14 +1,14 @@
 from typing import TYPE_CHECKING, List, Union, Callable
-import random
-from rich.console import Console
+from ui import get_console
 from core.skill_base import Spell, Combo
+from core import rng
 
 if TYPE_CHECKING:
     from core.battler import Battler
 
 from skills import BuffDebuff, PoisonEffect
 
-console = Console()
+console = get_console()
 
 
 # --- 工具函数 ---
@@ -26,7 +26,7 @@ def apply_damage(target: "Battler", amount: float):
     返回:
         int: 实际造成的伤害值
     """
-    dmg = round(amount * random.uniform(1.0, 1.2))
+    dmg = round(amount * rng.stream("combat").uniform(1.0, 1.2))
     target.take_dmg(dmg)
     return dmg
 
@@ -151,7 +151,7 @@ class RecoverySpell(Spell):
             - 恢复目标的HP或MP
         """
         if not self.check_mp(caster): return
-        recover = round((self.power + caster.stats["mat"] * 2 + caster.stats["luk"]) * random.uniform(1.0, 1.2))
+        recover = round((self.power + caster.stats["mat"] * 2 + caster.stats["luk"]) * rng.stream("combat").uniform(1.0, 1.2))
         heal_target(target, self.stat, recover)
 
 
@@ -252,10 +252,12 @@ class SummonSpell(Spell):
         副作用:
             - 消耗施法者的MP
             - 向友方队伍添加新的战斗单位
+            - 施法者广播 "summoned" 事件，通知回合调度器
         """
         if self.check_mp(caster):
             summoned = self.summoning()
             allies.append(summoned)
+            caster.emit("summoned", summoned)
             console.print(f"你召唤了 {summoned.name}", style="green")
 
 
@@ -308,13 +310,13 @@ class AdvancedDamageSpell(Spell):
         base_dmg = self.power + (caster.stats["mat"] * 1.7 - target.stats["mdf"] + caster.stats["luk"])
         dmg = apply_damage(target, base_dmg)
 
-        if self.effect_type == "stun" and random.random() < 0.4:
+        if self.effect_type == "stun" and rng.stream("combat").random() < 0.4:
             if not any(b.effect_type == "stun" for b in target.buffs_and_debuffs):
                 BuffDebuff("眩晕", target, "agi", -0.8, 2, "stun").activate()
-        elif self.effect_type == "poison" and random.random() < 0.7:
+        elif self.effect_type == "poison" and rng.stream("combat").random() < 0.7:
             if not any(b.effect_type == "poison" for b in target.buffs_and_debuffs):
                 PoisonEffect("中毒", target, "hp", -int(dmg * 0.12), 5).activate()
-        elif self.effect_type == "burn" and random.random() < 0.6:
+        elif self.effect_type == "burn" and rng.stream("combat").random() < 0.6:
             if not any(b.effect_type == "burn" for b in target.buffs_and_debuffs):
                 PoisonEffect("燃烧", target, "hp", -int(dmg * 0.3), 3).activate()
 
@@ -359,7 +361,7 @@ class ArcaneBarrage(Spell):
             Exception: 如果施法者魔法值不足，技能不会生效。
         """
         if not self.check_mp(caster): return
-        hits = random.randint(self.min_hits, self.max_hits)
+        hits = rng.stream("combat").randint(self.min_hits, self.max_hits)
         console.print(f"{caster.name} 对 {target.name} 发射了 {hits} 枚奥术飞弹!", style="blue")
         for _ in range(hits):
             caster.normal_attack(target, gain_cp=False)
@@ -635,7 +637,7 @@ class StunCombo(Combo):
         """
         if self.check_cp(caster):
             caster.normal_attack(target, gain_cp=False)
-            if random.random() < self.stun_chance:
+            if rng.stream("combat").random() < self.stun_chance:
                 print(f"{caster.name} 眩晕了 {target.name}!")
                 if not any(b.effect_type == "stun" for b in target.buffs_and_debuffs):
                     BuffDebuff("眩晕", target, "agi", -0.8, 2, "stun").activate()
\ No newline at end of file
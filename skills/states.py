@@ -1,10 +1,12 @@
 from typing import TYPE_CHECKING
-from rich.console import Console
+
+from ui import get_console
+from core import combat_log
 
 if TYPE_CHECKING:
     from core.battler import Battler
 
-console = Console()
+console = get_console()
 
 class BuffDebuff:
     """
@@ -21,7 +23,12 @@ class BuffDebuff:
         max_turns (int): 初始效果持续回合数
         effect_type: 效果类型标识
         difference (int): 属性实际变化的数值
+        wheel (EffectWheel | None): 战斗中调度该效果的时间轮，见 core.effect_wheel
+        expires (int): 由时间轮调度时的到期回合
+        ticks (bool): 是否每回合结算持续伤害
     """
+    ticks = False
+
     def __init__(self, name, target: "Battler", stat, amount, turns, effect_type=None):
         """
         初始化增益/减益状态实例。
@@ -40,6 +47,8 @@ class BuffDebuff:
         self.target = target
         self.stat = stat
         self.amount = amount
+        self.wheel = None
+        self.expires = 0
         self.turns = self.max_turns = turns
         self.effect_type = effect_type
         self.difference = 0
@@ -53,14 +62,34 @@ class BuffDebuff:
         副作用:
             - 改变目标的指定属性
             - 将此状态添加到目标的状态列表
+            - 广播 "effect_added" 事件，改变敏捷时还会广播 "agi_changed" 事件
             - 输出状态应用信息
         """
         self.difference = int(self.target.stats[self.stat] * self.amount)
-        self.target.stats[self.stat] += self.difference
+        self.target.stats.set_source(self, {self.stat: self.difference})
         self.target.buffs_and_debuffs.append(self)
+        combat_log.record("buff", tg=self.target, name=self.name, stat=self.stat, n=self.difference, turns=self.turns)
+        self.target.emit("effect_added", self)
+        if self.stat == "agi" and self.difference:
+            self.target.emit("agi_changed")
         state = "增强" if self.amount > 0 else "削弱"
         console.print(f"{self.target.name} 的 {self.stat} 被 {state}了 {abs(self.amount*100):.0f}% ，持续 {self.turns} 回合", style="green")
 
+    @property
+    def turns(self) -> int:
+        """剩余回合数，由时间轮调度时根据到期回合计算。"""
+        if self.wheel is None:
+            return self._turns
+        return self.expires - self.wheel.now
+
+    @turns.setter
+    def turns(self, value: int) -> None:
+        if self.wheel is None:
+            self._turns = value
+        else:
+            self.expires = self.wheel.now + value
+            self.wheel.reschedule(self)
+
     def restart(self):
         """
         重置状态持续时间。
@@ -74,6 +103,7 @@ class BuffDebuff:
         检查并更新状态持续时间。
 
         减少剩余回合数，如果持续时间结束则移除状态效果。
+        战斗中的效果由时间轮（core.effect_wheel）负责到期，不需要调用此方法。
 
         副作用:
             - 减少状态剩余回合数
@@ -87,15 +117,20 @@ class BuffDebuff:
         """
         移除状态效果。
 
-        还原目标属性的变化，并从目标的状态列表中移除此状态。
+        移除此状态提供的属性加成，并从目标的状态列表中移除此状态。
 
         副作用:
             - 还原目标的属性值
             - 从目标的状态列表中移除此状态
+            - 广播 "effect_removed" 事件，还原敏捷时还会广播 "agi_changed" 事件
             - 输出状态结束信息
         """
-        self.target.stats[self.stat] -= self.difference
+        self.target.stats.remove_source(self)
         self.target.buffs_and_debuffs.remove(self)
+        combat_log.record("buff_end", tg=self.target, name=self.name)
+        self.target.emit("effect_removed", self)
+        if self.stat == "agi" and self.difference:
+            self.target.emit("agi_changed")
         console.print(f"[red]{self.name}[/red] 的效果已结束")
 
 
@@ -109,6 +144,8 @@ class PoisonEffect(BuffDebuff):
     属性:
         damage (int): 每回合造成的伤害值
     """
+    ticks = True
+
     def __init__(self, name, target: "Battler", stat, damage_per_turn, turns, effect_type="poison"):
         """
         初始化毒素效果实例。
@@ -134,9 +171,12 @@ class PoisonEffect(BuffDebuff):
 
         副作用:
             - 将此状态添加到目标的状态列表
+            - 广播 "effect_added" 事件
             - 输出状态应用信息
         """
         self.target.buffs_and_debuffs.append(self)
+        combat_log.record("buff", tg=self.target, name=self.name, stat=self.stat, n=self.damage, turns=self.turns)
+        self.target.emit("effect_added", self)
         console.print(f"{self.target.name} 中了 {self.name}，每回合损失 {abs(self.damage)} HP ，持续 {self.turns} 回合", style="purple")
 
     def check_turns(self):
@@ -152,9 +192,20 @@ class PoisonEffect(BuffDebuff):
             - 减少状态剩余回合数
             - 可能移除状态效果
         """
+        self.tick()
+        super().check_turns()
+
+    def tick(self):
+        """
+        结算一回合的持续伤害，如果目标生命值降至0则杀死目标。
+
+        副作用:
+            - 减少目标的生命值
+            - 可能改变目标的存活状态
+        """
         console.print(f"{self.target.name} 因 {self.name} 受到 {abs(self.damage)} 点伤害", style="red")
         self.target.stats["hp"] += self.damage
+        combat_log.record("tick", tg=self.target, name=self.name, n=self.damage, hp=self.target.stats["hp"])
         if self.target.stats["hp"] <= 0:
-            self.target.alive = False
             console.print(f"{self.target.name} 被 {self.name} 杀死了")
-        super().check_turns()
\ No newline at end of file
+            self.target.die()
\ No newline at end of file
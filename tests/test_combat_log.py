@@ -0,0 +1,31 @@
+"""战斗记录重放与原来的战斗逐条一致。"""
+
+import pytest
+
+from core import combat_log
+from mods.benchmarks.combat_replay import record_fights
+
+
+@pytest.fixture(scope="module")
+def battles(tmp_path_factory):
+    path = tmp_path_factory.mktemp("combat") / "fights.jsonl"
+    record_fights(str(path), 40, seed=0)
+    return list(combat_log.read_log(str(path)))
+
+
+def test_log_has_every_fight(battles):
+    assert len(battles) == 40
+    assert all(battles)
+
+
+def test_replay_matches_record(battles):
+    for battle in battles:
+        combat_log.replay_combat(battle)
+
+
+def test_tampered_record_is_reported(battles):
+    battle = [dict(record) for record in battles[0]]
+    hit = next(record for record in battle if record["t"] == "dmg")
+    hit["n"] += 1
+    with pytest.raises(combat_log.ReplayMismatch):
+        combat_log.replay_combat(battle)
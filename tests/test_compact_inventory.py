@@ -0,0 +1,89 @@
+"""CompactInventory 与 Inventory 的内容、合计值、筛选和整理结果相同。"""
+
+import random
+
+import pytest
+
+from bag import CompactInventory, Inventory
+from mods.benchmarks.compact_inventory import fill, generated_rolls, remove
+from others.equipment import Equipment
+from others.item import Item
+from ui import null_output
+
+
+def describe(inventory):
+    return [(type(item).__name__, item.name, item.amount, item.individual_value,
+             item.stat_change_list if isinstance(item, Equipment) else None) for item in inventory.items]
+
+
+@pytest.fixture(scope="module")
+def rolls():
+    return generated_rolls(3_000, seed=0)
+
+
+def test_matches_list_backend(rolls):
+    removals = [item.name for item in random.Random(0).sample(rolls, len(rolls) // 5)]
+    results = []
+    for cls in (Inventory, CompactInventory):
+        inventory = fill(cls(), rolls)
+        weapons = [item.name for item in inventory.get_items_by_type("weapon")]
+        worth = inventory.total_worth
+        remove(inventory, removals)
+        with null_output():
+            inventory.sort_items()
+        results.append((worth, weapons, inventory.total_worth, inventory.get_total_item_count(), describe(inventory)))
+    assert results[0] == results[1]
+
+
+def test_random_operations_match_list_backend(rolls):
+    rnd = random.Random(1)
+    pool = rolls[:200]
+    reference, compact = Inventory(), CompactInventory()
+    for step in range(3_000):
+        item = rnd.choice(pool)
+        match rnd.randrange(6):
+            case 0 | 1:
+                amount = rnd.randint(1, 3)
+                reference.add_item(item, amount)
+                compact.add_item(item, amount)
+            case 2:
+                amount = rnd.randint(1, 3)
+                assert reference.remove_items_by_name(item.name, amount) == compact.remove_items_by_name(item.name, amount)
+            case 3:
+                assert reference.discard(item) == compact.discard(item)
+            case 4:
+                held, copy = reference.get_item_by_name(item.name), compact.get_item_by_name(item.name)
+                if held is not None:
+                    for target, inventory in ((held, reference), (copy, compact)):
+                        target.amount -= 1
+                        inventory.update_amount(target, target.amount + 1)
+            case 5:
+                if step % 10 == 0:
+                    with null_output():
+                        reference.sort_items()
+                        compact.sort_items()
+        assert reference.count_item_by_name(item.name) == compact.count_item_by_name(item.name)
+        assert (reference.total_worth, reference.get_total_item_count()) == (compact.total_worth, compact.get_total_item_count())
+    assert describe(reference) == describe(compact)
+    assert [i.name for i in reference.get_equipments()] == [i.name for i in compact.get_equipments()]
+
+
+def test_filter_view_follows_inventory():
+    inventory = CompactInventory()
+    food = [Item(f"食物{i}", "", 1, 1, "food") for i in range(3)]
+    view = inventory.get_items_by_type("food")
+    assert len(view) == 0 and not view
+    for item in food:
+        inventory.add_item(item)
+    assert [item.name for item in view] == ["食物0", "食物1", "食物2"]
+    inventory.discard(food[1])
+    assert [item.name for item in view] == ["食物0", "食物2"]
+    assert view[-1].name == "食物2" and [item.name for item in view[:1]] == ["食物0"]
+
+
+def test_items_are_copies():
+    inventory = CompactInventory()
+    inventory.add_item(Item("凝胶", "", 3, 1, "material"))
+    copy = inventory.get_item_by_name("凝胶")
+    copy.amount = 0
+    assert inventory.count_item_by_name("凝胶") == 3
@@ -0,0 +1,32 @@
+"""数据快照的内容与直接解析相同，源文件修改后自动重新编译。"""
+
+import os
+import shutil
+
+from tools import content_snapshot as snapshot
+
+
+def test_snapshot_matches_parsed_sources(tmp_path):
+    path = str(tmp_path / "content.snapshot.json")
+    expected = snapshot.build(path)
+    assert snapshot.load(path) == expected
+    assert expected == snapshot.compile_sources(snapshot._read_sources(snapshot.source_files()))
+
+
+def test_changed_source_rebuilds_snapshot(tmp_path):
+    root = str(tmp_path / "data")
+    shutil.copytree(snapshot.SOURCE_DIR, root, ignore=shutil.ignore_patterns("__pycache__", "*.py"))
+    path = str(tmp_path / "copy.snapshot.json")
+    snapshot.build(path, root)
+    dialogue = os.path.join(root, "toml_data", "dialogue.toml")
+    with open(dialogue, "a", encoding="utf-8") as f:
+        f.write('\n[test_probe]\ntext = "probe"\n')
+    contents = snapshot.load(path, root)
+    assert contents[snapshot._normalize(dialogue)]["test_probe"] == {"text": "probe"}
+
+
+def test_unreadable_snapshot_is_rebuilt(tmp_path):
+    path = tmp_path / "content.snapshot.json"
+    expected = snapshot.build(str(path))
+    path.write_text("not json", encoding="utf-8")
+    assert snapshot.load(str(path)) == expected
@@ -0,0 +1,31 @@
+"""编译后的 CSV 行模式与逐行手工解析结果相同，坏行报告文件和行号。"""
+
+import csv
+import io
+
+import pytest
+
+from mods.benchmarks.csv_schema import catalog_text, manual_parse, schema_parse
+from tools.csv_schema import CsvRowError
+
+
+def test_schema_matches_manual_parsing():
+    text = catalog_text(500)
+    rows = schema_parse(text)
+    assert manual_parse(text) == [(r.name, r.individual_value, r.stat_change_list, r.level, r.combo, r.spell)
+                                  for r in rows]
+
+
+def test_bad_row_reports_file_line_and_column():
+    rows = list(csv.reader(io.StringIO(catalog_text(3))))
+    rows[2][rows[0].index("level")] = "三"
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    with pytest.raises(CsvRowError) as error:
+        schema_parse(buffer.getvalue())
+    assert (error.value.path, error.value.line, error.value.column, error.value.value) == ("catalog.csv", 3, "level", "三")
+
+
+def test_enemy_level_is_int():
+    from enemies import ENEMY_DATA
+    assert all(isinstance(enemy.level, int) for enemy in ENEMY_DATA.values())
@@ -0,0 +1,105 @@
+"""core.damage_kernel 与标量战斗公式的一致性。"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+import numpy as np
+import pytest
+
+import player  # noqa: F401  先导入 player 以避免 combat 的循环导入
+from combat import BattleCalculator
+from core import damage_kernel as kernel
+from core import rng
+from mods.benchmarks.damage_kernel import make_battler, random_stats
+from ui import null_output
+
+SAMPLES = 20_000
+
+
+class ScriptedRandom:
+    """
+    按预先生成的随机数应答的随机流替身，让标量路径与批量路径消耗同一组随机数。
+
+    属性:
+        draws (AttackDraws): 批量路径使用的随机数
+        index (int): 当前结算的攻击序号
+    """
+    def __init__(self, draws) -> None:
+        self.draws = draws
+        self.index = 0
+        self._cum_weights = list(accumulate(kernel.CRIT_RATE_WEIGHTS))
+
+    def randint(self, a, b):
+        # check_miss 掷 0~100，check_critical 掷 1~100
+        roll = self.draws.miss_roll if a == 0 else self.draws.crit_roll
+        return int(roll[self.index])
+
+    def uniform(self, a, b):
+        u = self.draws.taken_u if (a, b) == (0.9, 1.1) else self.draws.spread_u
+        return a + (b - a) * float(u[self.index])
+
+    def choices(self, population, weights):
+        total = self._cum_weights[-1]
+        return [population[bisect_right(self._cum_weights, float(self.draws.crit_rate_u[self.index]) * total)]]
+
+
+def scalar_attacks(attackers, defenders, scripted=None):
+    """
+    逐次调用 Battler.normal_attack 结算攻击。
+
+    参数:
+        scripted (ScriptedRandom, optional): 提供时按其随机数结算，并额外记录暴击判定
+
+    返回:
+        tuple: (伤害数组, 实际扣血数组, 暴击数组, 抑制数组)
+    """
+    n = len(attackers)
+    damage, taken = np.zeros(n, np.int64), np.zeros(n, np.int64)
+    crit, suppressed = np.zeros(n, bool), np.zeros(n, bool)
+    with null_output():
+        for i in range(n):
+            attacker, defender = make_battler("A", attackers[i]), make_battler("D", defenders[i])
+            if scripted is not None:
+                scripted.index = i
+                if attacker.stats["mat"] <= attacker.stats["atk"] and not BattleCalculator.check_miss(attacker, defender):
+                    crit[i], suppressed[i] = BattleCalculator.check_critical(attacker, defender)
+            damage[i] = attacker.normal_attack(defender)
+            taken[i] = defender.damage_taken
+    return damage, taken, crit, suppressed
+
+
+def z_score(a, b) -> float:
+    """两组样本均值之差的 z 值。"""
+    spread = np.sqrt(a.var() / len(a) + b.var() / len(b))
+    if spread == 0:
+        return 0.0 if a.mean() == b.mean() else float("inf")
+    return float(abs(a.mean() - b.mean()) / spread)
+
+
+@pytest.fixture(scope="module")
+def stats():
+    generator = np.random.default_rng(0)
+    return random_stats(SAMPLES, generator), random_stats(SAMPLES, generator)
+
+
+def test_same_draws_give_identical_outcomes(stats):
+    attackers, defenders = stats
+    draws = kernel.draw(SAMPLES, np.random.default_rng(1))
+    outcome = kernel.resolve_attacks(attackers, defenders, draws)
+    scripted = ScriptedRandom(draws)
+    with rng.use_stream("combat", scripted):
+        damage, taken, crit, suppressed = scalar_attacks(attackers, defenders, scripted)
+    np.testing.assert_array_equal(damage, outcome.damage)
+    np.testing.assert_array_equal(taken, outcome.taken)
+    np.testing.assert_array_equal(crit, outcome.crit)
+    np.testing.assert_array_equal(suppressed, outcome.suppressed)
+
+
+def test_independent_draws_give_same_distribution(stats):
+    attackers, defenders = stats
+    with rng.session(0):
+        damage, taken, _, _ = scalar_attacks(attackers, defenders)
+    outcome = kernel.resolve_attacks(attackers, defenders, rng=np.random.default_rng(1))
+    assert z_score((taken == 0).astype(float), outcome.miss.astype(float)) < 4
+    assert z_score(damage.astype(float), outcome.damage.astype(float)) < 4
+    assert z_score(taken.astype(float), outcome.taken.astype(float)) < 4
@@ -0,0 +1,23 @@
+"""原型克隆与改造前的深复制克隆生成相同的敌人，克隆不改变原型。"""
+
+from mods.benchmarks.enemy_clone import clone_plan, legacy_clone, quiet_debug
+
+
+def describe(enemy):
+    return (enemy.name, dict(enemy.stats), enemy.xp_reward, enemy.gold_reward, enemy.level,
+            [spell.name for spell in enemy.spells], [(item.name, item.amount) for item in enemy.drop_items])
+
+
+def test_clone_matches_deepcopy_clone():
+    with quiet_debug():
+        for prototype, variant in clone_plan(500):
+            assert describe(prototype.clone(variant)) == describe(legacy_clone(prototype, variant))
+
+
+def test_damage_does_not_touch_prototype():
+    prototype, _ = clone_plan(1)[0]
+    before = describe(prototype)
+    enemy = prototype.clone()
+    enemy.stats["hp"] -= 1
+    enemy.drop_items.clear()
+    assert describe(prototype) == before
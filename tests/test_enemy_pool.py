@@ -0,0 +1,25 @@
+"""使用对象池与每场战斗都克隆新敌人的战斗结果相同，池中的敌人回收后恢复原状。"""
+
+from enemies import ENEMY_DATA, EnemyPool
+from mods.benchmarks.enemy_pool import encounters
+
+
+def test_pooled_encounters_match_fresh_clones():
+    pooled = EnemyPool(ENEMY_DATA)
+    pooled_outcomes, _, _, _ = encounters(pooled, 60, seed=0)
+    fresh_outcomes, _, _, _ = encounters(EnemyPool(ENEMY_DATA, max_free=0), 60, seed=0)
+    assert pooled_outcomes == fresh_outcomes
+    assert pooled.hits > 0
+
+
+def test_released_enemy_is_reset():
+    pool = EnemyPool(ENEMY_DATA)
+    enemy_id = next(iter(ENEMY_DATA))
+    enemy = pool.acquire(enemy_id, "none")
+    expected = dict(enemy.stats)
+    enemy.stats["hp"] = 0
+    enemy.alive = False
+    pool.release([enemy])
+    reused = pool.acquire(enemy_id, "none")
+    assert reused is enemy
+    assert dict(reused.stats) == expected and reused.alive
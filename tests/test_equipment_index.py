@@ -0,0 +1,30 @@
+"""装备目录的倒排索引与逐件筛选结果相同（包括顺序）。"""
+
+import pytest
+
+from mods.benchmarks.equipment_index import QUERIES, generated_catalog, scan
+from others.catalog import EquipmentCatalog
+
+
+@pytest.fixture(scope="module")
+def catalog_items():
+    return generated_catalog(20_000, seed=0)
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=str)
+def test_query_matches_scan(catalog_items, query):
+    catalog = EquipmentCatalog(catalog_items)
+    expected = scan(catalog_items, **query)
+    actual = catalog.query(**query)
+    assert len(actual) == len(expected)
+    assert all(a is e for a, e in zip(actual, expected))
+    assert catalog.count(**query) == len(expected)
+
+
+def test_sparse_result_in_large_catalog(catalog_items):
+    """结果很少时走逐个取最低位的路径。"""
+    odd = catalog_items[0]
+    items = [item for item in catalog_items if item.object_type != odd.object_type] + [odd]
+    catalog = EquipmentCatalog(items)
+    assert catalog.query(object_type=odd.object_type) == [odd]
+    assert catalog.query(object_type=odd.object_type, level=odd.level) == [odd]
@@ -0,0 +1,62 @@
+"""背包累计的总数量、总价值和按类型/类的分组始终与逐项重新计算的结果一致。"""
+
+import random
+
+import pytest
+
+from bag import CompactInventory, Inventory
+from mods.benchmarks.inventory_aggregates import TYPES, mixed_items
+from others.equipment import Equipment
+from others.item import Item
+from ui import null_output
+
+
+def recomputed(inventory) -> tuple:
+    listed = list(inventory.items)
+    return (
+        sum(item.amount * item.individual_value for item in listed),
+        sum(item.amount for item in listed),
+        {t: [item.name for item in listed if item.object_type == t] for t in TYPES + ["weapon"]},
+        [item.name for item in listed if isinstance(item, Equipment)],
+        [item.name for item in listed if isinstance(item, Item)],
+    )
+
+
+def aggregated(inventory) -> tuple:
+    return (
+        inventory.total_worth,
+        inventory.get_total_item_count(),
+        {t: [item.name for item in inventory.get_items_by_type(t)] for t in TYPES + ["weapon"]},
+        [item.name for item in inventory.get_equipments()],
+        [item.name for item in inventory.get_items_by_class(Item)],
+    )
+
+
+@pytest.mark.parametrize("cls", [Inventory, CompactInventory])
+def test_aggregates_follow_random_changes(cls):
+    rnd = random.Random(0)
+    items = mixed_items(1_000, rnd)
+    inventory = cls()
+    for item in items:
+        inventory.add_item(item, rnd.randint(1, 5))
+    assert aggregated(inventory) == recomputed(inventory)
+    for step in range(40):
+        for _ in range(50):
+            item = rnd.choice(items)
+            match rnd.randrange(4):
+                case 0:
+                    inventory.add_item(item, rnd.randint(1, 3))
+                case 1:
+                    inventory.remove_item(item, rnd.randint(1, 3))
+                case 2:
+                    inventory.remove_items_by_name(item.name, rnd.randint(1, 3))
+                case 3:
+                    held = inventory.get_item_by_name(item.name)
+                    if held is not None:
+                        previous = held.amount
+                        held.amount -= rnd.randint(0, previous)
+                        inventory.update_amount(held, previous)
+        if step % 10 == 9:
+            with null_output():
+                inventory.sort_items()
+        assert aggregated(inventory) == recomputed(inventory)
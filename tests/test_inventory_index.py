@@ -0,0 +1,22 @@
+"""名称索引的背包与改造前逐个查找的背包结果相同。"""
+
+from bag import Inventory
+from mods.benchmarks.inventory_index import LegacyInventory, hoarder_session
+from others.item import Item
+
+
+def test_index_matches_linear_scan():
+    session = hoarder_session(500, seed=0)
+    assert session(Inventory()) == session(LegacyInventory())
+
+
+def test_removed_stack_keeps_other_stacks_in_order():
+    inventory = Inventory()
+    items = [Item(f"物品{i}", "", 1, 1, "material") for i in range(4)]
+    for item in items:
+        inventory.add_item(item, 2)
+    assert inventory.remove_items_by_name("物品1", 2)
+    assert not inventory.remove_items_by_name("物品2", 3)
+    inventory.add_item(items[1], 1)
+    assert [(item.name, item.amount) for item in inventory.items] == [("物品0", 2), ("物品2", 2), ("物品3", 2), ("物品1", 1)]
+    assert inventory.count_item_by_name("物品1") == 1
@@ -0,0 +1,44 @@
+"""背包表格只显示一页，物品改变后缓存的行随之更新。"""
+
+import pytest
+
+from bag import CompactInventory, Inventory
+from bag.inventory import PAGE_SIZE
+from mods.benchmarks.inventory_paging import filled, material_items
+
+SAMPLES = 500
+
+
+def page_rows(inventory, page):
+    table = inventory.get_formatted_inventory_table(page)[0].renderable
+    return list(zip(*(column._cells for column in table.columns)))
+
+
+@pytest.fixture(scope="module")
+def items():
+    return material_items(SAMPLES, seed=0)
+
+
+@pytest.mark.parametrize("cls", [Inventory, CompactInventory])
+def test_last_page_and_out_of_range_page(cls, items):
+    inventory = filled(cls, items)
+    last = inventory.page_count() - 1
+    expected = [(str(i), item.name, "material", f"x{item.amount}", f"{item.individual_value}G")
+                for i, item in enumerate(items[last * PAGE_SIZE:], last * PAGE_SIZE + 1)]
+    assert page_rows(inventory, last) == expected
+    assert page_rows(inventory, last + 5) == expected
+
+
+@pytest.mark.parametrize("cls", [Inventory, CompactInventory])
+def test_cached_rows_follow_changes(cls, items):
+    inventory = filled(cls, items)
+    page_rows(inventory, 0)
+    expected_amount = inventory.count_item_by_name(items[0].name) + 7
+    inventory.add_item(items[0], 7)
+    inventory.discard(items[1])
+    rows = page_rows(inventory, 0)
+    assert rows[0][3] == f"x{expected_amount}" and rows[1][1] == items[2].name
+    outside = inventory.get_item_by_name(items[0].name)     # 库存外修改数量后调用 update_amount
+    outside.amount -= 2
+    inventory.update_amount(outside, outside.amount + 2)
+    assert page_rows(inventory, 0)[0][3] == f"x{expected_amount - 2}"
@@ -0,0 +1,54 @@
+"""库存事务与逐件操作结果相同，失败的事务不留下任何改变。"""
+
+import pytest
+
+from bag import Inventory, InsufficientItemsError
+from mods.benchmarks.inventory_transaction import batched, loot_drops, one_by_one
+from others.item import Item
+
+
+def contents(inventory):
+    return [(item.name, item.amount) for item in inventory.items], inventory.total_worth, inventory.get_total_item_count()
+
+
+@pytest.fixture
+def bag():
+    return batched(loot_drops(2_000, seed=0))
+
+
+def test_batched_loot_matches_one_by_one():
+    drops = loot_drops(2_000, seed=0)
+    assert contents(batched(drops)) == contents(one_by_one(drops))
+
+
+def test_short_recipe_changes_nothing(bag):
+    before = contents(bag)
+    first, second = bag.items[0], bag.items[1]
+    with pytest.raises(InsufficientItemsError):
+        with bag.transaction() as recipe:
+            recipe.remove(first.name, first.amount)
+            recipe.add(Item("测试成品", "", 1, 100, "material"))
+            recipe.remove(second.name, second.amount + 1)
+    assert contents(bag) == before
+
+
+def test_failed_trade_changes_neither_inventory(bag):
+    before = contents(bag)
+    ware = Item("测试货物", "", 1, 10, "material")
+    shop = Inventory()
+    shop.add_item(ware, 1)
+    shop_before = contents(shop)
+    with pytest.raises(InsufficientItemsError):
+        with shop.transaction() as sold, bag.transaction() as bought:
+            sold.remove(ware.name, 1)
+            bought.add(ware, 1)
+            bought.remove("不存在的物品", 1)
+    assert contents(shop) == shop_before and contents(bag) == before
+
+
+def test_removals_count_earlier_removals_in_same_transaction(bag):
+    item = bag.items[0]
+    with pytest.raises(InsufficientItemsError):
+        with bag.transaction() as tx:
+            tx.remove(item.name, item.amount)
+            tx.remove(item.name, 1)
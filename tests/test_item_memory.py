@@ -0,0 +1,18 @@
+"""享元装备与改造前的装备布局属性相同。"""
+
+from mods.benchmarks.item_memory import LegacyEquipment, flyweight_restock, restock_plan
+
+
+def test_flyweight_matches_legacy_layout():
+    plan = restock_plan(2_000, seed=0)
+    for (template, quality_data), item in zip(plan, flyweight_restock(plan)):
+        legacy = LegacyEquipment(template, quality_data)
+        assert (legacy.name, legacy.individual_value, legacy.stat_change_list, legacy.tags, legacy.level, legacy.description) \
+            == (item.name, item.individual_value, item.stat_change_list, list(item.tags), item.level, item.description)
+
+
+def test_clones_share_definition_and_have_no_dict():
+    (template, quality_data), = restock_plan(1, seed=0)
+    a, b = flyweight_restock([(template, quality_data)] * 2)
+    assert a.definition is b.definition
+    assert not hasattr(a, "__dict__")
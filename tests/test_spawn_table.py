@@ -0,0 +1,28 @@
+"""刷怪表与改造前的逐次筛选消耗相同的随机数、生成相同的敌人，带权重抽样频率与权重相符。"""
+
+import math
+import random
+
+from core.spawn_table import SpawnTable
+from data import ENEMY_QUANTITY_FOR_LEVEL, POSSIBLE_ENEMIES
+from mods.benchmarks.spawn_table import encounter_levels, legacy_encounters, table_encounters
+
+
+def test_equal_weights_match_legacy_sequence():
+    levels = encounter_levels(5_000)
+    table = SpawnTable(POSSIBLE_ENEMIES, ENEMY_QUANTITY_FOR_LEVEL)
+    assert table_encounters(table, levels, random.Random(0)) == legacy_encounters(levels, random.Random(0))
+
+
+def test_weighted_sampling_follows_weights():
+    samples = 50_000
+    weights = {"slime": 1, "imp": 2, "golem": 3, "skeleton": 4, "bandit": 10}
+    band = SpawnTable(POSSIBLE_ENEMIES, {}, weights=weights).band(2)
+    rnd = random.Random(0)
+    counts = dict.fromkeys(band.enemy_ids, 0)
+    for _ in range(samples):
+        counts[band.sample(rnd)] += 1
+    total = sum(weights.get(enemy_id, 1) for enemy_id in band.enemy_ids)
+    for enemy_id, count in counts.items():
+        p = weights.get(enemy_id, 1) / total
+        assert abs(count - samples * p) < 5 * math.sqrt(samples * p * (1 - p)), enemy_id
@@ -0,0 +1,34 @@
+"""StatBlock 属性表与改造前的字典属性表取值相同，导出的矩阵与逐项读取相同。"""
+
+import numpy as np
+
+from core.damage_kernel import STAT_COLUMNS
+from core.stats import StatBlock, stat_matrix
+from mods.benchmarks.stat_block import block_clones, enemy_stats, legacy_clones
+
+
+def test_clones_match_dict_sheets():
+    plan = enemy_stats(500)
+    legacy = legacy_clones([dict(stats) for stats in plan])
+    assert all(old == dict(new) for (old, _), new in zip(legacy, block_clones(plan)))
+
+
+def test_shared_block_copies_on_write():
+    stats = enemy_stats(1)[0]
+    before = dict(stats)
+    sheet = block_clones([stats])[0]
+    assert dict(stats) == before
+    assert sheet["hp"] == before["hp"] - 1
+
+
+def test_copy_is_independent():
+    block = StatBlock({"hp": 10, "atk": 3})
+    copy = StatBlock(block)
+    copy["hp"] = 1
+    assert block["hp"] == 10
+
+
+def test_stat_matrix_matches_item_reads():
+    sheets = block_clones(enemy_stats(200))
+    expected = np.array([[sheet.get(col, 0) for col in STAT_COLUMNS] for sheet in sheets], dtype=np.float64)
+    np.testing.assert_array_equal(stat_matrix(sheets, STAT_COLUMNS).astype(np.float64), expected)
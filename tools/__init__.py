@@ -1,3 +1,4 @@
 from .load_data_from_file import load_toml_data
 from .load_data_from_file import load_ascii_art_library
 from .load_data_from_file import load_jewel_from_csv, load_food_from_csv
+from .lazy import LazyTable, lazy_attributes
@@ -0,0 +1,232 @@
+"""
+数据快照模块，把 data/ 下的全部数据文件的解析结果保存为一个 JSON 快照。
+
+游戏每次启动都要重新解析 CSV、JSON、TOML 和 ASCII 艺术文本。
+本模块在第一次读取数据文件时检查快照：快照以全部源文件内容的哈希为键，
+哈希一致时读取一个 JSON 文件即可得到全部解析结果；任何源文件被修改、增加或删除后，
+哈希不再一致，快照会被自动重新编译。
+
+快照中保存的是各文件的解析结果，而不是游戏对象:
+    .csv   {"columns": 表头, "rows": 各行单元格列表, "lines": 各行的起始行号}，
+           按行类型解析见 tools.csv_schema
+    .json  json.load 的结果
+    .toml  toml.load 的结果
+    .txt   文件文本
+游戏对象仍由各加载函数创建，加载时的随机判定（如装备品质）不受快照影响。
+这些结果都是列表、字典、字符串和数字，快照以 JSON 保存，读取快照不会执行任何代码，
+即使缓存目录中的文件过期或被替换，最多只会导致重新编译。
+
+快照写入 .cache/content.snapshot.json（已加入 .gitignore），无法写入时只在内存中使用。
+也可以手动编译:
+    python -m tools.content_snapshot
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional
+
+import toml
+
+from mods.dev_tools import debug_print
+
+SOURCE_DIR = "data"
+SNAPSHOT_PATH = os.path.join(".cache", "content.snapshot.json")
+# 解析方式或快照格式改变时递增，使旧快照失效
+SNAPSHOT_VERSION = 3
+
+
+def _parse_csv(text: str) -> Dict[str, list]:
+    reader = csv.reader(io.StringIO(text, newline=""))
+    columns = next(reader, [])
+    rows, lines = [], []
+    start = reader.line_num + 1
+    for values in reader:
+        if values:
+            rows.append(values)
+            lines.append(start)
+        start = reader.line_num + 1
+    return {"columns": columns, "rows": rows, "lines": lines}
+
+
+def _read_text(text: str) -> str:
+    return text
+
+
+_PARSERS: Dict[str, Callable[[str], Any]] = {
+    ".csv": _parse_csv,
+    ".json": json.loads,
+    ".toml": toml.loads,
+    ".txt": _read_text,
+}
+
+# 当前进程使用的快照内容: 源文件路径 -> 解析结果
+_contents: Optional[Dict[str, Any]] = None
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+def source_files(root: str = SOURCE_DIR) -> List[str]:
+    """
+    列出需要编译进快照的数据文件。
+
+    参数:
+        root (str): 数据目录
+
+    返回:
+        List[str]: 按路径排序的数据文件路径
+    """
+    files = []
+    for directory, subdirs, names in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d != "__pycache__")
+        for name in names:
+            if os.path.splitext(name)[1] in _PARSERS:
+                files.append(_normalize(os.path.join(directory, name)))
+    return sorted(files)
+
+
+def _read_sources(files: List[str]) -> Dict[str, bytes]:
+    sources = {}
+    for path in files:
+        with open(path, "rb") as f:
+            sources[path] = f.read()
+    return sources
+
+
+def content_hash(sources: Dict[str, bytes]) -> str:
+    """
+    计算源文件的内容哈希，文件路径和内容的任何变化都会改变哈希。
+
+    参数:
+        sources (Dict[str, bytes]): 文件路径到文件内容的映射
+
+    返回:
+        str: 十六进制的 SHA-256 哈希
+    """
+    digest = hashlib.sha256(f"content-snapshot-v{SNAPSHOT_VERSION}".encode())
+    for path in sorted(sources):
+        data = sources[path]
+        digest.update(f"\0{path}\0{len(data)}\0".encode("utf-8"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def parse_file(path: str, data: Optional[bytes] = None) -> Any:
+    """
+    按扩展名解析一个数据文件。
+
+    参数:
+        path (str): 文件路径
+        data (bytes, optional): 已读取的文件内容，未提供时读取文件
+
+    返回:
+        Any: 解析结果，见模块说明
+
+    异常:
+        ValueError: 不支持的文件类型
+    """
+    parser = _PARSERS.get(os.path.splitext(path)[1])
+    if parser is None:
+        raise ValueError(f"不支持的数据文件类型: {path}")
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+    return parser(data.decode("utf-8-sig"))
+
+
+def compile_sources(sources: Dict[str, bytes]) -> Dict[str, Any]:
+    """解析全部源文件，返回文件路径到解析结果的映射。"""
+    return {path: parse_file(path, data) for path, data in sources.items()}
+
+
+def _write(path: str, snapshot: dict) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)   # 多个进程同时编译时，读取方只会看到完整的快照
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _read(path: str) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):   # ValueError 包括 JSON 和 UTF-8 解码错误
+        return None
+
+
+def build(path: str = SNAPSHOT_PATH, root: str = SOURCE_DIR) -> Dict[str, Any]:
+    """
+    重新编译快照并写入文件。
+
+    参数:
+        path (str): 快照文件路径
+        root (str): 数据目录
+
+    返回:
+        Dict[str, Any]: 文件路径到解析结果的映射
+    """
+    sources = _read_sources(source_files(root))
+    contents = compile_sources(sources)
+    try:
+        _write(path, {"hash": content_hash(sources), "contents": contents})
+    except (OSError, TypeError) as error:     # TypeError: 解析结果中有 JSON 不支持的值，如 TOML 日期
+        debug_print(f"无法写入数据快照 {path}: {error}")
+    debug_print(f"已编译数据快照，共 {len(contents)} 个文件")
+    return contents
+
+
+def load(path: str = SNAPSHOT_PATH, root: str = SOURCE_DIR) -> Dict[str, Any]:
+    """
+    读取快照，源文件与快照不一致或快照损坏时重新编译。
+
+    参数:
+        path (str): 快照文件路径
+        root (str): 数据目录
+
+    返回:
+        Dict[str, Any]: 文件路径到解析结果的映射
+    """
+    expected = content_hash(_read_sources(source_files(root)))
+    snapshot = _read(path)
+    if isinstance(snapshot, dict) and snapshot.get("hash") == expected:
+        return snapshot["contents"]
+    return build(path, root)
+
+
+def read(path: str) -> Any:
+    """
+    读取一个数据文件的解析结果。
+
+    data/ 下的文件取自快照（当前进程第一次调用时读取或编译快照），
+    其他位置的文件直接解析。返回的对象在进程内共享，调用方不应修改。
+
+    参数:
+        path (str): 文件路径，例如 "data/csv_data/enemies.csv"
+
+    返回:
+        Any: 解析结果，见模块说明
+    """
+    global _contents
+    key = _normalize(path)
+    if key.startswith(SOURCE_DIR + "/") and os.path.splitext(key)[1] in _PARSERS:
+        if _contents is None:
+            _contents = load()
+        if key in _contents:
+            return _contents[key]
+    return parse_file(path)
+
+
+if __name__ == "__main__":
+    contents = build()
+    print(f"已写入 {SNAPSHOT_PATH}，共 {len(contents)} 个文件")
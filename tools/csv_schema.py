@@ -0,0 +1,259 @@
+"""
+CSV 行模式模块，用带类型注解的 dataclass 声明 CSV 的列，并编译为逐行解析函数。
+
+每个数据表声明一个行类型，字段名即列名，字段类型决定默认的转换函数:
+    int    空白为 0，否则转换为整数
+    float  空白为 0.0，否则转换为浮点数
+    str    原样保留
+其他类型或特殊格式用 column(转换函数) 指定，例如 column(stat_dict)、column(str_list)。
+字段有默认值时，CSV 中缺少该列也可以解析，此时使用默认值。
+
+行类型第一次用于某个表头时被编译为一个解析函数：列的位置和转换函数都已确定，
+解析每一行只需要依次调用转换函数并构造行对象。某一行解析失败时抛出 CsvRowError，
+指出文件、行号、列名和原始值。
+
+名称列以 "->" 开头的行是表格中的分组标题（如 "-> 雾林"），不是数据，会被跳过。
+
+用法:
+    @dataclass(slots=True)
+    class JewelRow:
+        name: str
+        individual_value: int = 0
+        stat_change_list: dict = column(stat_dict, default_factory=dict)
+
+    rows = load_rows("data/csv_data/jewels.csv", JewelRow)
+"""
+
+import ast
+from dataclasses import MISSING, field, fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, get_type_hints
+
+from tools import content_snapshot
+
+Row = TypeVar("Row")
+
+# 分组标题行的前缀
+SEPARATOR_PREFIX = "->"
+
+
+class CsvRowError(ValueError):
+    """
+    CSV 数据行无法解析。
+
+    属性:
+        path (str): 文件路径
+        line (int): 行号（从1开始，表头为第1行）
+        column (str): 出错的列名
+        value (str | None): 出错的原始值，缺少列时为None
+    """
+    def __init__(self, path: str, line: int, column: str, value: Optional[str], reason: str) -> None:
+        self.path = path
+        self.line = line
+        self.column = column
+        self.value = value
+        super().__init__(f"{path}:{line}: 列 {column} 的值 {value!r} 无效: {reason}")
+
+
+# *转换函数
+def integer(value: str) -> int:
+    """空白为 0，否则转换为整数。"""
+    value = value.strip()
+    return int(value) if value else 0
+
+
+def number(value: str) -> float:
+    """空白为 0.0，否则转换为浮点数。"""
+    value = value.strip()
+    return float(value) if value else 0.0
+
+
+def text(value: str) -> str:
+    """原样保留。"""
+    return value
+
+
+def stripped(value: str) -> str:
+    """去掉首尾空白。"""
+    return value.strip()
+
+
+def str_list(value: str) -> List[str]:
+    """逗号分隔的列表，去掉每一项的首尾空白并忽略空项。"""
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _scalar(value: str):
+    value = value.strip()
+    if value[:1] in "'\"" and value[-1:] == value[:1] and len(value) >= 2:
+        return value[1:-1]
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def stat_dict(value: str) -> Dict[str, Any]:
+    """
+    解析形如 "{'atk': 3, 'def': -2}" 的属性字典，空白或 "{}" 为空字典。
+
+    常见的 "键: 数字" 格式直接拆分解析，其他格式退回 ast.literal_eval。
+    """
+    value = value.strip()
+    if not value or value == "{}":
+        return {}
+    if value[0] == "{" and value[-1] == "}" and "{" not in value[1:-1]:
+        try:
+            result = {}
+            for part in value[1:-1].split(","):
+                if not part.strip():
+                    continue
+                key, item = part.split(":")
+                key = _scalar(key)
+                if not isinstance(key, str):
+                    raise ValueError(key)
+                result[key] = _scalar(item)
+            return result
+        except ValueError:
+            pass
+    result = ast.literal_eval(value)
+    if not isinstance(result, dict):
+        raise ValueError(f"不是字典: {value}")
+    return result
+
+
+_TYPE_CONVERTERS: Dict[Any, Callable[[str], Any]] = {
+    int: integer,
+    float: number,
+    str: text,
+}
+
+
+def column(convert: Callable[[str], Any], *, name: Optional[str] = None, default=MISSING, default_factory=MISSING):
+    """
+    声明一列的转换函数。
+
+    参数:
+        convert (Callable[[str], Any]): 把单元格字符串转换为字段值的函数
+        name (str, optional): 列名，默认与字段名相同
+        default: CSV 中缺少该列时使用的默认值
+        default_factory: CSV 中缺少该列时用于创建默认值的函数
+
+    返回:
+        dataclasses.Field: 作为 dataclass 字段的默认值使用
+    """
+    return field(default=default, default_factory=default_factory,
+                 metadata={"convert": convert, "column": name})
+
+
+# *编译
+@lru_cache(maxsize=None)
+def _column_specs(row_cls: type) -> Tuple[Tuple[str, str, Callable, bool], ...]:
+    """返回 (字段名, 列名, 转换函数, 是否有默认值) 列表。"""
+    hints = get_type_hints(row_cls)
+    specs = []
+    for f in fields(row_cls):
+        convert = f.metadata.get("convert")
+        if convert is None:
+            convert = _TYPE_CONVERTERS.get(hints.get(f.name))
+            if convert is None:
+                raise TypeError(f"{row_cls.__name__}.{f.name} 的类型 {hints.get(f.name)} 需要用 column() 指定转换函数")
+        has_default = f.default is not MISSING or f.default_factory is not MISSING
+        specs.append((f.name, f.metadata.get("column") or f.name, convert, has_default))
+    return tuple(specs)
+
+
+@lru_cache(maxsize=None)
+def compile_parser(row_cls: type, header: Tuple[str, ...], path: str = "<csv>") -> Callable[[Sequence[str]], Any]:
+    """
+    把行类型编译为针对给定表头的解析函数。
+
+    参数:
+        row_cls (type): 行类型（dataclass）
+        header (Tuple[str, ...]): CSV 表头
+        path (str): 文件路径，用于错误信息
+
+    返回:
+        Callable[[Sequence[str]], Any]: 把一行单元格解析为行对象的函数
+
+    异常:
+        CsvRowError: 表头中缺少没有默认值的列
+    """
+    positions = {name.strip(): index for index, name in enumerate(header)}
+    namespace: Dict[str, Any] = {"cls": row_cls}
+    arguments = []
+    for index, (field_name, column_name, convert, has_default) in enumerate(_column_specs(row_cls)):
+        position = positions.get(column_name)
+        if position is None:
+            if has_default:
+                continue
+            raise CsvRowError(path, 1, column_name, None, "表头中缺少该列")
+        namespace[f"c{index}"] = convert
+        arguments.append(f"{field_name}=c{index}(values[{position}])")
+    source = f"def parse(values):\n    return cls({', '.join(arguments)})\n"
+    exec(source, namespace)
+    return namespace["parse"]
+
+
+def _diagnose(row_cls: type, header: Tuple[str, ...], values: Sequence[str], path: str, line: int, error: Exception) -> CsvRowError:
+    """找出导致解析失败的列，生成带有上下文的错误。"""
+    positions = {name.strip(): index for index, name in enumerate(header)}
+    for _, column_name, convert, _ in _column_specs(row_cls):
+        position = positions.get(column_name)
+        if position is None:
+            continue
+        try:
+            convert(values[position])
+        except Exception as cause:
+            return CsvRowError(path, line, column_name, values[position], f"{type(cause).__name__}: {cause}")
+    return CsvRowError(path, line, "?", None, f"{type(error).__name__}: {error}")
+
+
+def parse_rows(table: dict, row_cls: Type[Row], path: str = "<csv>") -> List[Row]:
+    """
+    按行类型解析 content_snapshot 读取的 CSV 表格。
+
+    参数:
+        table (dict): CSV 表格，包含 columns、rows 和 lines
+        row_cls (Type[Row]): 行类型
+        path (str): 文件路径，用于错误信息
+
+    返回:
+        List[Row]: 行对象列表，已跳过分组标题行
+
+    异常:
+        CsvRowError: 某一行无法解析
+    """
+    header = tuple(table["columns"])
+    parse = compile_parser(row_cls, header, path)
+    width = len(header)
+    name_position = next((i for i, name in enumerate(header) if name.strip() == "name"), None)
+
+    rows = []
+    for values, line in zip(table["rows"], table["lines"]):
+        if len(values) < width:
+            values = list(values) + [""] * (width - len(values))
+        if name_position is not None and values[name_position].startswith(SEPARATOR_PREFIX):
+            continue
+        try:
+            rows.append(parse(values))
+        except Exception as error:
+            raise _diagnose(row_cls, header, values, path, line, error) from error
+    return rows
+
+
+def load_rows(path: str, row_cls: Type[Row]) -> List[Row]:
+    """
+    读取 CSV 文件并按行类型解析。
+
+    参数:
+        path (str): 文件路径
+        row_cls (Type[Row]): 行类型
+
+    返回:
+        List[Row]: 行对象列表，已跳过分组标题行
+
+    异常:
+        CsvRowError: 某一行无法解析
+    """
+    return parse_rows(content_snapshot.read(path), row_cls, path)
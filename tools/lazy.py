@@ -0,0 +1,123 @@
+"""
+延迟加载模块，让静态数据表在第一次访问时才加载，之后一直复用。
+
+导入 data、enemies、combat 或 world.map 时不再读取任何数据文件；
+只需要技能表的工具不会为装备、敌人和整张世界地图付出启动时间。
+
+提供两种方式:
+    LazyTable        字典形式的数据表（如 ALL_SKILLS、ENEMY_DATA），
+                     可以在模块顶层直接 from ... import，访问其中的条目时才加载
+    lazy_attributes  生成模块级 __getattr__，用于列表、单个对象等其他模块属性，
+                     第一次访问时调用加载函数，把结果写入模块命名空间
+
+加载期间的随机判定使用 rng.loading 提供的独立会话，
+因此加载结果与谁先访问、何时访问都无关。
+
+用法:
+    ENEMY_DATA = LazyTable("enemies", partial(load_enemies_from_csv, "data/csv_data/enemies.csv"))
+
+    def _boss_groups():
+        return {"wolf_king_lists": create_boss_group("wolf_king")}
+
+    __getattr__ = lazy_attributes(globals(), {"wolf_king_lists": _boss_groups})
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from core import rng
+
+
+class LazyTable(Mapping):
+    """
+    第一次访问时才加载的只读数据表，加载结果会被缓存。
+
+    读取、遍历、in 判断和 len 都与普通字典相同。
+
+    属性:
+        name (str): 数据表名称，用于派生加载时的随机会话
+    """
+    def __init__(self, name: str, loader: Callable[[], Dict]) -> None:
+        """
+        初始化数据表，此时不调用加载函数。
+
+        参数:
+            name (str): 数据表名称
+            loader (Callable[[], Dict]): 加载函数，返回数据表的内容
+        """
+        self.name = name
+        self._loader = loader
+        self._data: Optional[Dict] = None
+
+    @property
+    def loaded(self) -> bool:
+        """数据表是否已经加载。"""
+        return self._data is not None
+
+    def load(self) -> Dict:
+        """
+        加载数据表，已加载时直接返回缓存的内容。
+
+        返回:
+            Dict: 数据表的内容
+        """
+        if self._data is None:
+            with rng.loading(self.name):
+                self._data = self._loader()
+        return self._data
+
+    def __getitem__(self, key) -> Any:
+        return self.load()[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def __contains__(self, key) -> bool:
+        return key in self.load()
+
+    def get(self, key, default=None) -> Any:
+        return self.load().get(key, default)
+
+    def keys(self):
+        return self.load().keys()
+
+    def values(self):
+        return self.load().values()
+
+    def items(self):
+        return self.load().items()
+
+    def __repr__(self) -> str:
+        state = f"{len(self._data)} 项" if self._data is not None else "未加载"
+        return f"<LazyTable {self.name}: {state}>"
+
+
+def lazy_attributes(namespace: Dict[str, Any], loaders: Dict[str, Callable[[], Dict[str, Any]]]) -> Callable[[str], Any]:
+    """
+    生成延迟加载模块属性的模块级 __getattr__。
+
+    访问 loaders 中的名称时调用对应的加载函数，加载函数返回 {属性名: 值}，
+    全部写入模块命名空间，之后的访问不再经过 __getattr__。
+    多个属性可以共用同一个加载函数，它们会被一起加载。
+
+    参数:
+        namespace (Dict[str, Any]): 模块的 globals()
+        loaders (Dict[str, Callable]): 属性名到加载函数的映射
+
+    返回:
+        Callable[[str], Any]: 赋值给模块的 __getattr__
+    """
+    module = namespace["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        loader = loaders.get(name)
+        if loader is None:
+            raise AttributeError(f"module {module!r} has no attribute {name!r}")
+        with rng.loading(f"{module}.{loader.__name__}"):
+            namespace.update(loader())
+        return namespace[name]
+
+    return __getattr__
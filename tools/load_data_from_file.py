@@ -5,19 +5,19 @@ CSV数据加载模块，用于从CSV文件中加载游戏数据。
 通过读取格式化的CSV文件，将数据转换为游戏中可用的对象实例。
 """
 
-import csv
-import toml
+from dataclasses import dataclass
 from functools import lru_cache
 
 import others.item as item
+from tools import content_snapshot
+from tools.csv_schema import load_rows
 from mods.dev_tools import debug_print
 
 def load_toml_data(file_path):
     from mods.dev_tools import debug_print
-    with open(file_path, 'r', encoding='utf-8') as f:
-        file_data = toml.load(f)
-        debug_print(f"从 TOML 加载数据，共加载 {len(file_data)} 项")
-        return file_data
+    file_data = content_snapshot.read(file_path)
+    debug_print(f"从 TOML 加载数据，共加载 {len(file_data)} 项")
+    return file_data
 
 @lru_cache(maxsize=1)
 def load_ascii_art_library(filepath):
@@ -37,23 +37,42 @@ def load_ascii_art_library(filepath):
     current_key = None
     current_lines = []
 
-    with open(filepath, encoding='utf-8') as file:
-        for line in file:
-            line = line.rstrip('\n')
-            if line.startswith("[") and line.endswith("]"):
-                if line.startswith("[/"):  # 结束标签
-                    if current_key:
-                        ascii_art_dict[current_key] = "\n".join(current_lines)
-                        current_key = None
-                else:  # 起始标签
-                    current_key = line[1:-1].strip()
-                    current_lines = []
-            elif current_key:
-                current_lines.append(line)
+    for line in content_snapshot.read(filepath).splitlines():
+        if line.startswith("[") and line.endswith("]"):
+            if line.startswith("[/"):  # 结束标签
+                if current_key:
+                    ascii_art_dict[current_key] = "\n".join(current_lines)
+                    current_key = None
+            else:  # 起始标签
+                current_key = line[1:-1].strip()
+                current_lines = []
+        elif current_key:
+            current_lines.append(line)
 
     debug_print(f"加载 ASCII 艺术资源，共加载 {len(ascii_art_dict)} 项")
     return ascii_art_dict
 
+@dataclass(slots=True)
+class JewelRow:
+    """jewels.csv 的一行。"""
+    name: str
+    name_zh: str
+    description: str
+    individual_value: int
+    stat: str
+    amount_to_change: int
+
+@dataclass(slots=True)
+class FoodRow:
+    """food.csv 的一行。"""
+    name: str
+    name_zh: str
+    description: str
+    individual_value: int
+    hunger_restore: int
+    hp_restore: int
+    mp_restore: int
+
 def load_jewel_from_csv(filepath="data/csv_data/jewels.csv"):
     """
     从CSV文件中加载宝石数据。
@@ -66,23 +85,17 @@ def load_jewel_from_csv(filepath="data/csv_data/jewels.csv"):
 
     返回:
         dict: 以宝石英文名为键、Jewel对象为值的字典
+
+    异常:
+        CsvRowError: 某一行无法解析
     """
     jewel_dict = {}
-    with open(filepath, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            name = row["name"]
-            name_zh = row["name_zh"]
-            description = row["description"]
-            amount = 1
-            individual_value = int(row["individual_value"]) if row["individual_value"].strip() else 0
-            stat = row["stat"]
-            amount_to_change = int(row["amount_to_change"]) if row["amount_to_change"].strip() else 0
-            jewel = item.Jewel(name_zh, description, amount, individual_value, stat, amount_to_change)
-            jewel_dict[name] = jewel
-
-        debug_print(f"从 CSV 加载数据，共加载 {len(jewel_dict)} 种宝石")
-        return jewel_dict
+    for row in load_rows(filepath, JewelRow):
+        jewel = item.Jewel(row.name_zh, row.description, 1, row.individual_value, row.stat, row.amount_to_change)
+        jewel_dict[row.name] = jewel
+
+    debug_print(f"从 CSV 加载数据，共加载 {len(jewel_dict)} 种宝石")
+    return jewel_dict
 
 def load_food_from_csv(filepath="data/csv_data/food.csv"):
     """
@@ -96,21 +109,14 @@ def load_food_from_csv(filepath="data/csv_data/food.csv"):
 
     返回:
         dict: 以食物英文名为键、Food对象为值的字典
+
+    异常:
+        CsvRowError: 某一行无法解析
     """
     food_dict = {}
-    with open(filepath, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            name = row["name"]
-            name_zh = row["name_zh"]
-            description = row["description"]
-            amount = 1
-            individual_value = int(row["individual_value"]) if row["individual_value"].strip() else 0
-            hunger_restore = int(row["hunger_restore"]) if row["hunger_restore"].strip() else 0
-            hp_restore = int(row["hp_restore"]) if row["hp_restore"].strip() else 0
-            mp_restore = int(row["mp_restore"]) if row["mp_restore"].strip() else 0
-            food = item.Food(name_zh, description, amount, individual_value, hunger_restore, hp_restore, mp_restore)
-            food_dict[name] = food
-
-        debug_print(f"从 CSV 加载数据，共加载 {len(food_dict)} 种食物")
-        return food_dict
+    for row in load_rows(filepath, FoodRow):
+        food = item.Food(row.name_zh, row.description, 1, row.individual_value, row.hunger_restore, row.hp_restore, row.mp_restore)
+        food_dict[row.name] = food
+
+    debug_print(f"从 CSV 加载数据，共加载 {len(food_dict)} 种食物")
+    return food_dict
@@ -5,3 +5,6 @@ from .combat_utils import battle_log, get_valid_input
 
 from .fx import dot_loading, typewriter
 from .fx import wait
+
+from .console import get_console
+from .sink import null_output
@@ -0,0 +1,43 @@
+"""
+共享控制台模块，游戏的全部 rich 输出都经过 get_console() 返回的同一个控制台。
+
+各模块在模块级写 console = get_console()，而不是各自创建 Console。
+因为只有一个控制台，null_output 只需把它静音，就能屏蔽所有模块的 rich 输出，
+包括之后才导入的模块和在函数内取得控制台的代码。
+"""
+
+from rich.console import Console
+
+
+class GameConsole(Console):
+    """
+    可以静音的 rich 控制台。
+
+    静音时 print 和 log 直接返回，连内容都不渲染；rich 的 quiet 只省去写出，
+    渲染的开销仍在，对无界面的大量战斗来说太慢。
+
+    属性:
+        muted (int): 静音的嵌套层数，大于0时静音
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.muted = 0
+
+    def print(self, *objects, **kwargs) -> None:
+        if not self.muted:
+            super().print(*objects, **kwargs)
+
+    def log(self, *objects, **kwargs) -> None:
+        if not self.muted:
+            super().log(*objects, **kwargs)
+
+
+_console = None
+
+
+def get_console() -> GameConsole:
+    """返回游戏共用的控制台，第一次调用时创建。"""
+    global _console
+    if _console is None:
+        _console = GameConsole()
+    return _console
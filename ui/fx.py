@@ -1,17 +1,171 @@
+"""
+界面节奏模块，控制战斗和剧情文字的停顿与打字机效果。
+
+所有停顿都按当前的节奏配置缩放:
+    instant    没有任何停顿，文字整行输出
+    fast       停顿缩短为原来的 30%
+    cinematic  完整的停顿和打字机效果
+
+标准输出不是终端时（如重定向到文件或自动化测试）默认使用 instant，
+否则默认使用 cinematic；也可以用环境变量 RPG_PACE 指定，
+或在游戏中通过命令 "p -pace <配置>" 随时切换。
+
+在终端中停顿时按下回车（Windows 下为任意键）会跳过后续的所有停顿，
+直到下一次轮到玩家操作时恢复。
+"""
+
+import os
+import sys
 import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PacingProfile:
+    """
+    节奏配置。
+
+    属性:
+        name (str): 配置名称
+        scale (float): 停顿时长的缩放系数，0 表示不停顿
+    """
+    name: str
+    scale: float
+
+
+PROFILES = {
+    "instant": PacingProfile("instant", 0.0),
+    "fast": PacingProfile("fast", 0.3),
+    "cinematic": PacingProfile("cinematic", 1.0),
+}
+
+# 轮询按键的间隔（秒）
+_POLL_INTERVAL = 0.05
+
+
+def _default_profile() -> PacingProfile:
+    name = os.environ.get("RPG_PACE")
+    if name in PROFILES:
+        return PROFILES[name]
+    return PROFILES["cinematic"] if sys.stdout.isatty() else PROFILES["instant"]
+
+
+_profile = _default_profile()
+_instant = False
+_skipping = False
+
+
+def set_profile(name: str) -> PacingProfile:
+    """
+    切换节奏配置。
+
+    参数:
+        name (str): 配置名称，见 PROFILES
+
+    返回:
+        PacingProfile: 切换后的配置
+
+    异常:
+        ValueError: 配置名称不存在
+    """
+    global _profile
+    if name not in PROFILES:
+        raise ValueError(f"未知的节奏配置: {name}，可选: {', '.join(PROFILES)}")
+    _profile = PROFILES[name]
+    return _profile
+
+
+def current_profile() -> PacingProfile:
+    """返回当前生效的节奏配置。"""
+    return PROFILES["instant"] if _instant else _profile
+
+
+@contextmanager
+def instant():
+    """在上下文内跳过所有动画停顿。"""
+    global _instant
+    previous, _instant = _instant, True
+    try:
+        yield
+    finally:
+        _instant = previous
+
+
+def stop_skipping() -> None:
+    """结束按键跳过状态，在轮到玩家操作时调用。"""
+    global _skipping
+    _skipping = False
+
+
+def _key_pressed(timeout: float) -> bool:
+    """
+    在 timeout 秒内等待按键，有按键时读取并丢弃该输入。
+
+    返回:
+        bool: 是否有按键
+    """
+    if os.name == "nt":
+        import msvcrt
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if msvcrt.kbhit():
+                msvcrt.getwch()
+                return True
+            time.sleep(_POLL_INTERVAL)
+        return False
+
+    import select
+    readable, _, _ = select.select([sys.stdin], [], [], timeout)
+    if readable:
+        sys.stdin.readline()
+        return True
+    return False
+
+
+def _sleep(seconds: float) -> None:
+    """
+    按当前节奏停顿，停顿期间检测按键跳过。
+
+    参数:
+        seconds (float): cinematic 配置下的停顿时长
+    """
+    global _skipping
+    seconds *= current_profile().scale
+    if seconds <= 0 or _skipping:
+        return
+    if not sys.stdin.isatty():
+        time.sleep(seconds)
+    elif _key_pressed(seconds):
+        _skipping = True
+
+
+def _paced() -> bool:
+    return current_profile().scale > 0 and not _skipping
+
 
 def wait(s=0.3):
-    time.sleep(s)
+    _sleep(s)
+
 
 def typewriter(text, delay=0.02):
-    for char in text:
+    if not _paced():
+        print(text)
+        return
+    for index, char in enumerate(text):
         print(char, end='', flush=True)
-        time.sleep(delay)
+        _sleep(delay)
+        if _skipping:
+            print(text[index + 1:], end='')
+            break
     print()
 
+
 def dot_loading(text="正在行动", dots=3, delay=0.3):
+    if not _paced():
+        return
     print(text, end="", flush=True)
     for _ in range(dots):
-        time.sleep(delay)
+        _sleep(delay)
         print(".", end="", flush=True)
     print("\r" + " " * 20 + "\r", end="")
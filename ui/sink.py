@@ -0,0 +1,40 @@
+"""
+输出接收器模块，提供屏蔽控制台输出的工具。
+
+该模块用于无界面（headless）运行场景，例如平衡性测试和自动化回归。
+在上下文内所有 print、rich 控制台输出和动画停顿都会被丢弃，
+使战斗逻辑可以在不产生任何终端开销的情况下高速执行。
+"""
+
+import io
+from contextlib import contextmanager, redirect_stdout
+
+from ui import fx
+from ui.console import get_console
+
+class NullSink(io.TextIOBase):
+    """丢弃所有写入内容的文本流。"""
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+@contextmanager
+def null_output():
+    """
+    在上下文内屏蔽所有控制台输出。
+
+    将标准输出重定向到 NullSink，把共享控制台（见 ui.console）静音以跳过 rich 的渲染，
+    并关闭 ui.fx 的全部动画停顿。可以安全嵌套使用。
+
+    副作用:
+        上下文期间增加共享控制台的静音层数，退出时恢复
+    """
+    console = get_console()
+    console.muted += 1
+    try:
+        with redirect_stdout(NullSink()), fx.instant():
+            yield
+    finally:
+        console.muted -= 1
@@ -9,15 +9,15 @@
 import math
 
 from typing import List
-from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from rich import box
 
 from ui import clear_screen
+from ui.console import get_console
 
-console = Console()
+console = get_console()
 
 
 def title_screen():
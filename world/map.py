@@ -6,12 +6,9 @@
 移动、探索和与环境互动的核心功能。
 """
 
-import json
-import random
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
@@ -19,8 +16,13 @@ from rich.table import Table
 import enemies
 import events
 import world.quest as quest
+from ui import get_console
+from core import rng
+from core.spawn_table import SpawnTable
+from data import ENEMY_QUANTITY_FOR_LEVEL
+from tools import lazy_attributes
 
-console = Console()
+console = get_console()
 
 
 @dataclass
@@ -36,7 +38,7 @@ class Region:
         name: 地区名称
         description: 地区描述
         danger_level: 危险等级，影响战斗难度
-        possible_enemies: 可能遇到的敌人及其概率
+        possible_enemies: 可能遇到的敌人 -> (最低等级, 最高等级) 或 (最低等级, 最高等级, 权重)
         shop_events: 可能发生的商店事件列表
         heal_events: 可能发生的治疗事件列表
         special_events: 可能发生的特殊事件列表
@@ -44,6 +46,7 @@ class Region:
         ascii_art: 地区的ASCII艺术表示
         is_unlocked: 该地区是否已解锁
         quest_events: 与任务相关的事件列表
+        spawn_table: 由 possible_enemies 预先计算的刷怪表，未提供时在创建地区时生成
     """
     name: str
     description: str
@@ -56,6 +59,11 @@ class Region:
     ascii_art: str
     is_unlocked: bool = True
     quest_events: List[events.Event] = None
+    spawn_table: SpawnTable = None
+
+    def __post_init__(self):
+        if self.spawn_table is None:
+            self.spawn_table = SpawnTable(self.possible_enemies, ENEMY_QUANTITY_FOR_LEVEL)
 
     def available_quests(self, player):
         """
@@ -108,6 +116,7 @@ class World_map:
         """
         self.regions = {}
         self.current_region = None
+        self.enemy_pool = enemies.EnemyPool(enemies.ENEMY_DATA)     # 本局随机遭遇的敌人对象池
         self._initialize_regions()
         self._initialize_special_events()
         self._initialize_quest_events()
@@ -152,12 +161,11 @@ class World_map:
         从JSON文件加载地区数据，使用地区工厂创建Region对象，
         并设置初始当前地区为城镇（town）。
         """
-        from tools import load_ascii_art_library
+        from tools import load_ascii_art_library, content_snapshot
         from world.region_factory import load_region_from_dict
 
         ascii_art_dict = load_ascii_art_library("data/ascii_art/ascii_art_map.txt")
-        with open("data/json_data/world_map.json", "r", encoding="utf-8") as f:
-            all_region_data = json.load(f)
+        all_region_data = content_snapshot.read("data/json_data/world_map.json")
 
         self.regions = {}
 
@@ -327,8 +335,8 @@ class World_map:
         ]
 
         if active_quest_events:
-            if random.randint(1, 100) <= 70:
-                quest_event = random.choice(active_quest_events)
+            if rng.stream("event").randint(1, 100) <= 70:
+                quest_event = rng.stream("event").choice(active_quest_events)
                 print(f"\n一个任务相关事件发生了: {quest_event.name}")
                 escaped = quest_event.effect(player)
                 if quest_event.is_unique and not escaped and player.alive:
@@ -359,24 +367,24 @@ class World_map:
             print("这个地区目前很平静, 没有发生任何事件")
             return
 
-        event_type = random.choices(event_types, weights=weights, k=1)[0]
+        event_type = rng.stream("event").choices(event_types, weights=weights, k=1)[0]
 
         if event_type == "combat":
-            combat_event = events.RandomCombatEvent(f"{self.current_region.name}的随机战斗")
-            enemies.g_possible_enemies = self.current_region.possible_enemies
+            combat_event = events.RandomCombatEvent(
+                f"{self.current_region.name}的随机战斗", self.enemy_pool, self.current_region.spawn_table)
             combat_event.effect(player)
             return
 
         elif event_type == "shop":
-            shop_event = random.choice(self.current_region.shop_events)
+            shop_event = rng.stream("event").choice(self.current_region.shop_events)
             shop_event.effect(player)
         elif event_type == "heal":
-            heal_event = random.choice(self.current_region.heal_events)
+            heal_event = rng.stream("event").choice(self.current_region.heal_events)
             heal_event.effect(player)
 
         if (self.current_region.special_events and 
-            random.randint(1, 100) <= 7):
-            special_event = random.choice(self.current_region.special_events)
+            rng.stream("event").randint(1, 100) <= 7):
+            special_event = rng.stream("event").choice(self.current_region.special_events)
             print(f"\n一个特殊事件发生了: {special_event.name}")
             escaped = special_event.effect(player)
             if special_event.is_unique and not escaped and player.alive:
@@ -385,4 +393,8 @@ class World_map:
                 console.print("你逃离了战斗...", style="yellow")
                 pass
 
-world_map = World_map()
+def _world_map():
+    return {"world_map": World_map()}
+
+# 世界地图在第一次访问时才创建，同时才导入地区工厂中的全部事件和任务
+__getattr__ = lazy_attributes(globals(), {"world_map": _world_map})
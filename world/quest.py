@@ -7,10 +7,11 @@
 """
 
 from rich.panel import Panel
-from rich.console import Console
 from rich.text import Text
 
-console = Console()
+from ui import get_console
+
+console = get_console()
 
 
 class Quest():
@@ -176,13 +177,20 @@ class Quest():
         """
         尝试完成收集类任务。
 
-        检查是否满足收集条件，如果满足则完成任务并从玩家背包中
-        移除所需物品。适用于物品收集类型的任务。
-        """
-        if self.status == "Active" and self.check_item_collection(player):
-            print(f"已收集完所需物品，任务『{self.name}』完成！")
-            self.complete_quest(player)
-            for item_name, required_count in self.required_items.items():
-                removed = player.inventory.remove_items_by_name(item_name, required_count)
-                if removed:
-                    print(f"\n- 交出物品: {item_name} x{required_count}")
+        检查是否满足收集条件，如果满足则在一个库存事务中移除所需物品并完成任务。
+        任何一种物品数量不足时不交出任何物品。适用于物品收集类型的任务。
+        """
+        from bag import InsufficientItemsError
+
+        if self.status != "Active" or not self.required_items:
+            return
+        try:
+            with player.inventory.transaction() as tx:
+                for item_name, required_count in self.required_items.items():
+                    tx.remove(item_name, required_count)
+        except InsufficientItemsError:
+            return
+        print(f"已收集完所需物品，任务『{self.name}』完成！")
+        self.complete_quest(player)
+        for item_name, required_count in self.required_items.items():
+            print(f"\n- 交出物品: {item_name} x{required_count}")
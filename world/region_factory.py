@@ -6,7 +6,6 @@
 过程更加一致和可维护。
 """
 
-import random
 from typing import Dict, List, Any
 
 import events
@@ -14,6 +13,7 @@ import enemies
 from data import items_data
 from data import DIALOGUE
 from data import equipment_data
+from core import rng
 from world import quest
 from world.map import Region
 
@@ -85,9 +85,9 @@ OTHER_EVENTS = {
     "find_herb": events.SimpleEvent("发现草药", events.find_herb_effect),
     "rest_spot": events.SimpleEvent("休息处", events.rest_spot_effect),
 
-    "hidden_chest_forest": events.HiddenChestEvent("雾林装备宝箱", random.choice(["long_sword", "dagger", "fire_staff"])),
-    "hidden_chest_mountain": events.HiddenChestEvent("龙脊山装备宝箱", random.choice(["sword_bronze", "sai", "amulet_of_health"])),
-    "hidden_chest_swamp": events.HiddenChestEvent("迷雾沼泽装备宝箱", random.choice(["hunting_knife", "ring_of_power", "ring_of_magic", "mana_charm", "bronze_mace"])),
+    "hidden_chest_forest": events.HiddenChestEvent("雾林装备宝箱", rng.stream("world").choice(["long_sword", "dagger", "fire_staff"])),
+    "hidden_chest_mountain": events.HiddenChestEvent("龙脊山装备宝箱", rng.stream("world").choice(["sword_bronze", "sai", "amulet_of_health"])),
+    "hidden_chest_swamp": events.HiddenChestEvent("迷雾沼泽装备宝箱", rng.stream("world").choice(["hunting_knife", "ring_of_power", "ring_of_magic", "mana_charm", "bronze_mace"])),
 }
 
 EVENT_MAPPING: Dict[str, Any] = {}